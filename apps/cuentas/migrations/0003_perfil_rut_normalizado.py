@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+def normalizar_ruts(apps, schema_editor):
+    from apps.gestion.validators import limpiar_rut
+
+    Perfil = apps.get_model('cuentas', 'Perfil')
+    perfiles = list(Perfil.objects.exclude(rut__isnull=True).exclude(rut='').only('id', 'rut'))
+    for perfil in perfiles:
+        perfil.rut_normalizado = limpiar_rut(perfil.rut) or None
+    Perfil.objects.bulk_update(perfiles, ['rut_normalizado'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cuentas', '0002_perfil_direccion_perfil_rut'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfil',
+            name='rut_normalizado',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True, verbose_name='RUT normalizado'),
+        ),
+        migrations.RunPython(normalizar_ruts, migrations.RunPython.noop),
+    ]
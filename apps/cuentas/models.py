@@ -3,6 +3,8 @@ from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from apps.gestion.validators import limpiar_rut
+
 
 class Perfil(models.Model):
     ROL_CHOICES = [
@@ -41,6 +43,15 @@ class Perfil(models.Model):
         verbose_name='RUT',
         help_text='Formato: 12.345.678-9'
     )
+    # RUT sin puntos ni guión: enlaza al usuario externo con su Persona
+    rut_normalizado = models.CharField(
+        max_length=12,
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+        verbose_name='RUT normalizado'
+    )
     sede = models.CharField(
         max_length=20,
         choices=SEDE_CHOICES,
@@ -77,6 +88,13 @@ class Perfil(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} - {self.get_rol_display()}"
 
+    def save(self, *args, **kwargs):
+        self.rut_normalizado = limpiar_rut(self.rut) or None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'rut' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'rut_normalizado'}
+        super().save(*args, **kwargs)
+
 
 # Signal para crear perfil automáticamente cuando se crea un usuario
 @receiver(post_save, sender=User)
@@ -86,6 +104,9 @@ def crear_perfil_usuario(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def guardar_perfil_usuario(sender, instance, **kwargs):
+def guardar_perfil_usuario(sender, instance, update_fields=None, **kwargs):
+    # El login solo actualiza last_login: no hay nada del perfil que guardar
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
     if hasattr(instance, 'perfil'):
         instance.perfil.save()
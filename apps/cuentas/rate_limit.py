@@ -5,10 +5,15 @@ Cumple con ISO/IEC 27001 - Control de Acceso
 
 from django.core.cache import cache
 from django.http import HttpResponseForbidden
+from apps.gestion.metricas_cache import registrar_acierto, registrar_fallo
 from functools import wraps
 import time
 
 
+# Namespace con el que se registran sus lecturas en las métricas de caché
+NS_RATE_LIMIT = 'rate_limit'
+
+
 class RateLimiter:
     """
     Limitador de tasa de peticiones basado en cache.
@@ -36,7 +41,7 @@ class RateLimiter:
     def esta_bloqueado(self, identifier, action='default'):
         """Verifica si el identificador está bloqueado."""
         block_key = self.get_block_key(identifier, action)
-        return cache.get(block_key) is not None
+        return self._leer(block_key) is not None
     
     def tiempo_restante_bloqueo(self, identifier, action='default'):
         """Retorna el tiempo restante de bloqueo en segundos."""
@@ -66,7 +71,7 @@ class RateLimiter:
         cache_key = self.get_cache_key(identifier, action)
         
         # Obtener intentos actuales
-        intentos = cache.get(cache_key, 0)
+        intentos = self._leer(cache_key) or 0
         intentos += 1
         
         # Guardar nuevo conteo
@@ -88,6 +93,15 @@ class RateLimiter:
         
         return False, self.max_intentos - intentos, 0
     
+    def _leer(self, key):
+        """Lee una clave del caché registrando acierto o fallo."""
+        valor = cache.get(key)
+        if valor is None:
+            registrar_fallo(NS_RATE_LIMIT)
+        else:
+            registrar_acierto(NS_RATE_LIMIT)
+        return valor
+    
     def limpiar(self, identifier, action='default'):
         """Limpia los contadores para un identificador (ej: después de login exitoso)."""
         cache_key = self.get_cache_key(identifier, action)
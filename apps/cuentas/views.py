@@ -1,7 +1,7 @@
 """
 Vistas de autenticación del Sistema Clínica Jurídica
 """
-from apps.gestion.models import LogAuditoria
+from apps.gestion.auditoria import registrar as registrar_auditoria
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
@@ -60,7 +60,7 @@ def login_view(request):
             login_limiter.limpiar(ip_address, action)
             
             # Registrar login en auditoría
-            LogAuditoria.objects.create(
+            registrar_auditoria(
                 usuario=user,
                 accion='LOGIN',
                 modelo='USER',
@@ -105,7 +105,7 @@ def login_view(request):
 def logout_view(request):
     if request.user.is_authenticated:
         # Registrar logout en auditoría
-        LogAuditoria.objects.create(
+        registrar_auditoria(
             usuario=request.user,
             accion='LOGOUT',
             modelo='USER',
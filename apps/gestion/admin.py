@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Persona, Causa, CausaPersona, Audiencia, Documento, Tribunal, Materia, TipoDocumento, EstadoCausa, Consentimiento, LogAuditoria
+from .models import Persona, Causa, CausaPersona, Audiencia, Documento, Tribunal, Materia, TipoDocumento, EstadoCausa, Consentimiento, LogAuditoria, LogAuditoriaArchivo, TextoDocumento
 
 @admin.register(Persona)
 class PersonaAdmin(admin.ModelAdmin):
@@ -160,3 +160,26 @@ class LogAuditoriaAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(LogAuditoriaArchivo)
+class LogAuditoriaArchivoAdmin(LogAuditoriaAdmin):
+    list_display = ['fecha', 'particion', 'usuario', 'accion', 'modelo', 'objeto_repr', 'ip_address']
+    list_filter = ['particion', 'accion', 'modelo']
+    readonly_fields = LogAuditoriaAdmin.readonly_fields + ['particion']
+
+
+@admin.register(TextoDocumento)
+class TextoDocumentoAdmin(admin.ModelAdmin):
+    list_display = ['documento', 'estado', 'intentos', 'caracteres', 'fecha_solicitud', 'fecha_proceso']
+    list_filter = ['estado']
+    search_fields = ['documento__titulo']
+    ordering = ['-fecha_solicitud']
+    readonly_fields = [
+        'documento', 'estado', 'intentos', 'caracteres', 'error',
+        'fecha_solicitud', 'fecha_inicio', 'fecha_proceso'
+    ]
+    exclude = ['texto']
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,361 @@
+"""
+Escritura y consulta de registros de auditoría
+Cumple con ISO/IEC 27001 - Trazabilidad y Auditoría
+
+Dentro de un request, los registros se acumulan en un buffer y se
+insertan todos juntos con un único bulk_create al terminar el request.
+Cada registro entra al buffer recién cuando confirma la transacción que
+modificó los datos (si hace rollback se descarta, igual que antes), de
+modo que un error posterior del request no pierde la auditoría de lo
+que ya se guardó. Fuera de un request (comandos, shell) se escribe de
+inmediato.
+
+Los registros anteriores a la ventana activa (AUDITORIA_MESES_ACTIVOS) se
+mueven a LogAuditoriaArchivo con el comando `archivar_auditoria`. Las
+consultas solo incluyen el archivo si el filtro de fecha llega hasta él.
+"""
+
+import csv
+import json
+import zlib
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import BooleanField, Count, Q, Value
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .cache_utils import get_estadisticas_auditoria
+from .contexto import al_terminar_request, contexto_actual
+from .logging_utils import logger_auditoria
+from .models import LogAuditoria, LogAuditoriaArchivo
+from .paginacion import paginar_por_fecha
+
+
+# Clave del buffer en el contexto del request
+BUFFER = 'auditoria:buffer'
+
+# Columnas que muestran los listados
+CAMPOS_LISTADO = (
+    'id', 'usuario_id', 'accion', 'modelo', 'objeto_id', 'objeto_repr',
+    'ip_address', 'descripcion', 'fecha',
+)
+
+# Columnas de la exportación, en orden
+CAMPOS_EXPORTACION = (
+    'id', 'fecha', 'usuario_id', 'usuario__username', 'accion', 'modelo',
+    'objeto_id', 'objeto_repr', 'ip_address', 'user_agent', 'descripcion',
+    'datos_anteriores', 'datos_nuevos',
+)
+# Filas que se leen de la base de datos por vez al exportar
+EXPORTACION_LOTE = 2000
+# Filas por cada parte enviada al cliente
+EXPORTACION_PARTE = 500
+
+# Inicios de celda que una planilla interpretaría como fórmula
+INICIOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+# =============================================================================
+# ESCRITURA
+# =============================================================================
+
+def registrar(**campos):
+    """
+    Registra una entrada de auditoría.
+
+    Args:
+        **campos: Campos de LogAuditoria (usuario, accion, modelo, ...)
+    """
+    entrada = LogAuditoria(**campos)
+    contexto = contexto_actual()
+
+    if contexto is None:
+        entrada.save()
+        return
+
+    buffer = contexto.obtener(BUFFER, list)
+    # Sin transacción abierta on_commit se ejecuta de inmediato
+    transaction.on_commit(lambda: buffer.append(entrada))
+
+
+def registrar_varios(entradas):
+    """
+    Registra varias entradas de auditoría (p. ej. de una operación masiva)
+    con un solo INSERT. Dentro de un request se suman al buffer.
+
+    Args:
+        entradas: Iterable de diccionarios con campos de LogAuditoria
+    """
+    logs = [LogAuditoria(**campos) for campos in entradas]
+    if not logs:
+        return
+    contexto = contexto_actual()
+
+    if contexto is None:
+        LogAuditoria.objects.bulk_create(logs)
+        return
+
+    buffer = contexto.obtener(BUFFER, list)
+    transaction.on_commit(lambda: buffer.extend(logs))
+
+
+@al_terminar_request
+def volcar_buffer():
+    """
+    Inserta los registros acumulados del request.
+
+    Si la inserción masiva falla se intenta registro por registro, para
+    no perder más entradas que las que realmente fallan.
+    """
+    contexto = contexto_actual()
+    buffer = contexto.quitar(BUFFER) if contexto is not None else None
+    if not buffer:
+        return
+
+    try:
+        with transaction.atomic():
+            LogAuditoria.objects.bulk_create(buffer)
+    except Exception:
+        logger_auditoria.exception('Error al guardar %d registros de auditoría', len(buffer))
+        for entrada in buffer:
+            try:
+                entrada.save()
+            except Exception:
+                logger_auditoria.exception('Registro de auditoría perdido: %s', entrada.descripcion)
+
+
+# =============================================================================
+# VENTANA ACTIVA Y ARCHIVO
+# =============================================================================
+
+def inicio_ventana_activa(meses=None, hoy=None):
+    """
+    Primer día del mes más antiguo que se mantiene en LogAuditoria.
+
+    Args:
+        meses: Meses activos, incluido el actual (por defecto AUDITORIA_MESES_ACTIVOS)
+        hoy: Fecha de referencia (por defecto hoy)
+    """
+    meses = meses or settings.AUDITORIA_MESES_ACTIVOS
+    hoy = hoy or timezone.localdate()
+    indice = hoy.year * 12 + hoy.month - meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def corte_ventana_activa(meses=None):
+    """Inicio de la ventana activa como datetime (los logs anteriores se archivan)."""
+    return timezone.make_aware(datetime.combine(inicio_ventana_activa(meses), time.min))
+
+
+def particion_de(fecha):
+    """Mes (AAAA-MM, hora local) al que pertenece un registro."""
+    return timezone.localtime(fecha).strftime('%Y-%m')
+
+
+def filtros_request(datos):
+    """Filtros de auditoría presentes en request.GET (listado y exportación)."""
+    return {
+        campo: datos.get(campo, '')
+        for campo in ('usuario', 'accion', 'modelo', 'fecha_desde', 'fecha_hasta')
+    }
+
+
+def _filtrar(logs, usuario='', accion='', modelo='', fecha_desde='', fecha_hasta=''):
+    if usuario:
+        logs = logs.filter(usuario_id=usuario)
+    if accion:
+        logs = logs.filter(accion=accion)
+    if modelo:
+        logs = logs.filter(modelo=modelo)
+    if fecha_desde:
+        logs = logs.filter(fecha__date__gte=fecha_desde)
+    if fecha_hasta:
+        logs = logs.filter(fecha__date__lte=fecha_hasta)
+    return logs
+
+
+def incluye_archivo(fecha_desde='', fecha_hasta=''):
+    """
+    Indica si el rango de fechas alcanza antes de la ventana activa: sin
+    fecha_desde, o con fecha_desde o fecha_hasta anteriores a su inicio.
+    """
+    inicio = inicio_ventana_activa()
+    desde = parse_date(fecha_desde) if fecha_desde else None
+    hasta = parse_date(fecha_hasta) if fecha_hasta else None
+    return desde is None or desde < inicio or (hasta is not None and hasta < inicio)
+
+
+def _fuentes(**filtros):
+    """Tablas a consultar según el filtro de fecha: [(modelo, archivado)]."""
+    fuentes = [(LogAuditoria, False)]
+    if incluye_archivo(filtros.get('fecha_desde', ''), filtros.get('fecha_hasta', '')):
+        fuentes.append((LogAuditoriaArchivo, True))
+    return fuentes
+
+
+def consultar_logs(condicion=None, orden=('-fecha', '-id'), campos=CAMPOS_LISTADO, **filtros):
+    """
+    Logs que cumplen los filtros de auditoria_lista, del más reciente al
+    más antiguo.
+
+    Si el rango de fechas queda dentro de la ventana activa solo se consulta
+    LogAuditoria; si no tiene fecha_desde o llega más atrás se une con
+    LogAuditoriaArchivo (ver incluye_archivo).
+
+    Args:
+        condicion: Q adicional (p. ej. el cursor de la página)
+        orden: Campos de ordenamiento
+        campos: Columnas a obtener
+        **filtros: usuario, accion, modelo, fecha_desde, fecha_hasta
+
+    Returns:
+        QuerySet de diccionarios con `campos` y `archivado`
+        (convertir la página con `hidratar_logs`)
+    """
+    consultas = []
+    for modelo, archivado in _fuentes(**filtros):
+        logs = _filtrar(modelo.objects.order_by(), **filtros)
+        if condicion is not None:
+            logs = logs.filter(condicion)
+        consultas.append(logs.annotate(
+            archivado=Value(archivado, output_field=BooleanField())
+        ).values(*campos, 'archivado'))
+
+    logs = consultas[0]
+    if len(consultas) > 1:
+        logs = logs.union(*consultas[1:], all=True)
+    return logs.order_by(*orden)
+
+
+def paginar_logs(por_pagina, despues='', antes='', **filtros):
+    """
+    Página de logs por cursor (fecha, id), con sus instancias ya cargadas.
+
+    Args:
+        por_pagina: Logs por página
+        despues, antes: Cursores de paginacion.paginar_por_fecha
+        **filtros: usuario, accion, modelo, fecha_desde, fecha_hasta
+    """
+    pagina = paginar_por_fecha(
+        lambda condicion, orden: consultar_logs(condicion, orden, **filtros),
+        por_pagina, despues=despues, antes=antes,
+    )
+    pagina.object_list = hidratar_logs(pagina.object_list)
+    return pagina
+
+
+def calcular_estadisticas_logs(**filtros):
+    """Total de logs y creaciones/ediciones/eliminaciones, una consulta por tabla."""
+    estadisticas = dict.fromkeys(('total', 'creaciones', 'ediciones', 'eliminaciones'), 0)
+    for modelo, _ in _fuentes(**filtros):
+        conteos = _filtrar(modelo.objects.order_by(), **filtros).aggregate(
+            total=Count('id'),
+            creaciones=Count('id', filter=Q(accion='CREAR')),
+            ediciones=Count('id', filter=Q(accion='EDITAR')),
+            eliminaciones=Count('id', filter=Q(accion='ELIMINAR')),
+        )
+        for clave, valor in conteos.items():
+            estadisticas[clave] += valor
+    return estadisticas
+
+
+def estadisticas_logs(**filtros):
+    """Estadísticas de `calcular_estadisticas_logs`, en caché por combinación de filtros."""
+    return get_estadisticas_auditoria(
+        filtros, lambda: calcular_estadisticas_logs(**filtros)
+    )
+
+
+def hidratar_logs(filas):
+    """Convierte filas de `consultar_logs` en instancias con su usuario."""
+    filas = list(filas)
+    usuarios = User.objects.in_bulk({fila['usuario_id'] for fila in filas} - {None})
+    logs = []
+    for fila in filas:
+        fila = dict(fila)
+        modelo = LogAuditoriaArchivo if fila.pop('archivado') else LogAuditoria
+        log = modelo(**fila)
+        log.usuario = usuarios.get(fila['usuario_id'])
+        logs.append(log)
+    return logs
+
+
+def obtener_log(pk):
+    """Log activo o archivado con ese id (los ids se conservan al archivar)."""
+    log = LogAuditoria.objects.select_related('usuario').filter(pk=pk).first()
+    if log is None:
+        log = LogAuditoriaArchivo.objects.select_related('usuario').filter(pk=pk).first()
+    return log
+
+
+# =============================================================================
+# EXPORTACIÓN
+# =============================================================================
+
+def _celda_csv(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, cls=DjangoJSONEncoder, ensure_ascii=False)
+    if isinstance(valor, datetime):
+        return timezone.localtime(valor).isoformat()
+    valor = str(valor)
+    # Evita que una planilla ejecute texto ingresado por usuarios
+    return "'" + valor if valor.startswith(INICIOS_FORMULA) else valor
+
+
+class _Eco:
+    """Destino de csv.writer que retorna la línea en vez de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+def exportar_logs(formato, **filtros):
+    """
+    Genera la exportación de los logs filtrados, por partes.
+
+    Las filas se leen con iterator(), de a EXPORTACION_LOTE, y se entregan
+    de a EXPORTACION_PARTE: la memoria usada no depende del total.
+
+    Args:
+        formato: 'csv' o 'jsonl'
+        **filtros: usuario, accion, modelo, fecha_desde, fecha_hasta
+
+    Yields:
+        str: Partes del archivo
+    """
+    filas = consultar_logs(
+        orden=('fecha', 'id'), campos=CAMPOS_EXPORTACION, **filtros
+    ).iterator(chunk_size=EXPORTACION_LOTE)
+
+    if formato == 'csv':
+        escritor = csv.writer(_Eco())
+        # BOM: las planillas reconocen así el UTF-8
+        parte = ['\ufeff' + escritor.writerow(CAMPOS_EXPORTACION + ('archivado',))]
+        convertir = lambda fila: escritor.writerow([_celda_csv(valor) for valor in fila.values()])
+    else:
+        parte = []
+        convertir = lambda fila: json.dumps(fila, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    for fila in filas:
+        parte.append(convertir(fila))
+        if len(parte) >= EXPORTACION_PARTE:
+            yield ''.join(parte)
+            parte = []
+    if parte:
+        yield ''.join(parte)
+
+
+def comprimir_gzip(partes):
+    """Comprime al vuelo un iterable de str en formato gzip."""
+    compresor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for parte in partes:
+        datos = compresor.compress(parte.encode('utf-8'))
+        if datos:
+            yield datos
+    yield compresor.flush()
@@ -0,0 +1,134 @@
+"""
+Autocompletado de personas y causas
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Los formularios que eligen una persona o una causa ya no listan la tabla
+completa en un <select>: el navegador pide páginas pequeñas de JSON a
+medida que se escribe (static/js/autocompletar.js).
+
+- Cada palabra se busca como prefijo en el índice de texto completo, y un
+  RUN en el índice de run_normalizado (ver busqueda.py): no se recorre la
+  tabla.
+- Las causas se restringen por rol igual que en los listados.
+- Cada página se guarda en caché por alcance, texto y filtros; se invalida
+  al modificar personas o causas.
+"""
+
+from .busqueda import filtrar
+from .cache_utils import get_autocompletar
+from .models import Causa, Persona
+from .permissions import obtener_rol_usuario
+
+
+POR_PAGINA = 20
+MAX_PAGINAS = 10
+MAX_LARGO_CONSULTA = 100
+
+
+def _pagina(queryset, pagina, texto):
+    """Página de resultados como lista de {'id', 'texto'} y si hay más."""
+    inicio = (pagina - 1) * POR_PAGINA
+    objetos = list(queryset[inicio:inicio + POR_PAGINA + 1])
+    return {
+        'resultados': [
+            {'id': objeto.pk, 'texto': texto(objeto)} for objeto in objetos[:POR_PAGINA]
+        ],
+        'pagina': pagina,
+        'hay_mas': len(objetos) > POR_PAGINA and pagina < MAX_PAGINAS,
+    }
+
+
+def limpiar_parametros(consulta, pagina):
+    """Normaliza el texto y el número de página recibidos."""
+    consulta = ' '.join((consulta or '').split())[:MAX_LARGO_CONSULTA]
+    try:
+        pagina = min(max(int(pagina), 1), MAX_PAGINAS)
+    except (TypeError, ValueError):
+        pagina = 1
+    return consulta, pagina
+
+
+# =============================================================================
+# PERSONAS
+# =============================================================================
+
+def texto_persona(persona):
+    return f'{persona.apellidos}, {persona.nombres} ({persona.run})'
+
+
+def calcular_personas(consulta, pagina, solo_activas=False):
+    personas = Persona.objects.only('id', 'run', 'nombres', 'apellidos')
+    if solo_activas:
+        personas = personas.filter(activo=True)
+    if consulta:
+        personas = filtrar(personas, 'persona', consulta)
+    else:
+        personas = personas.order_by('-id')
+    return _pagina(personas, pagina, texto_persona)
+
+
+def autocompletar_personas(consulta, pagina=1, solo_activas=False):
+    """
+    Página de personas que coinciden con el texto.
+
+    Returns:
+        dict: {'resultados': [{'id', 'texto'}], 'pagina', 'hay_mas'}
+    """
+    consulta, pagina = limpiar_parametros(consulta, pagina)
+    parametros = {
+        'consulta': consulta.lower(),
+        'pagina': pagina,
+        'activas': solo_activas,
+    }
+    return get_autocompletar(
+        'personas', parametros,
+        lambda: calcular_personas(consulta, pagina, solo_activas)
+    )
+
+
+# =============================================================================
+# CAUSAS
+# =============================================================================
+
+def texto_causa(causa):
+    return f'{causa.caratula} (RIT: {causa.rit})' if causa.rit else causa.caratula
+
+
+def causas_visibles(usuario):
+    """Causas que el usuario puede elegir: el estudiante, solo las asignadas."""
+    causas = Causa.objects.all()
+    if obtener_rol_usuario(usuario) == 'ESTUDIANTE':
+        causas = causas.filter(responsable=usuario)
+    return causas
+
+
+def calcular_causas(usuario, consulta, pagina, solo_activas=False):
+    causas = causas_visibles(usuario).only('id', 'caratula', 'rit')
+    if solo_activas:
+        causas = causas.exclude(estado__es_final=True)
+    if consulta:
+        causas = filtrar(causas, 'causa', consulta)
+    else:
+        causas = causas.order_by('-fecha_creacion')
+    return _pagina(causas, pagina, texto_causa)
+
+
+def autocompletar_causas(usuario, consulta, pagina=1, solo_activas=False):
+    """
+    Página de causas visibles para el usuario que coinciden con el texto.
+
+    Returns:
+        dict: {'resultados': [{'id', 'texto'}], 'pagina', 'hay_mas'}
+    """
+    consulta, pagina = limpiar_parametros(consulta, pagina)
+    rol = obtener_rol_usuario(usuario)
+    parametros = {
+        'alcance': f'usuario:{usuario.pk}' if rol == 'ESTUDIANTE' else 'todas',
+        'consulta': consulta.lower(),
+        'pagina': pagina,
+        'activas': solo_activas,
+    }
+    return get_autocompletar(
+        'causas', parametros,
+        lambda: calcular_causas(usuario, consulta, pagina, solo_activas)
+    )
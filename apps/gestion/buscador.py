@@ -0,0 +1,257 @@
+"""
+Búsqueda global en causas, personas y documentos
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Cada sección (causas, personas, documentos) es una búsqueda independiente
+en el índice de texto completo (busqueda.py):
+
+- Las secciones se ejecutan en paralelo, cada una en un hilo con su propia
+  conexión y su propio contexto del request: la búsqueda tarda lo que la
+  sección más lenta, no la suma.
+- Cada sección obtiene en una consulta los ids ordenados por relevancia,
+  hasta MAX_RESULTADOS. Con eso se conoce el total (exacto, o "más de
+  MAX_RESULTADOS") y cualquier página se arma sin volver a buscar.
+- Solo se cargan los objetos de la página mostrada (in_bulk sobre el
+  queryset restringido por rol).
+- Se puede paginar dentro de una sección sin ejecutar las otras dos.
+- La lista de ids se guarda en caché por texto normalizado, filtros y
+  alcance del rol, y vence al modificarse la entidad (generaciones de
+  cache_utils). Como los objetos se cargan siempre con el queryset
+  restringido, un id en caché nunca muestra algo que el usuario no puede
+  ver.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, connections
+
+from .busqueda import es_rut, filtrar
+from .cache_utils import NS_CAUSAS, combinar_estado_request, get_generacion, get_ids_busqueda
+from .contexto import ContextoRequest, contexto_actual, ejecutar_en_contexto
+from .models import Causa, Documento, Persona
+from .permissions import obtener_rol_usuario
+from .similitud import buscar_similares, plegar
+from .validators import limpiar_rut
+
+
+SECCIONES = ('causas', 'personas', 'documentos')
+
+POR_PAGINA = 20
+
+# Ids por sección que se obtienen de una vez; sobre este número el total
+# se informa como "más de"
+MAX_RESULTADOS = 500
+
+# Filtros de la búsqueda (solo aplican a causas)
+FILTROS = ('estado', 'materia', 'fecha_desde', 'fecha_hasta')
+
+
+class ResultadoSeccion:
+    """Página de resultados de una sección y su total."""
+
+    def __init__(self, seccion, objetos, total, pagina):
+        self.seccion = seccion
+        self.object_list = objetos
+        self.number = pagina
+        self.total_exacto = total <= MAX_RESULTADOS
+        self.total = min(total, MAX_RESULTADOS)
+
+    @property
+    def num_pages(self):
+        return max(1, -(-self.total // POR_PAGINA))
+
+    def has_next(self):
+        return self.number < self.num_pages
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+# =============================================================================
+# CONSULTAS POR SECCIÓN
+# =============================================================================
+
+def queryset_seccion(seccion, usuario, filtros):
+    """
+    Objetos de la sección que el usuario puede ver, con los filtros
+    aplicados y las relaciones que muestra la plantilla.
+    """
+    es_estudiante = obtener_rol_usuario(usuario) == 'ESTUDIANTE'
+
+    if seccion == 'causas':
+        causas = Causa.objects.select_related('tribunal', 'materia', 'estado', 'responsable')
+        if es_estudiante:
+            causas = causas.filter(responsable=usuario)
+        if filtros.get('estado'):
+            causas = causas.filter(estado_id=filtros['estado'])
+        if filtros.get('materia'):
+            causas = causas.filter(materia_id=filtros['materia'])
+        if filtros.get('fecha_desde'):
+            causas = causas.filter(fecha_creacion__gte=filtros['fecha_desde'])
+        if filtros.get('fecha_hasta'):
+            causas = causas.filter(fecha_creacion__lte=filtros['fecha_hasta'])
+        return causas
+
+    if seccion == 'personas':
+        return Persona.objects.all()
+
+    documentos = Documento.objects.select_related('causa', 'causa__responsable', 'tipo')
+    if es_estudiante:
+        documentos = documentos.filter(causa__responsable=usuario)
+    return documentos
+
+
+def normalizar_consulta(query):
+    """
+    Forma canónica del texto para la clave de caché: textos que producen
+    la misma búsqueda ("Núñez ", "nunez") comparten la entrada.
+    """
+    if es_rut(query):
+        # Con guión se busca exacto, sin guión por prefijo
+        return f"rut:{limpiar_rut(query)}:{'-' in query}"
+    return plegar(query)
+
+
+def parametros_cache(seccion, usuario, query, filtros):
+    """Lo que identifica los resultados de una sección en caché."""
+    es_estudiante = obtener_rol_usuario(usuario) == 'ESTUDIANTE'
+    parametros = {
+        'consulta': normalizar_consulta(query),
+        # Personas no se restringe por rol: se comparte entre usuarios
+        'alcance': f'usuario:{usuario.pk}' if es_estudiante and seccion != 'personas' else 'todos',
+    }
+    if seccion == 'causas':
+        parametros.update((filtro, filtros.get(filtro) or '') for filtro in FILTROS)
+    if seccion == 'documentos' and es_estudiante:
+        # Los documentos del estudiante dependen de las causas que tiene asignadas
+        parametros['causas'] = get_generacion(NS_CAUSAS)
+    return parametros
+
+
+def ids_seccion(seccion, usuario, query, filtros):
+    """
+    Ids de los resultados de una sección ordenados por relevancia (hasta
+    MAX_RESULTADOS + 1, para saber si hay más), desde caché si es posible.
+    """
+    return get_ids_busqueda(
+        seccion,
+        parametros_cache(seccion, usuario, query, filtros),
+        lambda: calcular_ids(seccion, usuario, query, filtros)
+    )
+
+
+def calcular_ids(seccion, usuario, query, filtros):
+    queryset = queryset_seccion(seccion, usuario, filtros)
+    tipo = seccion[:-1]
+    ids = list(
+        filtrar(queryset, tipo, query).values_list('pk', flat=True)[:MAX_RESULTADOS + 1]
+    )
+    if not ids and seccion == 'personas' and not es_rut(query):
+        # Sin coincidencias exactas: nombres parecidos (errores de escritura)
+        ids = [persona.pk for persona in buscar_similares(query, queryset, limite=MAX_RESULTADOS)]
+    return ids
+
+
+def buscar_seccion(seccion, usuario, query, filtros, pagina=1):
+    """
+    Una página de resultados de una sección.
+
+    Args:
+        seccion: 'causas', 'personas' o 'documentos'
+        usuario: Usuario que busca (restricción por rol)
+        query: Texto ingresado
+        filtros: Diccionario con las claves de FILTROS
+        pagina: Número de página (se ajusta al rango válido)
+
+    Returns:
+        ResultadoSeccion
+    """
+    ids = ids_seccion(seccion, usuario, query, filtros)
+    paginas = max(1, -(-min(len(ids), MAX_RESULTADOS) // POR_PAGINA))
+    pagina = min(max(pagina, 1), paginas)
+    ids_pagina = ids[(pagina - 1) * POR_PAGINA:pagina * POR_PAGINA]
+
+    objetos = queryset_seccion(seccion, usuario, filtros).in_bulk(ids_pagina)
+    return ResultadoSeccion(
+        seccion, [objetos[pk] for pk in ids_pagina if pk in objetos], len(ids), pagina
+    )
+
+
+# =============================================================================
+# EJECUCIÓN EN PARALELO
+# =============================================================================
+
+def _en_hilo(contexto, funcion, *args):
+    # Cada hilo abre su propia conexión y la cierra al terminar
+    try:
+        return ejecutar_en_contexto(contexto, funcion, *args)
+    finally:
+        connections.close_all()
+
+
+def buscar_en_secciones(usuario, query, filtros, secciones, paginas=None):
+    """
+    Ejecuta la búsqueda en varias secciones a la vez.
+
+    Args:
+        usuario: Usuario que busca
+        query: Texto ingresado
+        filtros: Diccionario con las claves de FILTROS
+        secciones: Secciones a buscar (subconjunto de SECCIONES)
+        paginas: Diccionario sección -> número de página (por defecto 1)
+
+    Returns:
+        dict: sección -> ResultadoSeccion
+    """
+    paginas = paginas or {}
+    secciones = [seccion for seccion in SECCIONES if seccion in secciones]
+
+    # Dentro de una transacción los otros hilos no verían sus cambios
+    # (p. ej. en los tests): se busca en el hilo actual
+    if len(secciones) < 2 or connection.in_atomic_block:
+        return {
+            seccion: buscar_seccion(seccion, usuario, query, filtros, paginas.get(seccion, 1))
+            for seccion in secciones
+        }
+
+    # Cada tarea recibe su propio ContextoRequest: los datos del request
+    # (generaciones leídas, invalidaciones pendientes, ...) no son seguros
+    # para modificarse desde varios hilos
+    actual = contexto_actual()
+    contextos = {
+        seccion: ContextoRequest(actual.request) if actual is not None else None
+        for seccion in secciones
+    }
+    with ThreadPoolExecutor(max_workers=len(secciones), thread_name_prefix='buscar') as pool:
+        futuros = {
+            seccion: pool.submit(
+                _en_hilo, contextos[seccion], buscar_seccion,
+                seccion, usuario, query, filtros, paginas.get(seccion, 1)
+            )
+            for seccion in secciones
+        }
+        resultados = {seccion: futuro.result() for seccion, futuro in futuros.items()}
+
+    # Lo que dejaron pendiente los hilos se aplica con el request, desde este hilo
+    for contexto in contextos.values():
+        if contexto is not None:
+            combinar_estado_request(contexto)
+    return resultados
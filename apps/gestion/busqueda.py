@@ -0,0 +1,271 @@
+"""
+Índice de búsqueda de texto completo
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Las búsquedas con icontains ('%texto%') recorren la tabla completa: ningún
+índice sirve para un comodín inicial. En SQLite se mantiene una tabla
+virtual FTS5 con el texto buscable de causas, personas y documentos:
+
+- El tokenizador unicode61 con remove_diacritics ignora mayúsculas y
+  tildes ("nunez" encuentra "Núñez").
+- Cada palabra de la consulta se busca como prefijo y los resultados se
+  ordenan por relevancia (BM25, el título pesa más que el contenido).
+- Los signals actualizan el índice en la misma transacción que el objeto;
+  `manage.py reconstruir_busqueda` lo regenera completo.
+
+Con otra base de datos se usa la búsqueda con icontains de siempre.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .validators import calcular_digito_verificador, limpiar_rut
+
+
+TABLA = 'gestion_busqueda'
+
+# rowid = id * FACTOR_ROWID + código del tipo: una fila por objeto, que
+# se reemplaza o elimina directamente por su rowid
+FACTOR_ROWID = 4
+TIPOS = {'causa': 1, 'persona': 2, 'documento': 3}
+
+# Peso de las columnas (titulo, contenido) en BM25
+PESOS_BM25 = (10.0, 1.0)
+
+# Campos de la búsqueda con icontains (sin FTS5)
+CAMPOS_ICONTAINS = {
+    'causa': ('rit', 'ruc', 'caratula'),
+    'persona': ('run', 'nombres', 'apellidos', 'email'),
+    'documento': ('titulo', 'descripcion', 'numero_documento'),
+}
+
+CREAR_TABLA = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA} USING fts5("
+    "titulo, contenido, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+PATRON_RUT = re.compile(r'^[0-9][0-9.\s]*-?\s*[0-9kK]?$')
+# Largo mínimo de un RUT normalizado para buscarlo como tal: cuerpo de
+# 7 dígitos y dígito verificador
+RUT_LARGO_MINIMO = 8
+
+
+def _unir(*valores):
+    return ' '.join(str(valor) for valor in valores if valor)
+
+
+# =============================================================================
+# TEXTO INDEXADO
+# =============================================================================
+
+def texto_causa(causa):
+    return causa.caratula, _unir(causa.rit, causa.ruc)
+
+
+def texto_persona(persona):
+    return (
+        _unir(persona.nombres, persona.apellidos),
+        _unir(persona.run, limpiar_rut(persona.run), persona.email),
+    )
+
+
+def texto_documento(documento):
+    return documento.titulo, _unir(documento.numero_documento, documento.descripcion)
+
+
+TEXTOS = {
+    'causa': texto_causa,
+    'persona': texto_persona,
+    'documento': texto_documento,
+}
+
+
+# =============================================================================
+# MANTENCIÓN DEL ÍNDICE
+# =============================================================================
+
+def fts_disponible():
+    """El índice solo existe en SQLite (FTS5)."""
+    return connection.vendor == 'sqlite'
+
+
+def _rowid(tipo, pk):
+    return pk * FACTOR_ROWID + TIPOS[tipo]
+
+
+def indexar(tipo, objetos, extra=None):
+    """
+    Agrega o reemplaza en el índice los objetos indicados.
+
+    Args:
+        tipo: 'causa', 'persona' o 'documento'
+        objetos: Instancias del modelo correspondiente
+        extra: Diccionario pk -> texto adicional para el contenido (p. ej.
+               el texto extraído del archivo de un documento)
+    """
+    if not fts_disponible():
+        return
+    extra = extra or {}
+    filas = []
+    for objeto in objetos:
+        titulo, contenido = TEXTOS[tipo](objeto)
+        filas.append((_rowid(tipo, objeto.pk), titulo, _unir(contenido, extra.get(objeto.pk))))
+    if filas:
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {TABLA} (rowid, titulo, contenido) VALUES (%s, %s, %s)',
+                filas
+            )
+
+
+def desindexar(tipo, pk):
+    """Quita un objeto del índice."""
+    if not fts_disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA} WHERE rowid = %s', [_rowid(tipo, pk)])
+
+
+def reconstruir_indice(modelos, lote=1000, textos=None):
+    """
+    Regenera el índice completo.
+
+    Args:
+        modelos: Diccionario tipo -> modelo (acepta modelos históricos,
+                 para usarla desde una migración)
+        lote: Objetos leídos por consulta
+        textos: Función (tipo, objetos) -> dict pk -> texto adicional
+                (ver extraccion.textos_indexables)
+
+    Returns:
+        dict: Objetos indexados por tipo
+    """
+    if not fts_disponible():
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(CREAR_TABLA)
+        cursor.execute(f'DELETE FROM {TABLA}')
+
+    def indexar_lote(tipo, objetos):
+        indexar(tipo, objetos, extra=textos(tipo, objetos) if textos and objetos else None)
+
+    totales = {}
+    for tipo, modelo in modelos.items():
+        objetos = []
+        totales[tipo] = 0
+        for objeto in modelo._default_manager.order_by().iterator(chunk_size=lote):
+            objetos.append(objeto)
+            if len(objetos) >= lote:
+                indexar_lote(tipo, objetos)
+                totales[tipo] += len(objetos)
+                objetos = []
+        indexar_lote(tipo, objetos)
+        totales[tipo] += len(objetos)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLA} ({TABLA}) VALUES ('optimize')")
+    return totales
+
+
+# =============================================================================
+# CONSULTA
+# =============================================================================
+
+def es_rut(consulta):
+    """
+    Indica si el texto ingresado es un RUT completo: con formato de RUT,
+    al menos RUT_LARGO_MINIMO caracteres y dígito verificador válido.
+    Otros números (teléfonos, direcciones, un RUT a medias) se buscan
+    como texto.
+    """
+    consulta = consulta.strip()
+    if not PATRON_RUT.match(consulta):
+        return False
+    normalizado = limpiar_rut(consulta)
+    return (
+        len(normalizado) >= RUT_LARGO_MINIMO
+        and calcular_digito_verificador(normalizado[:-1]) == normalizado[-1]
+    )
+
+
+def filtro_rut(consulta, campo='run_normalizado'):
+    """
+    Condición sobre una columna de RUT normalizado (limpiar_rut).
+
+    Un RUT con guión (dígito verificador explícito) se busca exacto; el
+    resto por prefijo, como rango [prefijo, siguiente prefijo) para que use
+    el índice de la columna (LIKE en SQLite no distingue mayúsculas y no
+    lo usa).
+
+    Args:
+        consulta: RUT en cualquier formato (12.345.678-9, 123456789, 12.345)
+        campo: Columna normalizada, p. ej. 'representante_run_normalizado'
+    """
+    normalizado = limpiar_rut(consulta)
+    if not normalizado:
+        return Q(pk__in=[])
+    if '-' in consulta:
+        return Q(**{campo: normalizado})
+    siguiente = normalizado[:-1] + chr(ord(normalizado[-1]) + 1)
+    return Q(**{f'{campo}__gte': normalizado, f'{campo}__lt': siguiente})
+
+
+def expresion_fts(consulta):
+    """
+    Convierte el texto ingresado en una expresión MATCH de FTS5: todas las
+    palabras, cada una como prefijo. Un RUT se busca además normalizado.
+    Retorna '' si la consulta no tiene palabras.
+    """
+    palabras = re.findall(r'\w+', consulta.lower())
+    if not palabras:
+        return ''
+    expresion = ' '.join(f'"{palabra}"*' for palabra in palabras)
+    if PATRON_RUT.match(consulta.strip()):
+        expresion = f'({expresion}) OR "{limpiar_rut(consulta).lower()}"*'
+    return expresion
+
+
+def filtrar(queryset, tipo, consulta):
+    """
+    Filtra un queryset por texto y lo ordena por relevancia.
+
+    Se aplica sobre el queryset ya filtrado (p. ej. por rol), de modo que
+    esos filtros se respetan siempre. Un RUT en la búsqueda de personas se
+    resuelve con el índice de run_normalizado.
+
+    Args:
+        queryset: QuerySet de Causa, Persona o Documento
+        tipo: 'causa', 'persona' o 'documento'
+        consulta: Texto ingresado por el usuario
+    """
+    if tipo == 'persona' and es_rut(consulta):
+        return queryset.filter(filtro_rut(consulta))
+
+    if not fts_disponible():
+        condicion = Q()
+        for campo in CAMPOS_ICONTAINS[tipo]:
+            condicion |= Q(**{f'{campo}__icontains': consulta})
+        return queryset.filter(condicion)
+
+    expresion = expresion_fts(consulta)
+    if not expresion:
+        return queryset.none()
+
+    tabla_modelo = queryset.model._meta.db_table
+    pesos = ', '.join(str(peso) for peso in PESOS_BM25)
+    # Join con el índice: MATCH se evalúa una sola vez y cada coincidencia
+    # lleva a su fila por clave primaria (una subconsulta correlacionada
+    # repetiría la búsqueda por cada fila). BM25 es negativo: menor es más
+    # relevante.
+    return queryset.extra(
+        select={'relevancia': f'bm25({TABLA}, {pesos})'},
+        tables=[TABLA],
+        where=[
+            f'{TABLA} MATCH %s',
+            f'{TABLA}.rowid %% {FACTOR_ROWID} = %s',
+            f'"{tabla_modelo}"."id" = ({TABLA}.rowid - %s) / {FACTOR_ROWID}',
+        ],
+        params=[expresion, TIPOS[tipo], TIPOS[tipo]],
+    ).order_by('relevancia', '-pk')
@@ -1,10 +1,37 @@
 """
 Utilidades de caché para optimización de rendimiento
 Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Invalidación por generaciones: cada catálogo (namespace) tiene un número
+de generación en caché y cada entrada guarda la generación con la que se
+calculó. Invalidar es cambiar la generación, lo que se hace una sola vez
+por request y solo si la transacción que modificó los datos confirma.
+
+Dos niveles: el caché configurado (L2) es compartido entre workers y guarda
+generaciones y valores; cada proceso mantiene además un L1 en memoria con
+los catálogos ya deserializados. Una entrada del L1 solo se usa si su
+generación coincide con la del L2, y dentro de un request cada generación
+se lee del L2 una sola vez.
+
+Las entradas tienen vencimiento blando: al vencer, un solo proceso las
+recalcula mientras el resto sigue usando el valor anterior.
+
+Los resultados por consulta (búsqueda, conteos, autocompletado) se guardan
+en el alias CACHE_CONSULTAS, que puede desalojarse sin tocar las
+generaciones ni los bloqueos del alias por defecto.
 """
 
-from django.core.cache import cache
+import hashlib
+import time
+import uuid
+
+from django.core.cache import cache, caches
 from django.conf import settings
+from django.db import transaction
+from .contexto import al_terminar_request, contexto_actual
+from .metricas_cache import (
+    registrar_acierto, registrar_obsoleto, registrar_fallo, registrar_relleno
+)
 from .models import (
     Tribunal, Materia, EstadoCausa, TipoDocumento
 )
@@ -17,126 +44,383 @@ CACHE_KEY_MATERIAS = 'catalogos:materias:activos'
 CACHE_KEY_ESTADOS = 'catalogos:estados:activos'
 CACHE_KEY_TIPOS_DOC = 'catalogos:tipos_documento:activos'
 CACHE_KEY_RESPONSABLES = 'catalogos:responsables:activos'
+CACHE_KEY_DASHBOARD = 'dashboard:snapshot:{alcance}'
+CACHE_KEY_REPORTE = 'reportes:resumen'
+CACHE_KEY_CALENDARIO = 'calendario:{mes}'
+CACHE_KEY_AUDITORIA = 'auditoria:estadisticas:{filtros}'
+CACHE_KEY_AUTOCOMPLETAR = 'autocompletar:{tipo}:{consulta}'
+CACHE_KEY_BUSQUEDA = 'busqueda:{seccion}:{consulta}'
+CACHE_KEY_GENERACION = 'generacion:{namespace}'
+CACHE_KEY_BLOQUEO = '{clave}:bloqueo'
+
+# Alias de caché de los resultados por consulta (ver CACHES en settings)
+CACHE_CONSULTAS = 'consultas'
+
+# Namespaces de invalidación
+NS_TRIBUNALES = 'tribunales'
+NS_MATERIAS = 'materias'
+NS_ESTADOS = 'estados'
+NS_TIPOS_DOC = 'tipos_documento'
+NS_RESPONSABLES = 'responsables'
+NS_DASHBOARD = 'dashboard'
+NS_REPORTES = 'reportes'
+NS_CALENDARIO = 'calendario'
+NS_AUDITORIA = 'auditoria'
+NS_PERSONAS = 'personas'
+NS_CAUSAS = 'causas'
+NS_DOCUMENTOS = 'documentos'
+NS_AUDIENCIAS = 'audiencias'
+NS_CONSENTIMIENTOS = 'consentimientos'
+NS_USUARIOS = 'usuarios'
+
+NAMESPACES_CATALOGOS = [
+    NS_TRIBUNALES, NS_MATERIAS, NS_ESTADOS, NS_TIPOS_DOC, NS_RESPONSABLES,
+]
+
+# Tiempo máximo que un proceso retiene el recálculo de una entrada
+CALCULO_BLOQUEO_TIMEOUT = 30
+# Espera de quienes no tienen el bloqueo ni un valor anterior que servir
+CALCULO_ESPERA_MAXIMA = 2
+CALCULO_ESPERA_INTERVALO = 0.05
+
+
+# =============================================================================
+# GENERACIONES
+# =============================================================================
+
+# Clave del estado de caché en el contexto del request: invalidaciones
+# pendientes y generaciones ya leídas
+ESTADO_REQUEST = 'cache:estado'
+
+
+def _estado_request():
+    contexto = contexto_actual()
+    if contexto is None:
+        return None
+    return contexto.obtener(
+        ESTADO_REQUEST, lambda: {'pendientes': set(), 'generaciones': {}}
+    )
+
+
+def _nueva_generacion():
+    # Basada en el reloj: nunca repite una generación anterior aunque la
+    # clave haya sido desalojada o el caché limpiado
+    return time.time_ns()
+
+
+def get_generacion(namespace):
+    """Retorna la generación vigente de un namespace."""
+    estado = _estado_request()
+    leidas = None
+    if estado is not None:
+        if namespace in estado['pendientes']:
+            # El propio request modificó los datos: aplicar antes de leer
+            estado['pendientes'].discard(namespace)
+            incrementar_generacion(namespace)
+        leidas = estado['generaciones']
+        if namespace in leidas:
+            return leidas[namespace]
+
+    clave = CACHE_KEY_GENERACION.format(namespace=namespace)
+    generacion = cache.get(clave)
+    if generacion is None:
+        cache.add(clave, _nueva_generacion(), None)
+        generacion = cache.get(clave)
+
+    if leidas is not None:
+        leidas[namespace] = generacion
+    return generacion
+
+
+def incrementar_generacion(namespace):
+    """Cambia de inmediato la generación de un namespace."""
+    generacion = _nueva_generacion()
+    cache.set(CACHE_KEY_GENERACION.format(namespace=namespace), generacion, None)
+
+    estado = _estado_request()
+    if estado is not None:
+        estado['generaciones'][namespace] = generacion
+
+
+def invalidar_namespace(namespace):
+    """
+    Programa la invalidación de un namespace.
+
+    Se aplica al confirmar la transacción en curso (se descarta si hace
+    rollback). Dentro de un request se acumula y se aplica una sola vez al
+    final; fuera de un request se aplica al confirmar.
+    """
+    transaction.on_commit(lambda: _marcar_pendiente(namespace))
+
+
+def _marcar_pendiente(namespace):
+    estado = _estado_request()
+    if estado is None:
+        incrementar_generacion(namespace)
+    else:
+        estado['pendientes'].add(namespace)
+
+
+def combinar_estado_request(contexto):
+    """
+    Suma al request en curso las invalidaciones pendientes que dejó otro
+    ContextoRequest (p. ej. el de un hilo auxiliar). Fuera de un request
+    se aplican de inmediato.
+    """
+    otro = contexto.quitar(ESTADO_REQUEST)
+    if not otro or not otro['pendientes']:
+        return
+    estado = _estado_request()
+    for namespace in otro['pendientes']:
+        if estado is None:
+            incrementar_generacion(namespace)
+        else:
+            estado['pendientes'].add(namespace)
+
+
+@al_terminar_request
+def aplicar_invalidaciones_request():
+    """Aplica las invalidaciones acumuladas del request (al terminarlo)."""
+    contexto = contexto_actual()
+    estado = contexto.quitar(ESTADO_REQUEST) if contexto is not None else None
+    for namespace in (estado['pendientes'] if estado else ()):
+        incrementar_generacion(namespace)
+
+
+# =============================================================================
+# CÁLCULOS EN CACHÉ
+# =============================================================================
+
+# clave -> entrada. Solo guarda lo que se pide con l1=True (catálogos: claves
+# fijas y pocas), así que no necesita límite de tamaño. Los valores se
+# comparten entre requests y hilos: quien los lee no debe modificarlos.
+_l1 = {}
+
+
+def limpiar_l1():
+    """Vacía el L1 del proceso actual."""
+    _l1.clear()
+
+
+def _vigente(entrada, generacion):
+    return (
+        entrada is not None
+        and entrada['generacion'] == generacion
+        and entrada['expira'] > time.time()
+    )
+
+
+def obtener_o_calcular(clave, namespace, calcular, timeout, l1=False, alias='default'):
+    """
+    Obtiene un valor calculado desde caché, recalculándolo cuando vence.
+
+    La entrada vence a los `timeout` segundos (vencimiento blando) o al
+    cambiar la generación del namespace, pero se conserva en caché
+    CACHE_OBSOLETO_TIMEOUT segundos más. Al vencer, solo el proceso que
+    obtiene el bloqueo recalcula; los demás siguen recibiendo el valor
+    anterior. Si no hay valor anterior, esperan brevemente a que el
+    primero termine antes de calcular por su cuenta.
+
+    Args:
+        clave: Clave de caché de la entrada
+        namespace: Namespace de invalidación
+        calcular: Función sin argumentos que produce el valor
+        timeout: Segundos de vigencia del valor
+        l1: Si es True, conserva además el valor deserializado en memoria
+            del proceso
+        alias: Caché donde se guarda el valor (CACHE_CONSULTAS para los
+               resultados por consulta). Generación y bloqueo van siempre
+               en el caché por defecto.
+    """
+    generacion = get_generacion(namespace)
+    valores = caches[alias]
+
+    if l1:
+        entrada = _l1.get(clave)
+        if _vigente(entrada, generacion):
+            registrar_acierto(namespace, 'l1')
+            return entrada['valor']
+
+    entrada = valores.get(clave)
+    if _vigente(entrada, generacion):
+        registrar_acierto(namespace, 'l2')
+        if l1:
+            _l1[clave] = entrada
+        return entrada['valor']
+
+    bloqueo = CACHE_KEY_BLOQUEO.format(clave=clave)
+    token = adquirir_bloqueo(bloqueo, CALCULO_BLOQUEO_TIMEOUT)
+    if token is None:
+        if entrada is not None:
+            registrar_obsoleto(namespace)
+            return entrada['valor']
+        entrada = _esperar_calculo(clave, generacion, alias)
+        if entrada is not None:
+            registrar_acierto(namespace, 'l2')
+            if l1:
+                _l1[clave] = entrada
+            return entrada['valor']
+        # Quien tenía el bloqueo no terminó a tiempo: calcular igual
+        registrar_fallo(namespace)
+        return _guardar(clave, namespace, generacion, calcular, timeout, l1, alias)
+
+    registrar_fallo(namespace)
+    try:
+        return _guardar(clave, namespace, generacion, calcular, timeout, l1, alias)
+    finally:
+        liberar_bloqueo(bloqueo, token)
+
+
+def adquirir_bloqueo(clave, timeout):
+    """
+    Intenta tomar un bloqueo en el caché compartido.
+
+    `cache.add` no es atómico en todos los backends (el de archivos
+    consulta y luego escribe), así que además se relee la clave para
+    confirmar que quedó el token propio.
+
+    Returns:
+        str | None: Token del bloqueo, o None si lo tiene otro proceso
+    """
+    token = uuid.uuid4().hex
+    if cache.add(clave, token, timeout) and cache.get(clave) == token:
+        return token
+    return None
+
+
+def liberar_bloqueo(clave, token):
+    """Libera un bloqueo si todavía pertenece a quien lo tomó."""
+    if cache.get(clave) == token:
+        cache.delete(clave)
+
 
+def _esperar_calculo(clave, generacion, alias='default'):
+    limite = time.monotonic() + CALCULO_ESPERA_MAXIMA
+    while time.monotonic() < limite:
+        time.sleep(CALCULO_ESPERA_INTERVALO)
+        entrada = caches[alias].get(clave)
+        if entrada is not None and entrada['generacion'] == generacion:
+            return entrada
+    return None
+
+
+def _guardar(clave, namespace, generacion, calcular, timeout, l1, alias='default'):
+    inicio = time.perf_counter()
+    valor = calcular()
+    registrar_relleno(namespace, time.perf_counter() - inicio, valor)
+    entrada = {
+        'generacion': generacion,
+        'expira': time.time() + timeout,
+        'valor': valor,
+    }
+    caches[alias].set(clave, entrada, timeout + settings.CACHE_OBSOLETO_TIMEOUT)
+    if l1:
+        _l1[clave] = entrada
+    return valor
+
+
+# =============================================================================
+# CATÁLOGOS
+# =============================================================================
 
 def get_tribunales_activos():
     """Obtiene tribunales activos desde caché."""
-    tribunales = cache.get(CACHE_KEY_TRIBUNALES)
-    
-    if tribunales is None:
-        tribunales = list(
+    return obtener_o_calcular(
+        CACHE_KEY_TRIBUNALES,
+        NS_TRIBUNALES,
+        lambda: list(
             Tribunal.objects.filter(activo=True).order_by('nombre').values(
                 'id', 'nombre', 'ciudad', 'tipo'
             )
-        )
-        cache.set(
-            CACHE_KEY_TRIBUNALES, 
-            tribunales, 
-            settings.CACHE_CATALOGOS_TIMEOUT
-        )
-    
-    return tribunales
+        ),
+        settings.CACHE_CATALOGOS_TIMEOUT,
+        l1=True
+    )
 
 
 def get_materias_activas():
     """Obtiene materias activas desde caché."""
-    materias = cache.get(CACHE_KEY_MATERIAS)
-    
-    if materias is None:
-        materias = list(
+    return obtener_o_calcular(
+        CACHE_KEY_MATERIAS,
+        NS_MATERIAS,
+        lambda: list(
             Materia.objects.filter(activo=True).order_by('nombre').values(
                 'id', 'nombre', 'tipo_tribunal'
             )
-        )
-        cache.set(
-            CACHE_KEY_MATERIAS, 
-            materias, 
-            settings.CACHE_CATALOGOS_TIMEOUT
-        )
-    
-    return materias
+        ),
+        settings.CACHE_CATALOGOS_TIMEOUT,
+        l1=True
+    )
 
 
 def get_estados_activos():
     """Obtiene estados activos desde caché."""
-    estados = cache.get(CACHE_KEY_ESTADOS)
-    
-    if estados is None:
-        estados = list(
+    return obtener_o_calcular(
+        CACHE_KEY_ESTADOS,
+        NS_ESTADOS,
+        lambda: list(
             EstadoCausa.objects.filter(activo=True).order_by('orden').values(
                 'id', 'nombre', 'color', 'orden', 'es_final'
             )
-        )
-        cache.set(
-            CACHE_KEY_ESTADOS, 
-            estados, 
-            settings.CACHE_CATALOGOS_TIMEOUT
-        )
-    
-    return estados
+        ),
+        settings.CACHE_CATALOGOS_TIMEOUT,
+        l1=True
+    )
 
 
 def get_tipos_documento_activos():
     """Obtiene tipos de documento activos desde caché."""
-    tipos = cache.get(CACHE_KEY_TIPOS_DOC)
-    
-    if tipos is None:
-        tipos = list(
+    return obtener_o_calcular(
+        CACHE_KEY_TIPOS_DOC,
+        NS_TIPOS_DOC,
+        lambda: list(
             TipoDocumento.objects.filter(activo=True).order_by('nombre').values(
                 'id', 'nombre', 'categoria'
             )
-        )
-        cache.set(
-            CACHE_KEY_TIPOS_DOC, 
-            tipos, 
-            settings.CACHE_CATALOGOS_TIMEOUT
-        )
-    
-    return tipos
+        ),
+        settings.CACHE_CATALOGOS_TIMEOUT,
+        l1=True
+    )
 
 
 def get_responsables_activos():
     """Obtiene usuarios activos desde caché."""
-    responsables = cache.get(CACHE_KEY_RESPONSABLES)
-    
-    if responsables is None:
-        responsables = list(
+    return obtener_o_calcular(
+        CACHE_KEY_RESPONSABLES,
+        NS_RESPONSABLES,
+        lambda: list(
             User.objects.filter(is_active=True).order_by('first_name', 'username').values(
                 'id', 'username', 'first_name', 'last_name', 'email'
             )
-        )
-        cache.set(
-            CACHE_KEY_RESPONSABLES, 
-            responsables, 
-            settings.CACHE_CATALOGOS_TIMEOUT
-        )
-    
-    return responsables
+        ),
+        settings.CACHE_CATALOGOS_TIMEOUT,
+        l1=True
+    )
 
 
 def invalidar_cache_tribunales():
     """Invalida el caché de tribunales."""
-    cache.delete(CACHE_KEY_TRIBUNALES)
+    invalidar_namespace(NS_TRIBUNALES)
 
 
 def invalidar_cache_materias():
     """Invalida el caché de materias."""
-    cache.delete(CACHE_KEY_MATERIAS)
+    invalidar_namespace(NS_MATERIAS)
 
 
 def invalidar_cache_estados():
     """Invalida el caché de estados."""
-    cache.delete(CACHE_KEY_ESTADOS)
+    invalidar_namespace(NS_ESTADOS)
 
 
 def invalidar_cache_tipos_documento():
     """Invalida el caché de tipos de documento."""
-    cache.delete(CACHE_KEY_TIPOS_DOC)
+    invalidar_namespace(NS_TIPOS_DOC)
 
 
 def invalidar_cache_responsables():
     """Invalida el caché de responsables."""
-    cache.delete(CACHE_KEY_RESPONSABLES)
+    invalidar_namespace(NS_RESPONSABLES)
 
 
 def invalidar_todos_catalogos():
@@ -145,4 +429,203 @@ def invalidar_todos_catalogos():
     invalidar_cache_materias()
     invalidar_cache_estados()
     invalidar_cache_tipos_documento()
-    invalidar_cache_responsables()
\ No newline at end of file
+    invalidar_cache_responsables()
+
+
+# =============================================================================
+# SNAPSHOTS DEL DASHBOARD
+# =============================================================================
+
+def get_snapshot_dashboard(alcance, calcular):
+    """
+    Obtiene el snapshot del dashboard para un alcance (rol o rol:usuario).
+
+    El snapshot vence a los CACHE_DASHBOARD_TIMEOUT segundos o cuando se
+    invalida la generación. Un snapshot vencido se sigue entregando
+    mientras un único proceso calcula el nuevo.
+
+    Args:
+        alcance: Identificador del alcance de los datos
+        calcular: Función sin argumentos que construye el snapshot
+    """
+    return obtener_o_calcular(
+        CACHE_KEY_DASHBOARD.format(alcance=alcance),
+        NS_DASHBOARD,
+        calcular,
+        settings.CACHE_DASHBOARD_TIMEOUT
+    )
+
+
+def invalidar_cache_dashboard():
+    """Marca como obsoletos todos los snapshots del dashboard."""
+    invalidar_namespace(NS_DASHBOARD)
+
+
+# =============================================================================
+# REPORTES Y CALENDARIO
+# =============================================================================
+
+def get_resumen_reporte(calcular):
+    """
+    Obtiene los agregados del reporte sin filtros.
+
+    Args:
+        calcular: Función sin argumentos que calcula los agregados
+    """
+    return obtener_o_calcular(
+        CACHE_KEY_REPORTE,
+        NS_REPORTES,
+        calcular,
+        settings.CACHE_DASHBOARD_TIMEOUT
+    )
+
+
+def get_calendario_mes(mes, calcular):
+    """
+    Obtiene las audiencias de un mes agrupadas por día.
+
+    Args:
+        mes: Fecha del primer día del mes
+        calcular: Función sin argumentos que construye los datos del mes
+    """
+    return obtener_o_calcular(
+        CACHE_KEY_CALENDARIO.format(mes=mes.strftime('%Y-%m')),
+        NS_CALENDARIO,
+        calcular,
+        settings.CACHE_DASHBOARD_TIMEOUT
+    )
+
+
+def invalidar_cache_reportes():
+    """Marca como obsoletos los agregados del reporte."""
+    invalidar_namespace(NS_REPORTES)
+
+
+def invalidar_cache_calendario():
+    """Marca como obsoletos los meses del calendario."""
+    invalidar_namespace(NS_CALENDARIO)
+
+
+# =============================================================================
+# AUDITORÍA
+# =============================================================================
+
+def get_estadisticas_auditoria(filtros, calcular):
+    """
+    Obtiene las estadísticas de auditoria_lista para una combinación de filtros.
+
+    Se registran logs en casi todos los requests, así que no se invalida
+    por escritura: el valor vence a los CACHE_AUDITORIA_TIMEOUT segundos.
+
+    Args:
+        filtros: Diccionario de filtros aplicados
+        calcular: Función sin argumentos que calcula las estadísticas
+    """
+    firma = hashlib.md5(repr(sorted(filtros.items())).encode()).hexdigest()
+    return obtener_o_calcular(
+        CACHE_KEY_AUDITORIA.format(filtros=firma),
+        NS_AUDITORIA,
+        calcular,
+        settings.CACHE_AUDITORIA_TIMEOUT,
+        alias=CACHE_CONSULTAS
+    )
+
+
+def invalidar_cache_auditoria():
+    """Marca como obsoletas las estadísticas de auditoría (p. ej. al archivar)."""
+    invalidar_namespace(NS_AUDITORIA)
+
+
+# =============================================================================
+# AUTOCOMPLETADO
+# =============================================================================
+
+NAMESPACES_AUTOCOMPLETAR = {'personas': NS_PERSONAS, 'causas': NS_CAUSAS}
+
+
+def get_autocompletar(tipo, parametros, calcular):
+    """
+    Obtiene una página de resultados de autocompletado.
+
+    Args:
+        tipo: 'personas' o 'causas'
+        parametros: Diccionario que identifica la página (alcance del
+                    usuario, texto, filtros y número de página)
+        calcular: Función sin argumentos que construye la página
+    """
+    firma = hashlib.md5(repr(sorted(parametros.items())).encode()).hexdigest()
+    return obtener_o_calcular(
+        CACHE_KEY_AUTOCOMPLETAR.format(tipo=tipo, consulta=firma),
+        NAMESPACES_AUTOCOMPLETAR[tipo],
+        calcular,
+        settings.CACHE_AUTOCOMPLETAR_TIMEOUT,
+        alias=CACHE_CONSULTAS
+    )
+
+
+def invalidar_cache_personas():
+    """Marca como obsoletos los resultados de autocompletado y búsqueda de personas."""
+    invalidar_namespace(NS_PERSONAS)
+
+
+def invalidar_cache_causas():
+    """Marca como obsoletos los resultados de autocompletado y búsqueda de causas."""
+    invalidar_namespace(NS_CAUSAS)
+
+
+# =============================================================================
+# BÚSQUEDA GLOBAL
+# =============================================================================
+
+NAMESPACES_BUSQUEDA = {
+    'causas': NS_CAUSAS,
+    'personas': NS_PERSONAS,
+    'documentos': NS_DOCUMENTOS,
+}
+
+
+def get_ids_busqueda(seccion, parametros, calcular):
+    """
+    Obtiene los ids ordenados de los resultados de una sección de la
+    búsqueda global. Se guardan solo ids: los objetos se cargan (y se
+    restringen por rol) en cada request.
+
+    Args:
+        seccion: 'causas', 'personas' o 'documentos'
+        parametros: Diccionario que identifica la búsqueda (alcance del
+                    usuario, texto normalizado y filtros)
+        calcular: Función sin argumentos que retorna la lista de ids
+    """
+    firma = hashlib.md5(repr(sorted(parametros.items())).encode()).hexdigest()
+    return obtener_o_calcular(
+        CACHE_KEY_BUSQUEDA.format(seccion=seccion, consulta=firma),
+        NAMESPACES_BUSQUEDA[seccion],
+        calcular,
+        settings.CACHE_BUSQUEDA_TIMEOUT,
+        alias=CACHE_CONSULTAS
+    )
+
+
+def invalidar_cache_documentos():
+    """Marca como obsoletos los resultados de búsqueda y conteos de documentos."""
+    invalidar_namespace(NS_DOCUMENTOS)
+
+
+# =============================================================================
+# CONTEOS DE LISTADOS
+# Personas, causas y documentos usan los namespaces de arriba (ver conteos.py)
+# =============================================================================
+
+def invalidar_cache_audiencias():
+    """Marca como obsoletos los conteos del listado de audiencias."""
+    invalidar_namespace(NS_AUDIENCIAS)
+
+
+def invalidar_cache_consentimientos():
+    """Marca como obsoletos los conteos del listado de consentimientos."""
+    invalidar_namespace(NS_CONSENTIMIENTOS)
+
+
+def invalidar_cache_usuarios():
+    """Marca como obsoletos los conteos del listado de usuarios."""
+    invalidar_namespace(NS_USUARIOS)
@@ -0,0 +1,175 @@
+"""
+Snapshot de catálogos para formularios y listados
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Construye instancias de modelo a partir de los catálogos en caché
+(cache_utils), con mapas id -> objeto y listas de opciones ordenadas.
+Los formularios y vistas las usan en lugar de consultar la BD en cada
+render. Las instancias se reconstruyen solo cuando cambia la lista en
+caché y se comparten entre requests: son de solo lectura. Lo que se
+asigna a un modelo (el valor limpio de un formulario) es una instancia
+nueva construida con `Catalogo.instancia`.
+"""
+
+from django import forms
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS
+from django.forms.models import ModelChoiceIterator
+
+from .cache_utils import (
+    get_tribunales_activos, get_materias_activas, get_estados_activos,
+    get_tipos_documento_activos, get_responsables_activos
+)
+from .models import Tribunal, Materia, EstadoCausa, TipoDocumento
+
+
+class Catalogo:
+    """
+    Catálogo de objetos activos, en el orden del caché.
+
+    Se itera como una lista de instancias; `get(pk)` resuelve por id y
+    `choices` entrega pares (id, etiqueta) para un <select>.
+    """
+
+    def __init__(self, modelo, filas):
+        self.modelo = modelo
+        self.filas = {fila['id']: fila for fila in filas}
+        self.objetos = [self._construir(fila) for fila in filas]
+        self.por_id = {objeto.pk: objeto for objeto in self.objetos}
+
+    def _construir(self, fila):
+        return self.modelo.from_db(DEFAULT_DB_ALIAS, list(fila), list(fila.values()))
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+    def __contains__(self, pk):
+        return pk in self.por_id
+
+    def get(self, pk, default=None):
+        return self.por_id.get(pk, default)
+
+    def instancia(self, pk):
+        """Instancia propia (no compartida) del objeto `pk`; None si no está."""
+        fila = self.filas.get(pk)
+        return self._construir(fila) if fila is not None else None
+
+    @property
+    def choices(self):
+        return [(objeto.pk, str(objeto)) for objeto in self.objetos]
+
+
+# nombre -> (lista en caché con la que se construyó, Catalogo)
+_snapshots = {}
+
+
+def _snapshot(nombre, modelo, obtener_filas):
+    filas = obtener_filas()
+    actual = _snapshots.get(nombre)
+    # El L1 de cache_utils entrega la misma lista mientras no cambie
+    if actual is not None and actual[0] is filas:
+        return actual[1]
+    catalogo = Catalogo(modelo, filas)
+    _snapshots[nombre] = (filas, catalogo)
+    return catalogo
+
+
+def get_tribunales():
+    """Tribunales activos ordenados por nombre."""
+    return _snapshot('tribunales', Tribunal, get_tribunales_activos)
+
+
+def get_materias():
+    """Materias activas ordenadas por nombre."""
+    return _snapshot('materias', Materia, get_materias_activas)
+
+
+def get_estados():
+    """Estados activos ordenados por `orden`."""
+    return _snapshot('estados', EstadoCausa, get_estados_activos)
+
+
+def get_tipos_documento():
+    """Tipos de documento activos ordenados por nombre."""
+    return _snapshot('tipos_documento', TipoDocumento, get_tipos_documento_activos)
+
+
+def get_responsables():
+    """Usuarios activos ordenados por nombre y username."""
+    return _snapshot('responsables', User, get_responsables_activos)
+
+
+# =============================================================================
+# CAMPOS DE FORMULARIO
+# =============================================================================
+
+class IteradorCatalogo(ModelChoiceIterator):
+    """Opciones de un CatalogoChoiceField, tomadas del snapshot."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for objeto in self.field.catalogo():
+            yield self.choice(objeto)
+
+    def __len__(self):
+        return len(self.field.catalogo()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or len(self.field.catalogo()) > 0
+
+
+class CatalogoChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField que valida y lista opciones desde un catálogo en caché.
+
+    Los ids que no están en el snapshot (p. ej. un estado desactivado que
+    una causa aún conserva) se resuelven contra la BD como lo haría un
+    ModelChoiceField normal. El valor limpio es siempre una instancia
+    nueva: el formulario la asigna al modelo y no debe compartirse.
+
+    Las subclases fijan `catalogo` (función sin argumentos que retorna el
+    Catalogo); así pueden usarse en `Meta.field_classes` de un ModelForm.
+    """
+
+    iterator = IteradorCatalogo
+    catalogo = None
+
+    def __init__(self, queryset, catalogo=None, **kwargs):
+        if catalogo is not None:
+            self.catalogo = catalogo
+        super().__init__(queryset, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            objeto = self.catalogo().instancia(int(value))
+        except (TypeError, ValueError):
+            objeto = None
+        if objeto is not None:
+            return objeto
+        return super().to_python(value)
+
+
+class TribunalChoiceField(CatalogoChoiceField):
+    catalogo = staticmethod(get_tribunales)
+
+
+class MateriaChoiceField(CatalogoChoiceField):
+    catalogo = staticmethod(get_materias)
+
+
+class EstadoChoiceField(CatalogoChoiceField):
+    catalogo = staticmethod(get_estados)
+
+
+class TipoDocumentoChoiceField(CatalogoChoiceField):
+    catalogo = staticmethod(get_tipos_documento)
+
+
+class ResponsableChoiceField(CatalogoChoiceField):
+    catalogo = staticmethod(get_responsables)
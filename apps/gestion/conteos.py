@@ -0,0 +1,146 @@
+"""
+Conteo de resultados de los listados
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Los listados muestran "N resultados" en cada página. En lugar de un
+COUNT(*) sobre el queryset filtrado en cada cambio de página:
+
+- El conteo exacto se guarda en caché por consulta: la clave es el SQL del
+  conteo, de modo que filtros y alcance del rol quedan incluidos. Vence al
+  modificarse cualquiera de las entidades consultadas (generaciones de
+  cache_utils).
+- Un listado sin filtros de una tabla grande usa ContadorTabla, que los
+  signals ajustan en cada alta y eliminación, y se muestra como
+  aproximado. `manage.py recalcular_contadores` lo corrige si se desvía
+  (p. ej. tras escrituras fuera del ORM).
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.utils import timezone
+
+from apps.cuentas.models import Perfil
+
+from .cache_utils import (
+    CACHE_CONSULTAS,
+    NS_AUDIENCIAS,
+    NS_CAUSAS,
+    NS_CONSENTIMIENTOS,
+    NS_DOCUMENTOS,
+    NS_PERSONAS,
+    NS_USUARIOS,
+    get_generacion,
+    obtener_o_calcular,
+)
+from .models import Audiencia, Causa, Consentimiento, ContadorTabla, Documento, Persona
+
+
+CACHE_KEY_CONTEO = 'conteos:{tabla}:{consulta}'
+
+# Filas de una tabla desde las que un listado sin filtros muestra el total
+# aproximado de ContadorTabla
+UMBRAL_APROXIMADO = 50_000
+
+# Tablas con listado y el namespace que invalida sus conteos
+MODELOS_CONTADOS = {
+    Persona: NS_PERSONAS,
+    Causa: NS_CAUSAS,
+    Audiencia: NS_AUDIENCIAS,
+    Documento: NS_DOCUMENTOS,
+    Consentimiento: NS_CONSENTIMIENTOS,
+    User: NS_USUARIOS,
+}
+
+# Namespace por tabla, incluidas las que solo aparecen en filtros (p. ej.
+# el rol del perfil en el listado de usuarios)
+NAMESPACES_TABLAS = {modelo._meta.db_table: ns for modelo, ns in MODELOS_CONTADOS.items()}
+NAMESPACES_TABLAS[Perfil._meta.db_table] = NS_USUARIOS
+
+
+class Conteo:
+    """Total de un listado; aproximado si viene de ContadorTabla."""
+
+    __slots__ = ('total', 'aproximado')
+
+    def __init__(self, total, aproximado=False):
+        self.total = total
+        self.aproximado = aproximado
+
+
+# =============================================================================
+# CONTADORES DE TABLA
+# =============================================================================
+
+def ajustar_contador(modelo, delta):
+    """Suma `delta` a las filas de la tabla del modelo (si se cuenta)."""
+    if modelo in MODELOS_CONTADOS and delta:
+        ContadorTabla.objects.filter(pk=modelo._meta.db_table).update(filas=F('filas') + delta)
+
+
+def recalcular_contadores():
+    """
+    Cuenta de nuevo las filas de todas las tablas contadas.
+
+    Returns:
+        dict: tabla -> filas
+    """
+    ahora = timezone.now()
+    totales = {}
+    for modelo in MODELOS_CONTADOS:
+        tabla = modelo._meta.db_table
+        totales[tabla] = modelo._base_manager.count()
+        ContadorTabla.objects.update_or_create(
+            tabla=tabla, defaults={'filas': totales[tabla], 'fecha_recalculo': ahora}
+        )
+    return totales
+
+
+# =============================================================================
+# CONTEO DE UN LISTADO
+# =============================================================================
+
+def contar(queryset):
+    """
+    Total de filas de un queryset de listado.
+
+    Args:
+        queryset: QuerySet ya filtrado (orden y select_related no importan)
+
+    Returns:
+        Conteo
+    """
+    if queryset.query.is_empty():
+        # queryset.none() (p. ej. una búsqueda sin resultados): no tiene SQL
+        return Conteo(0)
+
+    modelo = queryset.model
+    tabla = modelo._meta.db_table
+    if modelo not in MODELOS_CONTADOS:
+        return Conteo(queryset.count())
+
+    consulta = queryset.order_by().select_related(None).values('pk').query
+    if not consulta.where:
+        filas = ContadorTabla.objects.filter(pk=tabla).values_list('filas', flat=True).first()
+        if filas is not None and filas >= UMBRAL_APROXIMADO:
+            return Conteo(filas, aproximado=True)
+
+    sql, params = consulta.sql_with_params()
+    # Otras tablas de los filtros (p. ej. la causa en los documentos del
+    # estudiante): su generación forma parte de la clave
+    generaciones = sorted(
+        (otra, get_generacion(NAMESPACES_TABLAS[otra]))
+        for otra in {alias.table_name for alias in consulta.alias_map.values()}
+        if otra != tabla and otra in NAMESPACES_TABLAS
+    )
+    firma = hashlib.md5(repr((sql, params, generaciones)).encode()).hexdigest()
+    total = obtener_o_calcular(
+        CACHE_KEY_CONTEO.format(tabla=tabla, consulta=firma),
+        MODELOS_CONTADOS[modelo],
+        queryset.count,
+        settings.CACHE_CONTEOS_TIMEOUT,
+        alias=CACHE_CONSULTAS
+    )
+    return Conteo(total)
@@ -0,0 +1,141 @@
+"""
+Contexto del request en curso
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño y Mantenibilidad
+
+Guarda el request actual y datos por request (buffer de auditoría,
+invalidaciones de caché pendientes, ...) en una ContextVar. A diferencia
+de threading.local, funciona igual con WSGI (un hilo por request) y ASGI
+(varios requests en el mismo hilo), y todo lo guardado se descarta al
+terminar el request.
+
+Los módulos que necesitan hacer algo al cerrar el request (p. ej. volcar
+un buffer) lo registran con `al_terminar_request`.
+"""
+
+import contextvars
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .logging_utils import logger_app
+
+
+# Máximo de claves por request: superarlo indica datos que crecen por
+# objeto (una fuga), no un uso normal
+MAX_DATOS_REQUEST = 64
+
+_contexto = contextvars.ContextVar('contexto_request', default=None)
+
+# Funciones sin argumentos a ejecutar al terminar cada request, en orden
+_finalizadores = []
+
+
+class ContextoRequest:
+    """Datos asociados a un request."""
+
+    __slots__ = ('request', 'datos')
+
+    def __init__(self, request):
+        self.request = request
+        self.datos = {}
+
+    def obtener(self, clave, crear=None):
+        """
+        Retorna el dato `clave` del request.
+
+        Args:
+            clave: Nombre del dato
+            crear: Si el dato no existe y se indica, se guarda `crear()`
+        """
+        if clave not in self.datos:
+            if crear is None:
+                return None
+            if len(self.datos) >= MAX_DATOS_REQUEST:
+                raise RuntimeError(
+                    f'El contexto del request superó {MAX_DATOS_REQUEST} datos'
+                )
+            self.datos[clave] = crear()
+        return self.datos[clave]
+
+    def quitar(self, clave):
+        """Quita y retorna el dato `clave` (None si no existe)."""
+        return self.datos.pop(clave, None)
+
+
+def contexto_actual():
+    """ContextoRequest del request en curso, o None fuera de un request."""
+    return _contexto.get()
+
+
+def get_current_request():
+    """Request en curso, o None fuera de un request."""
+    contexto = _contexto.get()
+    return contexto.request if contexto is not None else None
+
+
+def ejecutar_en_contexto(contexto, funcion, *args):
+    """
+    Ejecuta `funcion` con `contexto` (ContextoRequest o None) como contexto
+    del request. Para hilos auxiliares de un request: cada uno recibe su
+    propio ContextoRequest en lugar de compartir los datos del request.
+    """
+    token = _contexto.set(contexto)
+    try:
+        return funcion(*args)
+    finally:
+        _contexto.reset(token)
+
+
+def al_terminar_request(funcion):
+    """Registra una función a ejecutar al terminar cada request."""
+    if funcion not in _finalizadores:
+        _finalizadores.append(funcion)
+    return funcion
+
+
+def _finalizar():
+    # Cada finalizador es independiente: un error no impide los demás
+    for funcion in _finalizadores:
+        try:
+            funcion()
+        except Exception:
+            logger_app.exception('Error al finalizar el request en %s', funcion.__qualname__)
+
+
+class ContextoRequestMiddleware:
+    """
+    Abre el contexto del request y ejecuta los finalizadores al cerrarlo,
+    aunque la vista haya fallado. Soporta vistas síncronas y asíncronas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = _contexto.set(ContextoRequest(request))
+        try:
+            return self.get_response(request)
+        finally:
+            try:
+                _finalizar()
+            finally:
+                _contexto.reset(token)
+
+    async def __acall__(self, request):
+        token = _contexto.set(ContextoRequest(request))
+        try:
+            return await self.get_response(request)
+        finally:
+            try:
+                # Los finalizadores usan el ORM: ejecutarlos en un hilo,
+                # que recibe una copia del contexto con el mismo ContextoRequest
+                await sync_to_async(_finalizar)()
+            finally:
+                _contexto.reset(token)
@@ -0,0 +1,312 @@
+"""
+Servicio de estadísticas del dashboard
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Calcula todos los contadores del panel principal con agregados
+condicionales: una consulta por entidad, en lugar de un COUNT por cifra.
+Los conteos de causas por estado se leen de la tabla de resumen.
+También calcula los agregados de reportes y los datos del calendario.
+"""
+
+import calendar
+from datetime import datetime, time
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .cache_utils import (
+    get_estados_activos, get_snapshot_dashboard, get_resumen_reporte,
+    get_calendario_mes
+)
+from .models import Causa, Persona, Audiencia, Documento, EstadoCausa, LogAuditoria
+from .permissions import obtener_rol_usuario
+from .resumenes import contar_causas_por
+
+
+def rango_mes(fecha):
+    """Retorna (primer día del mes, primer día del mes siguiente)."""
+    inicio = fecha.replace(day=1)
+    if inicio.month == 12:
+        fin = inicio.replace(year=inicio.year + 1, month=1)
+    else:
+        fin = inicio.replace(month=inicio.month + 1)
+    return inicio, fin
+
+
+def _a_datetime(fecha):
+    """Convierte una fecha a datetime aware al inicio del día (zona local)."""
+    return timezone.make_aware(datetime.combine(fecha, time.min))
+
+
+def _porcentaje(parte, total):
+    return round((parte / total * 100) if total > 0 else 0, 1)
+
+
+def _estados_por_id(ids):
+    """
+    Resuelve estados desde el catálogo en caché.
+    Solo consulta la BD por estados inactivos que aún tengan causas.
+    """
+    estados = {e['id']: e for e in get_estados_activos()}
+    faltantes = [pk for pk in ids if pk not in estados]
+    if faltantes:
+        for estado in EstadoCausa.objects.filter(pk__in=faltantes).values(
+            'id', 'nombre', 'color', 'orden', 'es_final'
+        ):
+            estados[estado['id']] = estado
+    return estados
+
+
+def calcular_estadisticas_dashboard(usuario=None):
+    """
+    Calcula los contadores del dashboard.
+
+    Args:
+        usuario: Si se indica, limita causas, audiencias y documentos a las
+                 causas de las que es responsable (vista de ESTUDIANTE).
+                 Las personas nunca se filtran.
+
+    Returns:
+        dict: Contadores y distribución por estado, listos para el template.
+    """
+    hoy = timezone.localdate()
+    inicio_mes, fin_mes = rango_mes(hoy)
+    desde, hasta = _a_datetime(inicio_mes), _a_datetime(fin_mes)
+
+    if usuario is not None:
+        causas_qs = Causa.objects.filter(responsable=usuario)
+        audiencias_qs = Audiencia.objects.filter(causa__responsable=usuario)
+        documentos_qs = Documento.objects.filter(causa__responsable=usuario)
+    else:
+        causas_qs = Causa.objects.all()
+        audiencias_qs = Audiencia.objects.all()
+        documentos_qs = Documento.objects.all()
+
+    # Causas: conteo por estado desde la tabla de resumen
+    filas = list(contar_causas_por(
+        'estado_id', responsable=usuario.pk if usuario is not None else None
+    ))
+    estados = _estados_por_id([f['estado_id'] for f in filas])
+
+    total_causas = sum(f['total'] for f in filas)
+    causas_mes = causas_qs.filter(
+        fecha_creacion__gte=inicio_mes, fecha_creacion__lt=fin_mes
+    ).count()
+    causas_finalizadas = sum(
+        f['total'] for f in filas
+        if estados.get(f['estado_id'], {}).get('es_final')
+    )
+
+    causas_por_estado = [
+        {
+            'estado': estados[f['estado_id']],
+            'count': f['total'],
+            'porcentaje': _porcentaje(f['total'], total_causas),
+        }
+        for f in filas
+        if f['estado_id'] in estados
+    ]
+
+    # Audiencias, documentos y personas: un agregado condicional cada una
+    audiencias = audiencias_qs.order_by().aggregate(
+        total=Count('id'),
+        mes=Count('id', filter=Q(fecha_hora__gte=desde, fecha_hora__lt=hasta)),
+    )
+    documentos = documentos_qs.order_by().aggregate(
+        total=Count('id'),
+        mes=Count('id', filter=Q(fecha_subida__gte=desde, fecha_subida__lt=hasta)),
+    )
+    personas = Persona.objects.order_by().aggregate(
+        total=Count('id'),
+        mes=Count('id', filter=Q(fecha_registro__gte=desde, fecha_registro__lt=hasta)),
+    )
+
+    return {
+        'total_causas': total_causas,
+        'causas_activas': total_causas - causas_finalizadas,
+        'causas_finalizadas': causas_finalizadas,
+        'causas_mes': causas_mes,
+        'tasa_cierre': _porcentaje(causas_finalizadas, total_causas),
+        'causas_por_estado': causas_por_estado,
+        'total_personas': personas['total'],
+        'personas_mes': personas['mes'],
+        'total_audiencias': audiencias['total'],
+        'audiencias_mes': audiencias['mes'],
+        'total_documentos': documentos['total'],
+        'documentos_mes': documentos['mes'],
+    }
+
+
+def construir_snapshot_dashboard(usuario=None):
+    """
+    Construye todos los datos del dashboard (contadores y listados).
+
+    Los listados se evalúan para que el snapshot pueda guardarse en caché.
+    """
+    if usuario is not None:
+        causas_qs = Causa.objects.filter(responsable=usuario)
+        audiencias_qs = Audiencia.objects.filter(causa__responsable=usuario)
+        actividad_qs = LogAuditoria.objects.filter(usuario=usuario)
+    else:
+        causas_qs = Causa.objects.all()
+        audiencias_qs = Audiencia.objects.all()
+        actividad_qs = LogAuditoria.objects.all()
+
+    datos = calcular_estadisticas_dashboard(usuario=usuario)
+    datos.update({
+        'proximas_audiencias': list(
+            audiencias_qs.select_related('causa', 'causa__tribunal').filter(
+                fecha_hora__gte=timezone.now(),
+                estado__in=['PROGRAMADA', 'CONFIRMADA']
+            ).order_by('fecha_hora')[:5]
+        ),
+        'causas_recientes': list(
+            causas_qs.select_related(
+                'tribunal', 'materia', 'estado', 'responsable'
+            ).order_by('-fecha_creacion')[:5]
+        ),
+        # Personas no se filtran - todos ven todas
+        'personas_recientes': list(Persona.objects.order_by('-id')[:5]),
+        'actividad_reciente': list(
+            actividad_qs.select_related('usuario').order_by('-fecha')[:10]
+        ),
+    })
+    return datos
+
+
+def alcance_dashboard(rol, usuario=None):
+    """
+    Retorna (alcance, usuario por el que se filtra) del snapshot de un rol.
+
+    Los snapshots se comparten por rol; el de ESTUDIANTE es por usuario,
+    ya que sus datos se limitan a las causas de las que es responsable.
+    """
+    if rol == 'ESTUDIANTE':
+        return f'{rol}:{usuario.pk}', usuario
+    return rol, None
+
+
+def obtener_dashboard(usuario, rol=None):
+    """Retorna el snapshot del dashboard para el usuario desde caché."""
+    if rol is None:
+        rol = obtener_rol_usuario(usuario) or 'SIN_ROL'
+    alcance, filtrado_por = alcance_dashboard(rol, usuario)
+    return get_snapshot_dashboard(
+        alcance,
+        lambda: construir_snapshot_dashboard(usuario=filtrado_por)
+    )
+
+
+# =============================================================================
+# REPORTES
+# =============================================================================
+
+def resumir_conteos_reporte(por_estado, por_materia):
+    """
+    Totales y porcentajes del reporte a partir de los conteos agrupados.
+
+    Args:
+        por_estado: Filas con estado__nombre, estado__color, estado__es_final
+                    y total
+        por_materia: Filas con materia__nombre y total (las 5 mayores)
+    """
+    por_estado = list(por_estado)
+    total = sum(item['total'] for item in por_estado)
+    finalizadas = sum(
+        item['total'] for item in por_estado if item['estado__es_final']
+    )
+
+    return {
+        'total': total,
+        'finalizadas': finalizadas,
+        'en_tramitacion': total - finalizadas,
+        'tasa_exito': _porcentaje(finalizadas, total),
+        'causas_por_estado': [
+            {
+                'estado__nombre': item['estado__nombre'],
+                'estado__color': item['estado__color'],
+                'total': item['total'],
+                'porcentaje': _porcentaje(item['total'], total),
+            }
+            for item in por_estado
+        ],
+        'causas_por_materia': [
+            {
+                'materia__nombre': item['materia__nombre'],
+                'total': item['total'],
+                'porcentaje': _porcentaje(item['total'], total),
+            }
+            for item in por_materia
+        ],
+    }
+
+
+def calcular_resumen_reporte(estado='', materia='', tribunal='', responsable=''):
+    """Agregados del reporte desde la tabla de resumen."""
+    filtros = {
+        'estado': estado,
+        'materia': materia,
+        'tribunal': tribunal,
+        'responsable': responsable,
+    }
+    return resumir_conteos_reporte(
+        contar_causas_por(
+            'estado__nombre', 'estado__color', 'estado__es_final', **filtros
+        ),
+        contar_causas_por('materia__nombre', **filtros)[:5],
+    )
+
+
+def obtener_resumen_reporte(**filtros):
+    """
+    Agregados del reporte. Los del reporte sin filtros (la vista por
+    defecto) se sirven desde caché.
+    """
+    if any(filtros.values()):
+        return calcular_resumen_reporte(**filtros)
+    return get_resumen_reporte(calcular_resumen_reporte)
+
+
+# =============================================================================
+# CALENDARIO
+# =============================================================================
+
+def calcular_calendario_mes(mes):
+    """
+    Audiencias de un mes agrupadas por día, con contadores por estado.
+
+    Args:
+        mes: Fecha del primer día del mes
+    """
+    audiencias = Audiencia.objects.select_related('causa').filter(
+        fecha_hora__year=mes.year,
+        fecha_hora__month=mes.month
+    ).order_by('fecha_hora')
+
+    audiencias_por_dia = {}
+    por_estado = {}
+    for aud in audiencias:
+        audiencias_por_dia.setdefault(aud.fecha_hora.day, []).append({
+            'id': aud.id,
+            'hora': aud.fecha_hora.strftime('%H:%M'),
+            'tipo': aud.get_tipo_evento_display(),
+            'causa': str(aud.causa.caratula)[:30],
+            'estado': aud.estado,
+        })
+        por_estado[aud.estado] = por_estado.get(aud.estado, 0) + 1
+
+    return {
+        'semanas': calendar.Calendar(firstweekday=0).monthdatescalendar(
+            mes.year, mes.month
+        ),
+        'audiencias_por_dia': audiencias_por_dia,
+        'total_mes': sum(por_estado.values()),
+        'programadas_mes': por_estado.get('PROGRAMADA', 0),
+        'confirmadas_mes': por_estado.get('CONFIRMADA', 0),
+        'realizadas_mes': por_estado.get('REALIZADA', 0),
+    }
+
+
+def obtener_calendario_mes(mes):
+    """Datos del calendario de un mes desde caché."""
+    return get_calendario_mes(mes, lambda: calcular_calendario_mes(mes))
@@ -0,0 +1,177 @@
+"""
+Cola de extracción de texto de documentos
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Al subir o reemplazar el archivo de un documento solo se encola
+(TextoDocumento en PENDIENTE): la extracción nunca ocurre en el request.
+`manage.py extraer_textos` reserva lotes de la cola, extrae el texto en un
+pool de procesos (extractores.py), lo guarda comprimido y lo agrega al
+índice de búsqueda del documento.
+
+Los documentos cuyo extractor necesita una biblioteca no instalada quedan
+en SIN_EXTRACTOR; el comando los vuelve a encolar al iniciar si la
+biblioteca ya está disponible.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from . import busqueda
+from .cache_utils import invalidar_cache_documentos
+from .extractores import ExtractorNoDisponible, FormatoNoSoportado, extensiones_sin_extractor
+from .models import Documento, TextoDocumento
+
+
+# Reintentos antes de dejar un documento en ERROR
+MAX_INTENTOS = 3
+
+# Un documento en PROCESANDO por más tiempo se considera abandonado (el
+# proceso que lo reservó terminó sin guardar el resultado)
+PROCESANDO_VENCIDO = timedelta(minutes=30)
+
+# Caracteres del texto extraído que se agregan al índice de búsqueda
+MAX_TEXTO_INDICE = 100_000
+
+
+# =============================================================================
+# ENCOLAR
+# =============================================================================
+
+def encolar(documentos):
+    """
+    Pone en la cola de extracción los documentos indicados (nuevos o con
+    el archivo reemplazado). Un texto ya extraído se descarta.
+    """
+    ahora = timezone.now()
+    pendientes = [
+        TextoDocumento(documento_id=documento.pk, fecha_solicitud=ahora)
+        for documento in documentos if documento.archivo
+    ]
+    if pendientes:
+        TextoDocumento.objects.bulk_create(
+            pendientes,
+            update_conflicts=True,
+            unique_fields=['documento'],
+            update_fields=[
+                'estado', 'intentos', 'texto', 'caracteres', 'error',
+                'fecha_solicitud', 'fecha_inicio', 'fecha_proceso',
+            ],
+        )
+
+
+def reencolar_sin_extractor():
+    """
+    Vuelve a poner en la cola los documentos en SIN_EXTRACTOR cuya
+    biblioteca ya está instalada.
+
+    Returns:
+        int: Documentos reencolados
+    """
+    documentos = TextoDocumento.objects.filter(estado='SIN_EXTRACTOR')
+    for extension in extensiones_sin_extractor():
+        documentos = documentos.exclude(documento__archivo__iendswith=extension)
+    return documentos.update(
+        estado='PENDIENTE', intentos=0, error='', fecha_solicitud=timezone.now()
+    )
+
+
+def textos_indexables(tipo, objetos):
+    """
+    Texto extraído a agregar al índice de búsqueda de cada objeto, para
+    busqueda.indexar. Solo los documentos tienen texto extraído.
+
+    Returns:
+        dict: pk -> texto (hasta MAX_TEXTO_INDICE caracteres)
+    """
+    if tipo != 'documento':
+        return {}
+    textos = TextoDocumento.objects.filter(
+        documento_id__in=[objeto.pk for objeto in objetos], estado='COMPLETADO'
+    )
+    return {texto.pk: texto.obtener_texto()[:MAX_TEXTO_INDICE] for texto in textos}
+
+
+# =============================================================================
+# PROCESAR LA COLA
+# =============================================================================
+
+def reservar(cantidad):
+    """
+    Reserva hasta `cantidad` documentos de la cola, los más antiguos primero.
+
+    Cada uno se reserva con un UPDATE condicionado a su estado anterior:
+    si otro proceso lo tomó primero, no se incluye.
+
+    Returns:
+        list: Tuplas (documento_id, ruta del archivo)
+    """
+    ahora = timezone.now()
+    disponibles = Q(estado='PENDIENTE') | Q(
+        estado='PROCESANDO', fecha_inicio__lt=ahora - PROCESANDO_VENCIDO
+    )
+    candidatos = list(
+        TextoDocumento.objects.filter(disponibles)
+        .order_by('fecha_solicitud')
+        .values_list('pk', 'estado', 'intentos')[:cantidad]
+    )
+
+    reservados = []
+    for pk, estado, intentos in candidatos:
+        tomado = TextoDocumento.objects.filter(pk=pk, estado=estado, intentos=intentos).update(
+            estado='PROCESANDO', fecha_inicio=ahora, intentos=intentos + 1
+        )
+        if tomado:
+            reservados.append(pk)
+
+    archivos = Documento.objects.filter(pk__in=reservados).values_list('pk', 'archivo')
+    rutas = {}
+    for pk, nombre in archivos:
+        try:
+            rutas[pk] = Documento._meta.get_field('archivo').storage.path(nombre)
+        except NotImplementedError:
+            rutas[pk] = None
+    return [(pk, rutas.get(pk)) for pk in reservados]
+
+
+def guardar_texto(documento_id, texto, caracteres):
+    """Guarda el texto extraído (comprimido) y lo agrega al índice de búsqueda."""
+    # Si el archivo se reemplazó mientras se procesaba, vuelve a estar
+    # PENDIENTE y este texto ya no corresponde
+    guardado = TextoDocumento.objects.filter(pk=documento_id, estado='PROCESANDO').update(
+        estado='COMPLETADO', texto=texto, caracteres=caracteres,
+        error='', fecha_proceso=timezone.now()
+    )
+    if not guardado:
+        return
+    documento = Documento.objects.filter(pk=documento_id).first()
+    if documento is not None:
+        busqueda.indexar(
+            'documento', [documento], extra=textos_indexables('documento', [documento])
+        )
+        # El texto nuevo puede cambiar los resultados de búsquedas ya guardadas
+        invalidar_cache_documentos()
+
+
+def guardar_error(documento_id, error):
+    """
+    Registra un error de extracción. Se reintenta hasta MAX_INTENTOS veces,
+    salvo que el formato no tenga extractor (NO_SOPORTADO, definitivo) o
+    falte su biblioteca (SIN_EXTRACTOR, ver reencolar_sin_extractor).
+
+    Returns:
+        str: Nuevo estado del documento en la cola
+    """
+    if isinstance(error, FormatoNoSoportado):
+        estado = 'NO_SOPORTADO'
+    elif isinstance(error, ExtractorNoDisponible):
+        estado = 'SIN_EXTRACTOR'
+    else:
+        intentos = TextoDocumento.objects.filter(pk=documento_id).values_list('intentos', flat=True).first() or 0
+        estado = 'ERROR' if intentos >= MAX_INTENTOS else 'PENDIENTE'
+    TextoDocumento.objects.filter(pk=documento_id, estado='PROCESANDO').update(
+        estado=estado, error=str(error)[:500] or error.__class__.__name__,
+        fecha_proceso=timezone.now()
+    )
+    return estado
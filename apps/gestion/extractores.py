@@ -0,0 +1,169 @@
+"""
+Extracción de texto de archivos
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Funciones puras que leen un archivo del disco y retornan su texto. Se
+ejecutan en los procesos del pool de `manage.py extraer_textos`, por lo
+que no usan el ORM ni la configuración de Django.
+
+- PDF: pypdf
+- DOCX: el XML del documento leído directamente desde el ZIP
+- XLSX: openpyxl en modo solo lectura
+
+pypdf y openpyxl están en requirements.txt. Si falta alguno, sus archivos
+quedan en SIN_EXTRACTOR y se vuelven a encolar al instalarlo (a
+diferencia de un formato sin extractor, que es definitivo).
+"""
+
+import os
+import re
+import zipfile
+import zlib
+from xml.etree.ElementTree import iterparse
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
+
+
+# Texto máximo que se guarda por documento
+MAX_CARACTERES = 2_000_000
+
+# Tamaño máximo descomprimido del XML de un DOCX (protege de ZIP bomba)
+MAX_XML_DOCX = 50 * 1024 * 1024
+
+NS_WORD = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class FormatoNoSoportado(Exception):
+    """La extensión del archivo no tiene extractor."""
+
+
+class ExtractorNoDisponible(Exception):
+    """El formato tiene extractor, pero no está instalada la biblioteca que usa."""
+
+
+class _Acumulador:
+    """Junta fragmentos de texto hasta MAX_CARACTERES."""
+
+    def __init__(self):
+        self.partes = []
+        self.largo = 0
+
+    @property
+    def lleno(self):
+        return self.largo >= MAX_CARACTERES
+
+    def agregar(self, texto):
+        if texto and not self.lleno:
+            self.partes.append(texto)
+            self.largo += len(texto)
+
+    def texto(self):
+        return ''.join(self.partes)
+
+
+# =============================================================================
+# EXTRACTORES POR FORMATO
+# =============================================================================
+
+def extraer_pdf(ruta):
+    if PdfReader is None:
+        raise ExtractorNoDisponible('pypdf no está instalado')
+    acumulado = _Acumulador()
+    for pagina in PdfReader(ruta).pages:
+        acumulado.agregar(pagina.extract_text() or '')
+        acumulado.agregar('\n')
+        if acumulado.lleno:
+            break
+    return acumulado.texto()
+
+
+def extraer_docx(ruta):
+    acumulado = _Acumulador()
+    with zipfile.ZipFile(ruta) as archivo:
+        if archivo.getinfo('word/document.xml').file_size > MAX_XML_DOCX:
+            raise ValueError('El contenido del DOCX es demasiado grande')
+        with archivo.open('word/document.xml') as xml:
+            for evento, elemento in iterparse(xml, events=('end',)):
+                if elemento.tag == f'{NS_WORD}t':
+                    acumulado.agregar(elemento.text)
+                elif elemento.tag == f'{NS_WORD}tab':
+                    acumulado.agregar('\t')
+                elif elemento.tag == f'{NS_WORD}p':
+                    acumulado.agregar('\n')
+                    # Los párrafos ya leídos no se necesitan: liberar memoria
+                    elemento.clear()
+                if acumulado.lleno:
+                    break
+    return acumulado.texto()
+
+
+def extraer_xlsx(ruta):
+    if load_workbook is None:
+        raise ExtractorNoDisponible('openpyxl no está instalado')
+    acumulado = _Acumulador()
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        for hoja in libro.worksheets:
+            acumulado.agregar(f'{hoja.title}\n')
+            for fila in hoja.iter_rows(values_only=True):
+                celdas = [str(valor) for valor in fila if valor is not None]
+                if celdas:
+                    acumulado.agregar(' '.join(celdas) + '\n')
+                if acumulado.lleno:
+                    break
+    finally:
+        libro.close()
+    return acumulado.texto()
+
+
+EXTRACTORES = {
+    '.pdf': extraer_pdf,
+    '.docx': extraer_docx,
+    '.xlsx': extraer_xlsx,
+}
+
+
+def extensiones_sin_extractor():
+    """Extensiones con extractor cuya biblioteca no está instalada."""
+    faltantes = []
+    if PdfReader is None:
+        faltantes.append('.pdf')
+    if load_workbook is None:
+        faltantes.append('.xlsx')
+    return faltantes
+
+
+# =============================================================================
+# PUNTO DE ENTRADA DEL POOL
+# =============================================================================
+
+def extraer_texto(ruta):
+    """
+    Extrae y comprime el texto de un archivo.
+
+    Args:
+        ruta: Ruta del archivo en el disco
+
+    Returns:
+        tuple: (texto comprimido con zlib, cantidad de caracteres)
+
+    Raises:
+        FormatoNoSoportado: Si la extensión no tiene extractor
+        ExtractorNoDisponible: Si falta la biblioteca del extractor
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in EXTRACTORES:
+        raise FormatoNoSoportado(f'Formato {extension or "sin extensión"} no soportado')
+    texto = EXTRACTORES[extension](ruta)
+    # Espacios repetidos y líneas vacías no aportan a la búsqueda
+    texto = re.sub(r'[ \t\r\f\v]+', ' ', texto)
+    texto = re.sub(r'\n\s*\n+', '\n', texto).strip()[:MAX_CARACTERES]
+    return zlib.compress(texto.encode('utf-8'), 6), len(texto)
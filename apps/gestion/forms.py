@@ -1,7 +1,12 @@
 from django import forms
 from .models import Persona, Causa, Audiencia, Documento, CausaPersona, Consentimiento
+from .catalogos import (
+    TribunalChoiceField, MateriaChoiceField, EstadoChoiceField,
+    TipoDocumentoChoiceField, ResponsableChoiceField
+)
 import re
 from django.core.exceptions import ValidationError
+from .validators import limpiar_rut
 
 class PersonaForm(forms.ModelForm):
     class Meta:
@@ -35,6 +40,10 @@ class PersonaForm(forms.ModelForm):
         pattern = r'^\d{1,3}(?:\.\d{3})*-?[0-9kK]$'
         if not re.match(pattern, run):
             raise ValidationError('Formato RUT inválido. Ej: 12.345.678-9')
+        # El mismo RUN escrito con otro formato también es un duplicado
+        duplicado = Persona.objects.filter(run_normalizado=limpiar_rut(run)).exclude(pk=self.instance.pk)
+        if duplicado.exists():
+            raise ValidationError('Ya existe una persona con este RUN.')
         return run
 
     def clean_telefono(self):
@@ -48,6 +57,13 @@ class CausaForm(forms.ModelForm):
     class Meta:
         model = Causa
         fields = ['rit', 'ruc', 'tribunal', 'materia', 'caratula', 'estado', 'responsable', 'descripcion', 'observaciones']
+        # Catálogos validados contra el snapshot en caché
+        field_classes = {
+            'tribunal': TribunalChoiceField,
+            'materia': MateriaChoiceField,
+            'estado': EstadoChoiceField,
+            'responsable': ResponsableChoiceField,
+        }
 
 class AudienciaForm(forms.ModelForm):
     class Meta:
@@ -79,6 +95,9 @@ class DocumentoForm(forms.ModelForm):
             'folio', 'fecha_emision', 'numero_documento', 'emisor',
             'estado', 'es_confidencial'
         ]
+        field_classes = {
+            'tipo': TipoDocumentoChoiceField,
+        }
         widgets = {
             'titulo': forms.TextInput(attrs={'class': 'form-input', 'placeholder': 'Título del documento'}),
             'descripcion': forms.Textarea(attrs={'class': 'form-input', 'rows': 3}),
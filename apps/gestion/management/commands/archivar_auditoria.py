@@ -0,0 +1,118 @@
+import gzip
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from apps.gestion.auditoria import corte_ventana_activa, particion_de
+from apps.gestion.cache_utils import invalidar_cache_auditoria
+from apps.gestion.models import LogAuditoria, LogAuditoriaArchivo
+
+
+CAMPOS = [campo.attname for campo in LogAuditoria._meta.concrete_fields]
+
+
+def archivar_lote(logs, carpeta=None):
+    """
+    Copia un lote a LogAuditoriaArchivo (y opcionalmente a los JSONL del
+    mes) y lo elimina de LogAuditoria. Debe ejecutarse en una transacción.
+
+    Returns:
+        Counter: registros archivados por partición
+    """
+    archivados = []
+    por_particion = {}
+    for log in logs:
+        datos = {campo: getattr(log, campo) for campo in CAMPOS}
+        datos['particion'] = particion_de(log.fecha)
+        archivados.append(LogAuditoriaArchivo(**datos))
+        por_particion.setdefault(datos['particion'], []).append(datos)
+
+    # ignore_conflicts: un lote ya copiado en una ejecución interrumpida
+    LogAuditoriaArchivo.objects.bulk_create(archivados, ignore_conflicts=True)
+
+    if carpeta is not None:
+        # Un miembro gzip por lote: el archivo se sigue leyendo como uno solo
+        for particion, filas in por_particion.items():
+            ruta = carpeta / f'auditoria-{particion}.jsonl.gz'
+            with gzip.open(ruta, 'at', encoding='utf-8') as archivo:
+                for fila in filas:
+                    archivo.write(json.dumps(fila, cls=DjangoJSONEncoder, ensure_ascii=False))
+                    archivo.write('\n')
+
+    LogAuditoria.objects.filter(id__in=[log.id for log in logs]).delete()
+    return Counter({particion: len(filas) for particion, filas in por_particion.items()})
+
+
+class Command(BaseCommand):
+    help = (
+        'Mueve los logs de auditoría anteriores a la ventana activa a '
+        'LogAuditoriaArchivo, por lotes cortos para no bloquear la tabla'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--meses', type=int, default=settings.AUDITORIA_MESES_ACTIVOS,
+            help='Meses activos, incluido el actual (por defecto AUDITORIA_MESES_ACTIVOS)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help='Registros por transacción (por defecto 1000)'
+        )
+        parser.add_argument(
+            '--pausa', type=float, default=0,
+            help='Segundos de espera entre lotes'
+        )
+        parser.add_argument(
+            '--exportar', action='store_true',
+            help='Guarda además cada mes en AUDITORIA_ARCHIVO_DIR como JSONL comprimido'
+        )
+        parser.add_argument(
+            '--simular', action='store_true',
+            help='Solo muestra cuántos registros se archivarían por mes'
+        )
+
+    def handle(self, *args, **options):
+        corte = corte_ventana_activa(max(1, options['meses']))
+        pendientes = LogAuditoria.objects.filter(fecha__lt=corte).order_by('id')
+
+        if options['simular']:
+            fechas = pendientes.values_list('fecha', flat=True).iterator()
+            meses = Counter(particion_de(fecha) for fecha in fechas)
+            for particion in sorted(meses):
+                self.stdout.write(f'  {particion}: {meses[particion]} registros')
+            self.stdout.write(f'\nSe archivarían {sum(meses.values())} registros anteriores a {corte:%d/%m/%Y}')
+            return
+
+        carpeta = None
+        if options['exportar']:
+            carpeta = Path(settings.AUDITORIA_ARCHIVO_DIR)
+            carpeta.mkdir(parents=True, exist_ok=True)
+
+        self.stdout.write(f'Archivando logs anteriores a {corte:%d/%m/%Y}...')
+        inicio = time.perf_counter()
+        total = Counter()
+        tamano = max(1, options['lote'])
+
+        while True:
+            # Cada lote en su propia transacción: los bloqueos duran poco
+            with transaction.atomic():
+                logs = list(pendientes[:tamano])
+                if not logs:
+                    break
+                total += archivar_lote(logs, carpeta)
+            if options['pausa']:
+                time.sleep(options['pausa'])
+
+        if total:
+            invalidar_cache_auditoria()
+        for particion in sorted(total):
+            self.stdout.write(f'  ✓ {particion}: {total[particion]} registros')
+        self.stdout.write(self.style.SUCCESS(
+            f'\nArchivados {sum(total.values())} registros en {time.perf_counter() - inicio:.2f} s'
+        ))
@@ -1,4 +1,12 @@
-from django.core.management.base import BaseCommand
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
 from apps.gestion.cache_utils import (
     get_tribunales_activos,
     get_materias_activas,
@@ -6,29 +14,140 @@ from apps.gestion.cache_utils import (
     get_tipos_documento_activos,
     get_responsables_activos,
 )
+from apps.gestion.estadisticas import (
+    obtener_dashboard,
+    obtener_resumen_reporte,
+    obtener_calendario_mes,
+    rango_mes,
+)
+from apps.gestion.metricas_cache import volcar_metricas
+from apps.gestion.permissions import PERMISOS_POR_ROL, ROLES_ALIAS
+
+
+# =============================================================================
+# CALENTADORES
+# Cada uno retorna una lista de (etiqueta, valor en caché)
+# =============================================================================
+
+def calentar_catalogos():
+    return [
+        ('Tribunales', get_tribunales_activos()),
+        ('Materias', get_materias_activas()),
+        ('Estados', get_estados_activos()),
+        ('Tipos documento', get_tipos_documento_activos()),
+        ('Responsables', get_responsables_activos()),
+    ]
+
+
+def calentar_dashboard_rol(rol):
+    return lambda: [(rol, obtener_dashboard(None, rol=rol))]
+
+
+def calentar_dashboard_estudiantes():
+    roles = ['ESTUDIANTE'] + [
+        antiguo for antiguo, nuevo in ROLES_ALIAS.items() if nuevo == 'ESTUDIANTE'
+    ]
+    estudiantes = User.objects.filter(is_active=True, perfil__rol__in=roles)
+    return [
+        (usuario.username, obtener_dashboard(usuario, rol='ESTUDIANTE'))
+        for usuario in estudiantes
+    ]
+
+
+def calentar_calendario():
+    mes_actual, mes_siguiente = rango_mes(timezone.localdate())
+    return [
+        (mes.strftime('%Y-%m'), obtener_calendario_mes(mes))
+        for mes in (mes_actual, mes_siguiente)
+    ]
+
+
+def calentar_reportes():
+    return [('Sin filtros', obtener_resumen_reporte())]
+
+
+def calentadores():
+    """Calentadores independientes entre sí: (nombre, función)."""
+    lista = [('Catálogos', calentar_catalogos)]
+    lista += [
+        (f'Dashboard {rol}', calentar_dashboard_rol(rol))
+        for rol in PERMISOS_POR_ROL if rol != 'ESTUDIANTE'
+    ]
+    lista += [
+        ('Dashboard ESTUDIANTE', calentar_dashboard_estudiantes),
+        ('Calendario', calentar_calendario),
+        ('Reportes', calentar_reportes),
+    ]
+    return lista
+
+
+def ejecutar(funcion):
+    inicio = time.perf_counter()
+    try:
+        return funcion(), time.perf_counter() - inicio
+    finally:
+        # Cada hilo abre su propia conexión
+        connections.close_all()
+
+
+def tamano(valor):
+    return len(pickle.dumps(valor, pickle.HIGHEST_PROTOCOL))
 
 
 class Command(BaseCommand):
-    help = 'Pre-carga todos los catálogos en caché'
+    help = (
+        'Pre-carga en caché catálogos, dashboards por rol, calendario y '
+        'reportes. Pensado para ejecutarse al desplegar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hilos', type=int, default=4,
+            help='Calentadores que se ejecutan en paralelo (por defecto 4)'
+        )
+        parser.add_argument(
+            '--estricto', action='store_true',
+            help='Termina con error si algún calentador falla'
+        )
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
         self.stdout.write('Calentando caché...')
-        
-        tribunales = get_tribunales_activos()
-        self.stdout.write(f'  ✓ Tribunales: {len(tribunales)}')
-        
-        materias = get_materias_activas()
-        self.stdout.write(f'  ✓ Materias: {len(materias)}')
-        
-        estados = get_estados_activos()
-        self.stdout.write(f'  ✓ Estados: {len(estados)}')
-        
-        tipos = get_tipos_documento_activos()
-        self.stdout.write(f'  ✓ Tipos documento: {len(tipos)}')
-        
-        responsables = get_responsables_activos()
-        self.stdout.write(f'  ✓ Responsables: {len(responsables)}')
-        
-        self.stdout.write(
-            self.style.SUCCESS('\nCaché calentado exitosamente')
-        )
\ No newline at end of file
+        inicio = time.perf_counter()
+        errores = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, options['hilos'])) as pool:
+            futuros = {
+                pool.submit(ejecutar, funcion): nombre
+                for nombre, funcion in calentadores()
+            }
+            for futuro in as_completed(futuros):
+                nombre = futuros[futuro]
+                try:
+                    entradas, duracion = futuro.result()
+                except Exception as e:
+                    # Un calentador fallido no impide el resto del despliegue
+                    errores += 1
+                    self.stderr.write(self.style.ERROR(f'  ✗ {nombre}: {e}'))
+                    continue
+
+                total = sum(tamano(valor) for _, valor in entradas)
+                self.stdout.write(
+                    f'  ✓ {nombre}: {len(entradas)} entradas, '
+                    f'{total / 1024:.1f} KB, {duracion * 1000:.0f} ms'
+                )
+                for etiqueta, valor in entradas:
+                    self.stdout.write(
+                        f'      {etiqueta}: {tamano(valor) / 1024:.1f} KB'
+                    )
+
+        volcar_metricas()
+        duracion = time.perf_counter() - inicio
+        if errores:
+            mensaje = f'\nCaché calentado con {errores} error(es) en {duracion:.2f} s'
+            if options['estricto']:
+                raise CommandError(mensaje.strip())
+            self.stdout.write(self.style.WARNING(mensaje))
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'\nCaché calentado exitosamente en {duracion:.2f} s')
+            )
@@ -0,0 +1,143 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from apps.gestion.cache_utils import (
+    invalidar_cache_causas,
+    invalidar_cache_consentimientos,
+    invalidar_cache_personas,
+)
+from apps.gestion.conteos import ajustar_contador
+from apps.gestion.models import CausaPersona, Consentimiento, ContadorTabla, Persona, TrigramaPersona
+from apps.gestion.signals import registrar_log
+from apps.gestion.validators import limpiar_rut
+
+
+# Se ejecuta antes de la migración 0019 (que falla si hay RUN duplicados):
+# solo se usan las columnas que existen desde antes
+CAMPOS = [
+    campo.attname for campo in Persona._meta.concrete_fields
+    if campo.name not in ('run_normalizado', 'representante_run_normalizado')
+]
+
+
+def buscar_duplicados():
+    """
+    Personas cuyo RUN es el mismo escrito de distinta forma.
+
+    Returns:
+        dict: RUN normalizado -> lista de diccionarios (CAMPOS) ordenada
+        por id; la primera es la que se conserva al unir
+    """
+    grupos = {}
+    for persona in Persona.objects.order_by('id').values(*CAMPOS).iterator(chunk_size=1000):
+        normalizado = limpiar_rut(persona['run'])
+        if normalizado:
+            grupos.setdefault(normalizado, []).append(persona)
+    return {run: personas for run, personas in grupos.items() if len(personas) > 1}
+
+
+def unir_personas(conservada, duplicadas):
+    """
+    Traspasa a `conservada` las causas y consentimientos de `duplicadas` y
+    las elimina, dejando un log ELIMINAR con los datos de cada una. Debe
+    ejecutarse en una transacción.
+
+    Args:
+        conservada: id de la persona que queda
+        duplicadas: Diccionarios (CAMPOS) de las personas a eliminar
+    """
+    ids = [persona['id'] for persona in duplicadas]
+
+    # La misma participación en una causa no puede repetirse
+    existentes = set(
+        CausaPersona.objects.filter(persona_id=conservada).values_list('causa_id', 'rol_en_causa')
+    )
+    repetidas = []
+    for relacion in CausaPersona.objects.filter(persona_id__in=ids).order_by('id'):
+        clave = (relacion.causa_id, relacion.rol_en_causa)
+        if clave in existentes:
+            repetidas.append(relacion.pk)
+        else:
+            existentes.add(clave)
+    CausaPersona.objects.filter(pk__in=repetidas).delete()
+    CausaPersona.objects.filter(persona_id__in=ids).update(persona_id=conservada)
+    Consentimiento.objects.filter(persona_id__in=ids).update(persona_id=conservada)
+
+    for persona in duplicadas:
+        registrar_log(
+            accion='ELIMINAR',
+            modelo='PERSONA',
+            objeto_id=persona['id'],
+            objeto_repr=f"{persona['nombres']} {persona['apellidos']} ({persona['run']})"[:200],
+            datos_anteriores=json.loads(json.dumps(persona, cls=DjangoJSONEncoder)),
+            descripcion=f"Persona duplicada unida a la persona {conservada} (RUN {persona['run']})"
+        )
+
+    # Tablas de migraciones posteriores a 0019, si ya existen
+    tablas = set(connection.introspection.table_names())
+    if TrigramaPersona._meta.db_table in tablas:
+        TrigramaPersona.objects.filter(persona_id__in=ids).delete()
+    if ContadorTabla._meta.db_table in tablas:
+        ajustar_contador(Persona, -len(ids))
+
+    # Sin relaciones pendientes: DELETE directo, sin cargar las instancias
+    # (con el ORM se leerían columnas que aún no existen)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {connection.ops.quote_name(Persona._meta.db_table)} '
+            f'WHERE id IN ({", ".join(["%s"] * len(ids))})',
+            ids
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        'Lista las personas con el mismo RUN escrito de distinta forma '
+        '(12.345.678-9 y 12345678-9) y, con --unir, las une en la más antigua'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--unir', action='store_true',
+            help='Traspasa causas y consentimientos a la persona más antigua y elimina las demás'
+        )
+
+    def handle(self, *args, **options):
+        grupos = buscar_duplicados()
+        if not grupos:
+            self.stdout.write(self.style.SUCCESS('No hay personas con RUN duplicado'))
+            return
+
+        for personas in grupos.values():
+            conservada, *duplicadas = personas
+            self.stdout.write(
+                f"RUN {conservada['run']}: persona {conservada['id']} "
+                f"({conservada['nombres']} {conservada['apellidos']})"
+            )
+            for persona in duplicadas:
+                self.stdout.write(
+                    f"  duplicada: persona {persona['id']} "
+                    f"({persona['nombres']} {persona['apellidos']}, RUN {persona['run']})"
+                )
+
+        duplicadas = sum(len(personas) - 1 for personas in grupos.values())
+        if not options['unir']:
+            self.stdout.write(self.style.WARNING(
+                f'\n{duplicadas} personas duplicadas en {len(grupos)} RUN. '
+                'Revisar y ejecutar con --unir para unirlas en la más antigua.'
+            ))
+            return
+
+        with transaction.atomic():
+            for personas in grupos.values():
+                unir_personas(personas[0]['id'], personas[1:])
+            invalidar_cache_personas()
+            invalidar_cache_causas()
+            invalidar_cache_consentimientos()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{duplicadas} personas duplicadas unidas en {len(grupos)} RUN'
+        ))
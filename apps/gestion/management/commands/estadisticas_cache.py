@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+from apps.gestion.metricas_cache import obtener_metricas
+
+
+class Command(BaseCommand):
+    help = 'Muestra aciertos, fallos, tiempo de llenado y tamaño del caché por namespace'
+
+    def handle(self, *args, **kwargs):
+        metricas, procesos = obtener_metricas()
+
+        if not metricas:
+            self.stdout.write(self.style.WARNING(
+                'Sin métricas registradas. Los procesos las vuelcan cada '
+                f'{settings.CACHE_METRICAS_INTERVALO} s.'
+            ))
+            return
+
+        self.stdout.write(f'Métricas de caché ({procesos} proceso(s))\n')
+        self.stdout.write(
+            f'{"Namespace":<16}{"L1":>9}{"L2":>9}{"Obsol.":>9}{"Fallos":>9}'
+            f'{"Aciertos":>10}{"Rellenos":>10}{"ms/rell.":>10}{"Último":>10}{"Máximo":>10}'
+        )
+        for namespace in sorted(metricas):
+            m = metricas[namespace]
+            lecturas = m['aciertos_l1'] + m['aciertos_l2'] + m['obsoletos'] + m['fallos']
+            aciertos = m['aciertos_l1'] + m['aciertos_l2'] + m['obsoletos']
+            tasa = f'{aciertos / lecturas * 100:.1f}%' if lecturas else '-'
+            relleno = (
+                f'{m["tiempo_relleno"] / m["rellenos"] * 1000:.1f}'
+                if m['rellenos'] else '-'
+            )
+            self.stdout.write(
+                f'{namespace:<16}{m["aciertos_l1"]:>9}{m["aciertos_l2"]:>9}'
+                f'{m["obsoletos"]:>9}{m["fallos"]:>9}{tasa:>10}{m["rellenos"]:>10}'
+                f'{relleno:>10}{_kb(m["bytes"]):>10}{_kb(m["bytes_max"]):>10}'
+            )
+
+        # Ocupación de cada backend, para ajustar MAX_ENTRIES
+        for alias, configuracion in settings.CACHES.items():
+            max_entradas = configuracion.get('OPTIONS', {}).get('MAX_ENTRIES')
+            listar = getattr(caches[alias], '_list_cache_files', None)
+            if listar is not None:
+                self.stdout.write(
+                    f'\nEntradas en caché {alias}: {len(listar())} de '
+                    f'{max_entradas or "-"} (MAX_ENTRIES)'
+                )
+
+
+def _kb(tamano):
+    return f'{tamano / 1024:.1f}KB' if tamano else '-'
@@ -0,0 +1,93 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.gestion import extraccion
+from apps.gestion.extractores import extensiones_sin_extractor, extraer_texto
+
+
+class Command(BaseCommand):
+    help = (
+        'Procesa la cola de extracción de texto de documentos: extrae el '
+        'texto de los archivos en un pool de procesos y lo agrega al índice '
+        'de búsqueda'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--procesos', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+            help='Procesos de extracción en paralelo (por defecto, núcleos - 1)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=20,
+            help='Documentos reservados de la cola por vuelta (por defecto 20)'
+        )
+        parser.add_argument(
+            '--continuo', action='store_true',
+            help='No terminar al vaciar la cola: esperar nuevos documentos'
+        )
+        parser.add_argument(
+            '--espera', type=float, default=10,
+            help='Segundos entre revisiones de la cola vacía con --continuo (por defecto 10)'
+        )
+
+    def handle(self, *args, **options):
+        procesos = max(1, options['procesos'])
+        lote = max(1, options['lote'])
+        inicio = time.perf_counter()
+        resultados = Counter()
+
+        reencolados = extraccion.reencolar_sin_extractor()
+        if reencolados:
+            self.stdout.write(f'{reencolados} documentos sin extractor vuelven a la cola')
+
+        # Los procesos hijos no deben heredar la conexión abierta a la base de datos
+        connections.close_all()
+
+        self.stdout.write(f'Extrayendo textos con {procesos} procesos...')
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            while True:
+                reservados = extraccion.reservar(lote)
+                if not reservados:
+                    if not options['continuo']:
+                        break
+                    time.sleep(options['espera'])
+                    continue
+
+                futuros = {}
+                for documento_id, ruta in reservados:
+                    if not ruta or not os.path.exists(ruta):
+                        estado = extraccion.guardar_error(
+                            documento_id, FileNotFoundError('El archivo no existe en el almacenamiento')
+                        )
+                        resultados[estado] += 1
+                        continue
+                    futuros[pool.submit(extraer_texto, ruta)] = documento_id
+
+                for futuro in as_completed(futuros):
+                    documento_id = futuros[futuro]
+                    try:
+                        texto, caracteres = futuro.result()
+                    except Exception as error:
+                        estado = extraccion.guardar_error(documento_id, error)
+                        if estado == 'ERROR':
+                            self.stderr.write(f'  ✗ Documento {documento_id}: {error}')
+                        resultados[estado] += 1
+                    else:
+                        extraccion.guardar_texto(documento_id, texto, caracteres)
+                        resultados['COMPLETADO'] += 1
+
+        for estado, total in sorted(resultados.items()):
+            self.stdout.write(f'  ✓ {estado}: {total} documentos')
+        if resultados['SIN_EXTRACTOR']:
+            self.stdout.write(self.style.WARNING(
+                f'\nFaltan bibliotecas para {", ".join(extensiones_sin_extractor())}: '
+                'instalar requirements.txt y volver a ejecutar'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'\nCola procesada en {time.perf_counter() - inicio:.2f} s'
+        ))
@@ -1,12 +1,13 @@
 from django.core.management.base import BaseCommand
-from django.core.cache import cache
+from django.core.cache import caches
 
 
 class Command(BaseCommand):
     help = 'Limpia todo el caché del sistema'
 
     def handle(self, *args, **kwargs):
-        cache.clear()
+        for cache in caches.all():
+            cache.clear()
         self.stdout.write(
             self.style.SUCCESS('Caché limpiado exitosamente')
         )
\ No newline at end of file
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from apps.gestion.conteos import recalcular_contadores
+
+
+class Command(BaseCommand):
+    help = (
+        'Cuenta de nuevo las filas de las tablas con listado (ContadorTabla). '
+        'Corrige la desviación tras escrituras hechas fuera del ORM.'
+    )
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write('Recalculando contadores de filas...')
+
+        totales = recalcular_contadores()
+        for tabla, filas in totales.items():
+            self.stdout.write(f'  ✓ {tabla}: {filas} filas')
+
+        self.stdout.write(self.style.SUCCESS('\nContadores recalculados'))
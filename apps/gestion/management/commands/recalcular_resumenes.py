@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from apps.gestion.resumenes import recalcular_resumenes
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye desde cero la tabla de resumen de causas (CausaResumen)'
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write('Recalculando resúmenes de causas...')
+        
+        combinaciones = recalcular_resumenes()
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'\nResúmenes recalculados: {combinaciones} combinaciones')
+        )
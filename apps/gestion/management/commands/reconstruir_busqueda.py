@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.gestion.busqueda import fts_disponible, reconstruir_indice
+from apps.gestion.extraccion import textos_indexables
+from apps.gestion.models import Causa, Documento, Persona
+from apps.gestion.similitud import reconstruir_trigramas
+
+
+class Command(BaseCommand):
+    help = (
+        'Regenera desde cero el índice de texto completo (FTS5) y los '
+        'trigramas de nombres de personas'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help='Objetos leídos por consulta (por defecto 1000)'
+        )
+
+    def handle(self, *args, **options):
+        lote = max(1, options['lote'])
+        inicio = time.perf_counter()
+        totales = {}
+
+        if fts_disponible():
+            self.stdout.write('Reconstruyendo índice de búsqueda...')
+            # En una transacción: las búsquedas ven el índice anterior hasta el final
+            with transaction.atomic():
+                totales = reconstruir_indice(
+                    {'causa': Causa, 'persona': Persona, 'documento': Documento},
+                    lote=lote,
+                    textos=textos_indexables,
+                )
+        else:
+            self.stdout.write(self.style.WARNING(
+                'La base de datos no es SQLite: la búsqueda de texto usa icontains (sin FTS5)'
+            ))
+
+        self.stdout.write('Reconstruyendo trigramas de personas...')
+        with transaction.atomic():
+            totales['trigramas'] = reconstruir_trigramas(Persona, lote=lote)
+
+        for tipo, total in totales.items():
+            self.stdout.write(f'  ✓ {tipo}: {total} objetos')
+        self.stdout.write(self.style.SUCCESS(
+            f'\nÍndices reconstruidos en {time.perf_counter() - inicio:.2f} s'
+        ))
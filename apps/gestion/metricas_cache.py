@@ -0,0 +1,191 @@
+"""
+Métricas de uso del caché
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+Cuenta aciertos, fallos, tiempo de llenado y tamaño de las entradas por
+namespace. Los contadores se acumulan en memoria del proceso y cada
+CACHE_METRICAS_INTERVALO segundos se vuelcan al caché compartido, cada
+proceso en su propia clave (así no se pisan entre workers). El comando
+`estadisticas_cache` suma todos los procesos.
+
+Las claves de los procesos se listan en un conjunto en caché. Solo un
+proceso a la vez lo reescribe y, al hacerlo, descarta las claves que ya
+vencieron (procesos que dejaron de volcar hace más de METRICAS_RETENCION).
+
+El tamaño serializado de una entrada se mide en el primer llenado de cada
+namespace y luego uno de cada CACHE_METRICAS_MUESTREO: serializar cada
+valor solo para medirlo duplicaría el costo de llenar el caché.
+"""
+
+import os
+import pickle
+import socket
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+# Alias del caché de consultas (ver CACHES en settings): perder las
+# métricas al desalojar no afecta a las generaciones ni a los bloqueos
+CACHE_METRICAS = 'consultas'
+CACHE_KEY_PROCESOS = 'metricas_cache:procesos'
+CACHE_KEY_PROCESO = 'metricas_cache:proceso:{proceso}'
+CACHE_KEY_PROCESOS_BLOQUEO = 'metricas_cache:procesos:bloqueo'
+
+# Tiempo que se conservan las métricas de un proceso que dejó de volcar
+METRICAS_RETENCION = 7 * 86400
+# Tiempo máximo que un proceso retiene el bloqueo del conjunto de procesos
+PROCESOS_BLOQUEO_TIMEOUT = 10
+
+CONTADORES = (
+    'aciertos_l1', 'aciertos_l2', 'obsoletos', 'fallos',
+    'rellenos', 'tiempo_relleno',
+)
+
+_bloqueo = threading.Lock()
+# namespace -> contadores acumulados desde que arrancó el proceso
+_metricas = {}
+_proximo_volcado = 0.0
+# Identificador del proceso en las claves de métricas y pid con que se
+# calculó. Se obtiene en el primer uso y no al importar: con
+# `gunicorn --preload` los workers se bifurcan del maestro, que ya importó
+# el módulo, y compartirían la misma clave.
+_proceso = None
+_pid = None
+
+
+def _nuevas_metricas():
+    metricas = dict.fromkeys(CONTADORES, 0)
+    metricas.update(bytes=0, bytes_max=0)
+    return metricas
+
+
+def _metricas_namespace(namespace):
+    # Llamar con _bloqueo tomado
+    global _proceso, _pid, _proximo_volcado
+    pid = os.getpid()
+    if pid != _pid:
+        _pid = pid
+        _proceso = f'{socket.gethostname()}:{pid}:{int(time.time())}'
+        # Lo acumulado antes de bifurcarse es del proceso padre
+        _metricas.clear()
+        _proximo_volcado = 0.0
+    metricas = _metricas.get(namespace)
+    if metricas is None:
+        metricas = _metricas[namespace] = _nuevas_metricas()
+    return metricas
+
+
+def _registrar(namespace, **valores):
+    with _bloqueo:
+        metricas = _metricas_namespace(namespace)
+        for campo, valor in valores.items():
+            metricas[campo] += valor
+    _volcar_si_corresponde()
+
+
+def registrar_acierto(namespace, nivel='l2'):
+    """Registra una lectura servida desde el L1 del proceso o el caché compartido."""
+    _registrar(namespace, **{f'aciertos_{nivel}': 1})
+
+
+def registrar_obsoleto(namespace):
+    """Registra una lectura que recibió un valor vencido (otro lo recalcula)."""
+    _registrar(namespace, obsoletos=1)
+
+
+def registrar_fallo(namespace):
+    """Registra una lectura sin valor en caché."""
+    _registrar(namespace, fallos=1)
+
+
+def registrar_relleno(namespace, segundos, valor):
+    """Registra el cálculo de una entrada: duración y (muestreado) tamaño serializado."""
+    with _bloqueo:
+        metricas = _metricas_namespace(namespace)
+        medir = metricas['rellenos'] % settings.CACHE_METRICAS_MUESTREO == 0
+        metricas['rellenos'] += 1
+        metricas['tiempo_relleno'] += segundos
+
+    if medir:
+        tamano = len(pickle.dumps(valor, pickle.HIGHEST_PROTOCOL))
+        with _bloqueo:
+            metricas['bytes'] = tamano
+            metricas['bytes_max'] = max(metricas['bytes_max'], tamano)
+    _volcar_si_corresponde()
+
+
+def _volcar_si_corresponde():
+    global _proximo_volcado
+    ahora = time.monotonic()
+    if ahora < _proximo_volcado:
+        return
+    _proximo_volcado = ahora + settings.CACHE_METRICAS_INTERVALO
+    volcar_metricas()
+
+
+def volcar_metricas():
+    """Escribe en el caché compartido los contadores de este proceso."""
+    with _bloqueo:
+        if _pid != os.getpid():
+            # Nada registrado aún en este proceso (lo que hay es del padre)
+            return
+        copia = {ns: dict(metricas) for ns, metricas in _metricas.items()}
+        proceso = _proceso
+    if not copia:
+        return
+
+    cache = caches[CACHE_METRICAS]
+    clave = CACHE_KEY_PROCESO.format(proceso=proceso)
+    cache.set(clave, {'actualizado': time.time(), 'metricas': copia}, METRICAS_RETENCION)
+
+    if clave not in (cache.get(CACHE_KEY_PROCESOS) or set()):
+        _registrar_proceso(cache, clave)
+
+
+def _registrar_proceso(cache, clave):
+    # Lectura-modificación-escritura del conjunto bajo bloqueo: sin él, dos
+    # procesos que se registran a la vez se pisan. Si otro lo tiene, este
+    # proceso se registra en el próximo volcado. `cache.add` no es atómico
+    # en el backend de archivos: se relee para confirmar el token propio.
+    token = uuid.uuid4().hex
+    if not (
+        cache.add(CACHE_KEY_PROCESOS_BLOQUEO, token, PROCESOS_BLOQUEO_TIMEOUT)
+        and cache.get(CACHE_KEY_PROCESOS_BLOQUEO) == token
+    ):
+        return
+    try:
+        procesos = cache.get(CACHE_KEY_PROCESOS) or set()
+        # Solo quedan los procesos cuyas métricas no han vencido
+        vigentes = set(cache.get_many(list(procesos)))
+        vigentes.add(clave)
+        cache.set(CACHE_KEY_PROCESOS, vigentes, METRICAS_RETENCION)
+    finally:
+        if cache.get(CACHE_KEY_PROCESOS_BLOQUEO) == token:
+            cache.delete(CACHE_KEY_PROCESOS_BLOQUEO)
+
+
+def obtener_metricas():
+    """
+    Suma las métricas volcadas por todos los procesos.
+
+    Returns:
+        tuple: (dict namespace -> contadores, número de procesos)
+    """
+    cache = caches[CACHE_METRICAS]
+    procesos = cache.get(CACHE_KEY_PROCESOS) or set()
+    entradas = cache.get_many(list(procesos))
+
+    total = {}
+    for entrada in entradas.values():
+        for namespace, metricas in entrada['metricas'].items():
+            acumulado = total.setdefault(namespace, _nuevas_metricas())
+            for campo in CONTADORES:
+                acumulado[campo] += metricas[campo]
+            acumulado['bytes'] = max(acumulado['bytes'], metricas['bytes'])
+            acumulado['bytes_max'] = max(acumulado['bytes_max'], metricas['bytes_max'])
+    return total, len(entradas)
+
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def poblar_resumenes(apps, schema_editor):
+    Causa = apps.get_model('gestion', 'Causa')
+    CausaResumen = apps.get_model('gestion', 'CausaResumen')
+    filas = Causa.objects.order_by().values(
+        'estado_id', 'materia_id', 'tribunal_id', 'responsable_id'
+    ).annotate(total=models.Count('id'))
+    CausaResumen.objects.bulk_create([CausaResumen(**fila) for fila in filas])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('gestion', '0015_alter_consentimiento_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CausaResumen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.IntegerField(default=0, verbose_name='Total de causas')),
+                ('estado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gestion.estadocausa', verbose_name='Estado')),
+                ('materia', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gestion.materia', verbose_name='Materia')),
+                ('responsable', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Responsable')),
+                ('tribunal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gestion.tribunal', verbose_name='Tribunal')),
+            ],
+            options={
+                'verbose_name': 'Resumen de causas',
+                'verbose_name_plural': 'Resúmenes de causas',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='causaresumen',
+            constraint=models.UniqueConstraint(fields=('estado', 'materia', 'tribunal', 'responsable'), name='causa_resumen_unico'),
+        ),
+        migrations.RunPython(poblar_resumenes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('gestion', '0016_causaresumen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogAuditoriaArchivo',
+            fields=[
+                ('accion', models.CharField(choices=[('CREAR', 'Crear'), ('EDITAR', 'Editar'), ('ELIMINAR', 'Eliminar'), ('VER', 'Ver'), ('LOGIN', 'Inicio de sesión'), ('LOGOUT', 'Cierre de sesión'), ('SUBIR_DOC', 'Subir documento'), ('DESCARGAR_DOC', 'Descargar documento'), ('CAMBIO_ESTADO', 'Cambio de estado'), ('ASIGNAR', 'Asignar responsable'), ('OTRO', 'Otro')], max_length=20, verbose_name='Acción')),
+                ('modelo', models.CharField(choices=[('CAUSA', 'Causa'), ('PERSONA', 'Persona'), ('DOCUMENTO', 'Documento'), ('AUDIENCIA', 'Audiencia'), ('CONSENTIMIENTO', 'Consentimiento'), ('USUARIO', 'Usuario'), ('OTRO', 'Otro')], max_length=20, verbose_name='Modelo afectado')),
+                ('objeto_id', models.PositiveIntegerField(blank=True, null=True, verbose_name='ID del objeto')),
+                ('objeto_repr', models.CharField(blank=True, max_length=200, null=True, verbose_name='Representación del objeto')),
+                ('datos_anteriores', models.JSONField(blank=True, help_text='Estado del objeto antes del cambio', null=True, verbose_name='Datos anteriores')),
+                ('datos_nuevos', models.JSONField(blank=True, help_text='Estado del objeto después del cambio', null=True, verbose_name='Datos nuevos')),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True, verbose_name='Dirección IP')),
+                ('user_agent', models.CharField(blank=True, max_length=500, null=True, verbose_name='User Agent')),
+                ('descripcion', models.TextField(blank=True, null=True, verbose_name='Descripción')),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID original')),
+                ('fecha', models.DateTimeField(verbose_name='Fecha y hora')),
+                ('particion', models.CharField(max_length=7, verbose_name='Mes')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Log de Auditoría archivado',
+                'verbose_name_plural': 'Logs de Auditoría archivados',
+                'ordering': ['-fecha'],
+                'indexes': [models.Index(fields=['particion'], name='log_arch_particion_idx'), models.Index(fields=['-fecha', '-id'], name='log_arch_fecha_desc_idx'), models.Index(fields=['usuario'], name='log_arch_usuario_idx'), models.Index(fields=['modelo', 'objeto_id'], name='log_arch_modelo_objeto_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def crear_indice(apps, schema_editor):
+    # FTS5 solo existe en SQLite; con otra base de datos la búsqueda usa icontains
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from apps.gestion.busqueda import reconstruir_indice
+    reconstruir_indice({
+        'causa': apps.get_model('gestion', 'Causa'),
+        'persona': apps.get_model('gestion', 'Persona'),
+        'documento': apps.get_model('gestion', 'Documento'),
+    })
+
+
+def eliminar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from apps.gestion.busqueda import TABLA
+    schema_editor.execute(f'DROP TABLE IF EXISTS {TABLA}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion', '0017_logauditoriaarchivo'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+# Duplicados que se detallan en el error de la migración
+MAX_DUPLICADOS_DETALLE = 50
+
+
+def normalizar_runs(apps, schema_editor):
+    from apps.gestion.validators import limpiar_rut
+
+    Persona = apps.get_model('gestion', 'Persona')
+    usados = {}
+    duplicados = []
+    personas = []
+    for persona in Persona.objects.order_by('id').only('id', 'run', 'representante_run').iterator(chunk_size=1000):
+        normalizado = limpiar_rut(persona.run) or None
+        if normalizado in usados:
+            duplicados.append((persona.pk, persona.run, usados[normalizado]))
+        elif normalizado:
+            usados[normalizado] = persona.pk
+        persona.run_normalizado = normalizado
+        persona.representante_run_normalizado = limpiar_rut(persona.representante_run) or None
+        personas.append(persona)
+
+    if duplicados:
+        # Un mismo RUN escrito de dos formas (12.345.678-9 y 12345678-9): no
+        # se puede elegir en silencio cuál queda fuera del índice único
+        detalle = '\n'.join(
+            f'  Persona {pk} (RUN {run}) repite el RUN de la persona {original}'
+            for pk, run, original in duplicados[:MAX_DUPLICADOS_DETALLE]
+        )
+        if len(duplicados) > MAX_DUPLICADOS_DETALLE:
+            detalle += f'\n  ... y {len(duplicados) - MAX_DUPLICADOS_DETALLE} más'
+        raise RuntimeError(
+            f'{len(duplicados)} personas tienen un RUN ya registrado con otro formato:\n'
+            f'{detalle}\n'
+            'Revisarlas con `python manage.py deduplicar_personas` y unirlas con '
+            '`python manage.py deduplicar_personas --unir` antes de migrar.'
+        )
+
+    Persona.objects.bulk_update(
+        personas, ['run_normalizado', 'representante_run_normalizado'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion', '0018_indice_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='persona',
+            name='run_normalizado',
+            field=models.CharField(editable=False, max_length=12, null=True, verbose_name='RUN normalizado'),
+        ),
+        migrations.AddField(
+            model_name='persona',
+            name='representante_run_normalizado',
+            field=models.CharField(db_index=True, editable=False, max_length=12, null=True, verbose_name='RUN del representante normalizado'),
+        ),
+        migrations.RunPython(normalizar_runs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='persona',
+            name='run_normalizado',
+            field=models.CharField(editable=False, max_length=12, null=True, unique=True, verbose_name='RUN normalizado'),
+        ),
+    ]
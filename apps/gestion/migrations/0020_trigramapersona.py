@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def indexar_personas(apps, schema_editor):
+    from apps.gestion.similitud import reconstruir_trigramas
+    reconstruir_trigramas(
+        apps.get_model('gestion', 'Persona'),
+        apps.get_model('gestion', 'TrigramaPersona'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion', '0019_persona_run_normalizado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrigramaPersona',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigrama', models.CharField(max_length=3, verbose_name='Trigrama')),
+                ('persona', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gestion.persona', verbose_name='Persona')),
+            ],
+            options={
+                'verbose_name': 'Trigrama de persona',
+                'verbose_name_plural': 'Trigramas de personas',
+                'indexes': [models.Index(fields=['trigrama', 'persona'], name='trigrama_persona_idx')],
+            },
+        ),
+        migrations.RunPython(indexar_personas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def encolar_documentos(apps, schema_editor):
+    Documento = apps.get_model('gestion', 'Documento')
+    TextoDocumento = apps.get_model('gestion', 'TextoDocumento')
+    ahora = timezone.now()
+    TextoDocumento.objects.bulk_create(
+        [
+            TextoDocumento(documento_id=pk, fecha_solicitud=ahora)
+            for pk in Documento.objects.exclude(archivo='').values_list('pk', flat=True).iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion', '0020_trigramapersona'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextoDocumento',
+            fields=[
+                ('documento', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='texto_extraido', serialize=False, to='gestion.documento', verbose_name='Documento')),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('PROCESANDO', 'Procesando'), ('COMPLETADO', 'Completado'), ('ERROR', 'Error'), ('NO_SOPORTADO', 'Formato no soportado')], default='PENDIENTE', max_length=20, verbose_name='Estado')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('texto', models.BinaryField(blank=True, null=True, verbose_name='Texto (zlib)')),
+                ('caracteres', models.PositiveIntegerField(default=0, verbose_name='Caracteres')),
+                ('error', models.CharField(blank=True, default='', max_length=500, verbose_name='Error')),
+                ('fecha_solicitud', models.DateTimeField(verbose_name='Fecha de solicitud')),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True, verbose_name='Inicio del proceso')),
+                ('fecha_proceso', models.DateTimeField(blank=True, null=True, verbose_name='Fin del proceso')),
+            ],
+            options={
+                'verbose_name': 'Texto de documento',
+                'verbose_name_plural': 'Textos de documentos',
+                'indexes': [models.Index(fields=['estado', 'fecha_solicitud'], name='texto_doc_cola_idx')],
+            },
+        ),
+        migrations.RunPython(encolar_documentos, migrations.RunPython.noop),
+    ]
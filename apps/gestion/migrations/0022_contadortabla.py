@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:49
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+TABLAS_CONTADAS = [
+    ('gestion', 'Persona'),
+    ('gestion', 'Causa'),
+    ('gestion', 'Audiencia'),
+    ('gestion', 'Documento'),
+    ('gestion', 'Consentimiento'),
+    ('auth', 'User'),
+]
+
+
+def contar_filas(apps, schema_editor):
+    ContadorTabla = apps.get_model('gestion', 'ContadorTabla')
+    ahora = timezone.now()
+    for app_label, nombre in TABLAS_CONTADAS:
+        modelo = apps.get_model(app_label, nombre)
+        ContadorTabla.objects.create(
+            tabla=modelo._meta.db_table,
+            filas=modelo._base_manager.count(),
+            fecha_recalculo=ahora,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion', '0021_textodocumento'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorTabla',
+            fields=[
+                ('tabla', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Tabla')),
+                ('filas', models.BigIntegerField(default=0, verbose_name='Filas')),
+                ('fecha_recalculo', models.DateTimeField(blank=True, null=True, verbose_name='Último recálculo')),
+            ],
+            options={
+                'verbose_name': 'Contador de tabla',
+                'verbose_name_plural': 'Contadores de tablas',
+            },
+        ),
+        migrations.RunPython(contar_filas, migrations.RunPython.noop),
+    ]
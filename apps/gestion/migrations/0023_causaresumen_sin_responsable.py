@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+def unir_duplicados(apps, schema_editor):
+    """Suma en una sola fila las combinaciones sin responsable repetidas."""
+    CausaResumen = apps.get_model('gestion', 'CausaResumen')
+    repetidas = (
+        CausaResumen.objects.filter(responsable__isnull=True)
+        .values('estado_id', 'materia_id', 'tribunal_id')
+        .annotate(filas=models.Count('id'), suma=models.Sum('total'))
+        .filter(filas__gt=1)
+    )
+    for combinacion in repetidas:
+        filas = CausaResumen.objects.filter(
+            responsable__isnull=True,
+            estado_id=combinacion['estado_id'],
+            materia_id=combinacion['materia_id'],
+            tribunal_id=combinacion['tribunal_id'],
+        ).order_by('id')
+        primera = filas.first()
+        filas.exclude(pk=primera.pk).delete()
+        CausaResumen.objects.filter(pk=primera.pk).update(total=combinacion['suma'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion', '0022_contadortabla'),
+    ]
+
+    operations = [
+        migrations.RunPython(unir_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='causaresumen',
+            constraint=models.UniqueConstraint(condition=models.Q(('responsable__isnull', True)), fields=('estado', 'materia', 'tribunal'), name='causa_resumen_unico_sin_responsable'),
+        ),
+    ]
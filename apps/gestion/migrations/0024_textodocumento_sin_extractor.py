@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:25
+
+from django.db import migrations, models
+
+
+def marcar_sin_extractor(apps, schema_editor):
+    # Los PDF y XLSX en NO_SOPORTADO quedaron así por faltar pypdf u
+    # openpyxl: pasan a SIN_EXTRACTOR para reencolarlos al instalarlos
+    TextoDocumento = apps.get_model('gestion', 'TextoDocumento')
+    for extension in ('.pdf', '.xlsx'):
+        TextoDocumento.objects.filter(
+            estado='NO_SOPORTADO', documento__archivo__iendswith=extension
+        ).update(estado='SIN_EXTRACTOR')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestion', '0023_causaresumen_sin_responsable'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='textodocumento',
+            name='estado',
+            field=models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('PROCESANDO', 'Procesando'), ('COMPLETADO', 'Completado'), ('ERROR', 'Error'), ('NO_SOPORTADO', 'Formato no soportado'), ('SIN_EXTRACTOR', 'Extractor no instalado')], default='PENDIENTE', max_length=20, verbose_name='Estado'),
+        ),
+        migrations.RunPython(marcar_sin_extractor, migrations.RunPython.noop),
+    ]
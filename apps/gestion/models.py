@@ -1,4 +1,12 @@
-from django.db import models
+import datetime
+import decimal
+import uuid
+import zlib
+
+from django.db import models, transaction
+from django.db.models.fields.files import FieldFile
+from django.dispatch import Signal
+from django.utils import timezone
 from django.contrib.auth.models import User
 from .validators import (
     validar_rut_chileno,
@@ -6,6 +14,7 @@ from .validators import (
     validar_rit,
     validar_ruc,
     validar_fecha_nacimiento,
+    limpiar_rut,
 )
 
 # CATÁLOGOS 
@@ -192,8 +201,168 @@ class EstadoCausa(models.Model):
     def __str__(self):
         return self.nombre
     
+# SNAPSHOT DE CAMPOS CARGADOS
+def valor_campo(instancia, campo):
+    """
+    Valor de un campo en forma serializable a JSON.
+    Las FK se representan por su id y los archivos por su nombre.
+    """
+    valor = campo.value_from_object(instancia)
+    if isinstance(valor, FieldFile):
+        return valor.name or None
+    if isinstance(valor, (datetime.date, datetime.time)):
+        return valor.isoformat()
+    if isinstance(valor, (decimal.Decimal, uuid.UUID)):
+        return str(valor)
+    return valor
+
+
+class CambiosMixin:
+    """
+    Recuerda los valores con que la instancia se cargó de la BD (from_db)
+    para saber qué campos cambiaron sin volver a consultarla al guardar.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia.capturar_valores()
+        return instancia
+
+    def capturar_valores(self, campos=None):
+        """
+        Toma como referencia los valores actuales de los campos cargados.
+
+        Args:
+            campos: attnames a capturar; por defecto todos los cargados
+        """
+        diferidos = self.get_deferred_fields()
+        valores = {
+            campo.name: valor_campo(self, campo)
+            for campo in self._meta.concrete_fields
+            if campo.attname not in diferidos
+            and (campos is None or campo.attname in campos)
+        }
+        if campos is None or self.valores_cargados is None:
+            self._valores_cargados = valores
+        else:
+            self._valores_cargados.update(valores)
+
+    @property
+    def valores_cargados(self):
+        """Valores al cargar (o al último guardado); None si no vino de la BD."""
+        return getattr(self, '_valores_cargados', None)
+
+    def obtener_cambios(self):
+        """
+        Campos modificados desde la carga. Ignora los campos auto_now,
+        que cambian en cada guardado.
+
+        Returns:
+            tuple | None: (anteriores, nuevos), dos dicts solo con los campos
+                          que cambiaron; None si la instancia no vino de la BD.
+        """
+        cargados = self.valores_cargados
+        if cargados is None:
+            return None
+
+        anteriores, nuevos = {}, {}
+        diferidos = self.get_deferred_fields()
+        for campo in self._meta.concrete_fields:
+            if campo.name not in cargados or campo.attname in diferidos:
+                continue
+            if getattr(campo, 'auto_now', False):
+                continue
+            actual = valor_campo(self, campo)
+            if actual != cargados[campo.name]:
+                anteriores[campo.name] = cargados[campo.name]
+                nuevos[campo.name] = actual
+        return anteriores, nuevos
+
+    def save(self, *args, **kwargs):
+        # Los signals post_save aún ven los valores anteriores
+        super().save(*args, **kwargs)
+        self.capturar_valores()
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        # Al cargar un campo diferido solo se toma ese campo: el resto
+        # conserva su valor de referencia
+        if fields is None:
+            self.capturar_valores()
+        else:
+            campos = {self._meta.get_field(nombre).attname for nombre in fields}
+            self.capturar_valores(campos)
+
+
+# OPERACIONES MASIVAS AUDITADAS
+# update() y bulk_create() no disparan pre_save/post_save: estos signals
+# los reemplazan para que signals.py registre la auditoría, ajuste los
+# resúmenes e invalide el caché de una sola vez para todos los objetos.
+creacion_masiva = Signal()       # instancias: objetos creados
+actualizacion_masiva = Signal()  # instancias: objetos modificados (valores_cargados aún anteriores)
+
+
+class AuditadoQuerySet(models.QuerySet):
+    """QuerySet con operaciones masivas que quedan en la auditoría."""
+
+    def actualizar_auditado(self, **valores):
+        """
+        Como update(), pero registra un EDITAR por cada objeto que cambió.
+
+        Una consulta lee los objetos, un solo UPDATE modifica los que
+        cambian y la auditoría se inserta en un solo INSERT. Los valores
+        deben ser concretos (no expresiones F()).
+
+        Returns:
+            int: Número de objetos modificados
+        """
+        if any(hasattr(valor, 'resolve_expression') for valor in valores.values()):
+            raise ValueError('actualizar_auditado no admite expresiones, solo valores concretos')
+
+        # Como save(): los campos auto_now se actualizan
+        for campo in self.model._meta.concrete_fields:
+            if getattr(campo, 'auto_now', False) and campo.name not in valores:
+                valores[campo.name] = timezone.now()
+
+        with transaction.atomic(using=self.db):
+            instancias = list(self.select_for_update(of=('self',)))
+            modificadas = []
+            for instancia in instancias:
+                for nombre, valor in valores.items():
+                    setattr(instancia, nombre, valor)
+                if instancia.obtener_cambios()[1]:
+                    modificadas.append(instancia)
+            if not modificadas:
+                return 0
+
+            self.model._base_manager.using(self.db).filter(
+                pk__in=[instancia.pk for instancia in modificadas]
+            ).update(**valores)
+            actualizacion_masiva.send(sender=self.model, instancias=modificadas)
+
+        for instancia in modificadas:
+            instancia.capturar_valores()
+        return len(modificadas)
+
+    def crear_masivo(self, objetos, batch_size=None):
+        """
+        Como bulk_create(), pero registra un alta por cada objeto en un
+        solo INSERT de auditoría.
+
+        Returns:
+            list: Objetos creados
+        """
+        with transaction.atomic(using=self.db):
+            objetos = self.bulk_create(objetos, batch_size=batch_size)
+            for objeto in objetos:
+                objeto.capturar_valores()
+            creacion_masiva.send(sender=self.model, instancias=objetos)
+        return objetos
+
+
 # MODELOS PRINCIPALES
-class Persona(models.Model):
+class Persona(CambiosMixin, models.Model):
     TIPO_PERSONA_CHOICES = [
         ('ATENDIDO', 'Persona atendida'),
         ('CONTRAPARTE', 'Contraparte'),
@@ -236,6 +405,15 @@ class Persona(models.Model):
         validators=[validar_rut_chileno],
         help_text='Formato: 12.345.678-9'
     )
+    # RUN sin puntos ni guión (limpiar_rut), calculado al guardar: las
+    # búsquedas por RUN son una búsqueda exacta o por prefijo en su índice
+    run_normalizado = models.CharField(
+        'RUN normalizado',
+        max_length=12,
+        unique=True,
+        null=True,
+        editable=False
+    )
     nombres = models.CharField(max_length=100, verbose_name='Nombres')
     apellidos = models.CharField(max_length=100, verbose_name='Apellidos')
     tipo_persona = models.CharField(
@@ -315,6 +493,13 @@ class Persona(models.Model):
         null=True,
         verbose_name='RUN del representante'
     )
+    representante_run_normalizado = models.CharField(
+        max_length=12,
+        null=True,
+        editable=False,
+        db_index=True,
+        verbose_name='RUN del representante normalizado'
+    )
     representante_telefono = models.CharField(
         max_length=20,
         blank=True,
@@ -342,6 +527,17 @@ class Persona(models.Model):
     def __str__(self):
         return f"{self.nombres} {self.apellidos} ({self.run})"
 
+    def save(self, *args, **kwargs):
+        self.run_normalizado = limpiar_rut(self.run) or None
+        self.representante_run_normalizado = limpiar_rut(self.representante_run) or None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            normalizados = {'run': 'run_normalizado', 'representante_run': 'representante_run_normalizado'}
+            kwargs['update_fields'] = set(update_fields) | {
+                normalizados[campo] for campo in update_fields if campo in normalizados
+            }
+        super().save(*args, **kwargs)
+
     def nombre_completo(self):
         return f"{self.nombres} {self.apellidos}"
 
@@ -354,6 +550,30 @@ class Persona(models.Model):
             )
         return None
 
+class TrigramaPersona(models.Model):
+    """
+    Trigramas del nombre de una persona, sin tildes ni mayúsculas.
+    Se mantiene desde signals (ver similitud.py).
+    """
+    persona = models.ForeignKey(
+        Persona,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Persona'
+    )
+    trigrama = models.CharField(max_length=3, verbose_name='Trigrama')
+
+    class Meta:
+        verbose_name = 'Trigrama de persona'
+        verbose_name_plural = 'Trigramas de personas'
+        indexes = [
+            # Cubre la búsqueda: trigrama -> personas sin leer la tabla
+            models.Index(fields=['trigrama', 'persona'], name='trigrama_persona_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.persona_id}: '{self.trigrama}'"
+
 class Consentimiento(models.Model):
     TIPO_CHOICES = [
         ('DATOS_PERSONALES', 'Tratamiento de datos personales'),
@@ -426,7 +646,7 @@ class Consentimiento(models.Model):
         """Retorna True si el consentimiento está otorgado y no ha sido revocado."""
         return self.otorgado and self.fecha_revocacion is None
     
-class Causa(models.Model):
+class Causa(CambiosMixin, models.Model):
     rit = models.CharField(
         'RIT', 
         max_length=20, 
@@ -480,6 +700,8 @@ class Causa(models.Model):
         verbose_name='Responsable'
     )
 
+    objects = AuditadoQuerySet.as_manager()
+
     class Meta:
         ordering = ['-fecha_creacion']
         verbose_name = 'Causa'
@@ -499,6 +721,81 @@ class Causa(models.Model):
     def __str__(self):
         return f"{self.caratula} ({self.rit or self.ruc or self.id})"
 
+class CausaResumen(models.Model):
+    """
+    Conteo de causas por combinación de estado, materia, tribunal y responsable.
+    Se mantiene incrementalmente desde signals (ver resumenes.py).
+    """
+    estado = models.ForeignKey(
+        EstadoCausa,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Estado'
+    )
+    materia = models.ForeignKey(
+        Materia,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Materia'
+    )
+    tribunal = models.ForeignKey(
+        Tribunal,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Tribunal'
+    )
+    responsable = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Responsable'
+    )
+    total = models.IntegerField(default=0, verbose_name='Total de causas')
+
+    class Meta:
+        verbose_name = 'Resumen de causas'
+        verbose_name_plural = 'Resúmenes de causas'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['estado', 'materia', 'tribunal', 'responsable'],
+                name='causa_resumen_unico'
+            ),
+            # SQL considera distintos los NULL: sin esta restricción, dos altas
+            # concurrentes de causas sin responsable duplicarían la fila
+            models.UniqueConstraint(
+                fields=['estado', 'materia', 'tribunal'],
+                condition=models.Q(responsable__isnull=True),
+                name='causa_resumen_unico_sin_responsable'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.estado_id}/{self.materia_id}/{self.tribunal_id}/{self.responsable_id}: {self.total}"
+
+
+class ContadorTabla(models.Model):
+    """
+    Filas de cada tabla con listado, ajustadas desde signals en cada alta y
+    eliminación (ver conteos.py). Sirve como total aproximado de los
+    listados sin filtros de tablas grandes.
+    """
+    tabla = models.CharField(max_length=100, primary_key=True, verbose_name='Tabla')
+    filas = models.BigIntegerField(default=0, verbose_name='Filas')
+    fecha_recalculo = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Último recálculo'
+    )
+
+    class Meta:
+        verbose_name = 'Contador de tabla'
+        verbose_name_plural = 'Contadores de tablas'
+
+    def __str__(self):
+        return f"{self.tabla}: {self.filas}"
+
 class CausaPersona(models.Model):
     causa = models.ForeignKey(Causa, on_delete=models.CASCADE, related_name='personas_en_causa')
     persona = models.ForeignKey(Persona, on_delete=models.CASCADE, related_name='causas_relacionadas')
@@ -510,7 +807,7 @@ class CausaPersona(models.Model):
     def __str__(self):
         return f"{self.persona} como {self.rol_en_causa} en {self.causa}"
 
-class Audiencia(models.Model):
+class Audiencia(CambiosMixin, models.Model):
     TIPO_EVENTO_CHOICES = [
         ('AUDIENCIA_JUDICIAL', 'Audiencia judicial'),
         ('ENTREVISTA_CLIENTE', 'Entrevista con cliente'),
@@ -644,6 +941,8 @@ class Audiencia(models.Model):
         verbose_name='Última modificación'
     )
     
+    objects = AuditadoQuerySet.as_manager()
+
     class Meta:
         ordering = ['-fecha_hora']
         verbose_name = 'Audiencia'
@@ -669,7 +968,7 @@ class Audiencia(models.Model):
         """Retorna True si esta audiencia tiene reprogramaciones."""
         return self.reprogramaciones.exists()
 
-class Documento(models.Model):
+class Documento(CambiosMixin, models.Model):
     ESTADO_CHOICES = [
         ('BORRADOR', 'Borrador'),
         ('FINAL', 'Final'),
@@ -762,6 +1061,8 @@ class Documento(models.Model):
     fecha_subida = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de subida')
     fecha_modificacion = models.DateTimeField(auto_now=True, verbose_name='Última modificación')
 
+    objects = AuditadoQuerySet.as_manager()
+
     class Meta:
         ordering = ['-fecha_subida']
         verbose_name = 'Documento'
@@ -791,8 +1092,63 @@ class Documento(models.Model):
 
     def es_imagen(self):
         return self.extension() in ['.jpg', '.jpeg', '.png', '.gif']
-    
-class LogAuditoria(models.Model):
+
+
+class TextoDocumento(models.Model):
+    """
+    Texto extraído del archivo de un documento, comprimido con zlib, y su
+    estado en la cola de extracción. Lo procesa `manage.py extraer_textos`
+    fuera del request (ver extraccion.py).
+    """
+    ESTADO_CHOICES = [
+        ('PENDIENTE', 'Pendiente'),
+        ('PROCESANDO', 'Procesando'),
+        ('COMPLETADO', 'Completado'),
+        ('ERROR', 'Error'),
+        ('NO_SOPORTADO', 'Formato no soportado'),
+        ('SIN_EXTRACTOR', 'Extractor no instalado'),
+    ]
+
+    documento = models.OneToOneField(
+        Documento,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='texto_extraido',
+        verbose_name='Documento'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADO_CHOICES,
+        default='PENDIENTE',
+        verbose_name='Estado'
+    )
+    intentos = models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')
+    texto = models.BinaryField(null=True, blank=True, verbose_name='Texto (zlib)')
+    caracteres = models.PositiveIntegerField(default=0, verbose_name='Caracteres')
+    error = models.CharField(max_length=500, blank=True, default='', verbose_name='Error')
+    fecha_solicitud = models.DateTimeField(verbose_name='Fecha de solicitud')
+    fecha_inicio = models.DateTimeField(null=True, blank=True, verbose_name='Inicio del proceso')
+    fecha_proceso = models.DateTimeField(null=True, blank=True, verbose_name='Fin del proceso')
+
+    class Meta:
+        verbose_name = 'Texto de documento'
+        verbose_name_plural = 'Textos de documentos'
+        indexes = [
+            models.Index(fields=['estado', 'fecha_solicitud'], name='texto_doc_cola_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.documento_id}: {self.get_estado_display()}"
+
+    def obtener_texto(self):
+        """Texto extraído descomprimido ('' si aún no hay)."""
+        if not self.texto:
+            return ''
+        return zlib.decompress(self.texto).decode('utf-8')
+
+class LogAuditoriaBase(models.Model):
+    """Campos comunes del log de auditoría activo y del archivado."""
+
     ACCION_CHOICES = [
         ('CREAR', 'Crear'),
         ('EDITAR', 'Editar'),
@@ -817,14 +1173,6 @@ class LogAuditoria(models.Model):
         ('OTRO', 'Otro'),
     ]
 
-    usuario = models.ForeignKey(
-        User,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name='logs_auditoria',
-        verbose_name='Usuario'
-    )
     accion = models.CharField(
         max_length=20,
         choices=ACCION_CHOICES,
@@ -874,6 +1222,23 @@ class LogAuditoria(models.Model):
         null=True,
         verbose_name='Descripción'
     )
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.usuario} - {self.get_accion_display()} {self.modelo} - {self.fecha.strftime('%d/%m/%Y %H:%M')}"
+
+
+class LogAuditoria(LogAuditoriaBase):
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='logs_auditoria',
+        verbose_name='Usuario'
+    )
     fecha = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Fecha y hora'
@@ -893,6 +1258,34 @@ class LogAuditoria(models.Model):
             models.Index(fields=['modelo', 'objeto_id'], name='log_modelo_objeto_idx'),
         ]
 
-    def __str__(self):
-        return f"{self.usuario} - {self.get_accion_display()} {self.modelo} - {self.fecha.strftime('%d/%m/%Y %H:%M')}"  
+
+class LogAuditoriaArchivo(LogAuditoriaBase):
+    """
+    Logs de auditoría fuera de la ventana activa (AUDITORIA_MESES_ACTIVOS),
+    movidos aquí por el comando `archivar_auditoria`. Conservan el id y la
+    fecha originales; `particion` es el mes (AAAA-MM) del registro.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name='ID original')
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Usuario'
+    )
+    fecha = models.DateTimeField(verbose_name='Fecha y hora')
+    particion = models.CharField(max_length=7, verbose_name='Mes')
+
+    class Meta:
+        ordering = ['-fecha']
+        verbose_name = 'Log de Auditoría archivado'
+        verbose_name_plural = 'Logs de Auditoría archivados'
+        indexes = [
+            models.Index(fields=['particion'], name='log_arch_particion_idx'),
+            models.Index(fields=['-fecha', '-id'], name='log_arch_fecha_desc_idx'),
+            models.Index(fields=['usuario'], name='log_arch_usuario_idx'),
+            models.Index(fields=['modelo', 'objeto_id'], name='log_arch_modelo_objeto_idx'),
+        ]
     
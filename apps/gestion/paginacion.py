@@ -0,0 +1,289 @@
+"""
+Paginación por cursor
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+En lugar de OFFSET, que recorre y descarta todas las filas anteriores a la
+página, cada página continúa desde la última fila de la anterior usando el
+índice por fecha (el id desempata registros con la misma fecha). Una página
+profunda cuesta lo mismo que la primera.
+
+- `paginar`: listados (personas, causas, audiencias, documentos, ...).
+  Recibe el queryset ya filtrado y retorna una página con cursores
+  opacos para templates/components/paginacion.html. El total viene del
+  servicio de conteos (conteos.py): en caché, o aproximado en tablas
+  grandes sin filtros.
+- `paginar_por_fecha`: auditoría, cuyas filas vienen de dos tablas.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from .conteos import contar as contar_filas
+
+
+EPOCA = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSEGUNDO = timedelta(microseconds=1)
+
+
+def codificar_cursor(fila):
+    """Cursor de una fila (dict con 'fecha' e 'id'): '<microsegundos>.<id>'."""
+    return f"{(fila['fecha'] - EPOCA) // MICROSEGUNDO}.{fila['id']}"
+
+
+def decodificar_cursor(cursor):
+    """Retorna (fecha, id) de un cursor, o None si no es válido."""
+    try:
+        microsegundos, pk = cursor.split('.')
+        return EPOCA + int(microsegundos) * MICROSEGUNDO, int(pk)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def _anteriores(fecha, pk):
+    # (fecha, id) < (fecha, pk), escrito como rango sobre fecha para usar el índice
+    return Q(fecha__lte=fecha) & ~Q(fecha=fecha, id__gte=pk)
+
+
+def _posteriores(fecha, pk):
+    return Q(fecha__gte=fecha) & ~Q(fecha=fecha, id__lte=pk)
+
+
+class PaginaCursor:
+    """Página de resultados por cursor."""
+
+    def __init__(self, object_list, cursor_siguiente=None, cursor_anterior=None):
+        self.object_list = object_list
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+
+    def has_next(self):
+        return self.cursor_siguiente is not None
+
+    def has_previous(self):
+        return self.cursor_anterior is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginar_por_fecha(consultar, por_pagina, despues='', antes=''):
+    """
+    Página de filas ordenadas de la más reciente a la más antigua.
+
+    Args:
+        consultar: Función (condicion, orden) -> QuerySet de diccionarios con
+            'fecha' e 'id'; condicion es un Q o None, orden una tupla de campos
+        por_pagina: Filas por página
+        despues: Cursor de la última fila de la página anterior (más antiguas)
+        antes: Cursor de la primera fila de la página siguiente (más recientes)
+
+    Returns:
+        PaginaCursor
+    """
+    limite = decodificar_cursor(antes) if antes else None
+    if limite is not None:
+        # Retroceder: las filas más cercanas al cursor, en orden inverso
+        filas = list(consultar(_posteriores(*limite), ('fecha', 'id'))[:por_pagina + 1])
+        hay_mas = len(filas) > por_pagina
+        filas = filas[:por_pagina][::-1]
+        return PaginaCursor(
+            filas,
+            cursor_siguiente=codificar_cursor(filas[-1]) if filas else None,
+            cursor_anterior=codificar_cursor(filas[0]) if hay_mas else None,
+        )
+
+    limite = decodificar_cursor(despues) if despues else None
+    condicion = _anteriores(*limite) if limite is not None else None
+    filas = list(consultar(condicion, ('-fecha', '-id'))[:por_pagina + 1])
+    hay_mas = len(filas) > por_pagina
+    filas = filas[:por_pagina]
+    return PaginaCursor(
+        filas,
+        cursor_siguiente=codificar_cursor(filas[-1]) if hay_mas else None,
+        cursor_anterior=codificar_cursor(filas[0]) if filas and limite is not None else None,
+    )
+
+
+# =============================================================================
+# PAGINADOR DE LISTADOS
+# =============================================================================
+
+# Direcciones del cursor: después de una fila, antes de una fila, última
+# página y desplazamiento (resultados ordenados por relevancia)
+SIGUIENTE, ANTERIOR, ULTIMA, DESPLAZAMIENTO = 's', 'a', 'u', 'o'
+
+
+def _codificar(*partes):
+    datos = json.dumps(partes, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(datos).decode().rstrip('=')
+
+
+def _decodificar(cursor):
+    """Partes de un cursor opaco, o None si no es válido."""
+    try:
+        datos = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        partes = json.loads(datos)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(partes, list) or not partes or partes[0] not in (
+        SIGUIENTE, ANTERIOR, ULTIMA, DESPLAZAMIENTO
+    ):
+        return None
+    return partes
+
+
+class PaginaListado(PaginaCursor):
+    """
+    Página de un listado. Además de los cursores conoce su número y, si se
+    contó, el total de resultados (para "Mostrando 31-45 de 120").
+    """
+
+    def __init__(self, object_list, por_pagina, numero, conteo=None,
+                 cursor_siguiente=None, cursor_anterior=None, cursor_ultima=None):
+        super().__init__(object_list, cursor_siguiente, cursor_anterior)
+        self.por_pagina = por_pagina
+        self.number = numero
+        self.total = conteo.total if conteo is not None else None
+        self.total_aproximado = conteo is not None and conteo.aproximado
+        self.cursor_ultima = cursor_ultima
+
+    @property
+    def num_pages(self):
+        if self.total is None:
+            return None
+        return max(1, -(-self.total // self.por_pagina))
+
+    def start_index(self):
+        return (self.number - 1) * self.por_pagina + 1 if self.object_list else 0
+
+    def end_index(self):
+        return (self.number - 1) * self.por_pagina + len(self.object_list)
+
+
+def _valor_cursor(valor):
+    return valor.isoformat() if hasattr(valor, 'isoformat') else valor
+
+
+def paginar(queryset, por_pagina, cursor='', campo='id', contar=True):
+    """
+    Página de un queryset, de la fila más reciente a la más antigua.
+
+    Las filas se ordenan por (campo, id) descendente y cada página se busca
+    desde la fila límite de la anterior, usando el índice de `campo`.
+
+    Args:
+        queryset: QuerySet ya filtrado (su orden se reemplaza)
+        por_pagina: Filas por página
+        cursor: Cursor recibido en la URL ('' para la primera página)
+        campo: Campo de orden no nulo ('id', 'fecha_creacion', ...). Con
+            None se conserva el orden del queryset y se pagina por
+            desplazamiento: solo para resultados acotados (p. ej. por
+            relevancia)
+        contar: Si es True, obtiene el total (conteos.contar)
+
+    Returns:
+        PaginaListado
+    """
+    partes = _decodificar(cursor) if cursor else None
+    if partes is not None and (partes[0] == DESPLAZAMIENTO) != (campo is None):
+        partes = None
+    if campo is None:
+        return _paginar_desplazamiento(queryset, por_pagina, partes, contar)
+
+    conteo = contar_filas(queryset) if contar else None
+    total = conteo.total if conteo is not None else None
+
+    campo_modelo = queryset.model._meta.get_field(campo)
+    es_id = campo_modelo.primary_key
+    orden = (f'-{campo}', '-pk') if not es_id else ('-pk',)
+    orden_inverso = (campo, 'pk') if not es_id else ('pk',)
+
+    def fila(partes):
+        try:
+            return campo_modelo.to_python(partes[1]), int(partes[2])
+        except (IndexError, TypeError, ValueError, ValidationError):
+            return None
+
+    def posicion(objeto):
+        return _valor_cursor(getattr(objeto, campo_modelo.attname)), objeto.pk
+
+    def anteriores(valor, pk):
+        if es_id:
+            return Q(pk__lt=pk)
+        # (campo, id) < (valor, pk), como rango sobre campo para usar el índice
+        return Q(**{f'{campo}__lte': valor}) & ~Q(**{campo: valor, 'pk__gte': pk})
+
+    def posteriores(valor, pk):
+        if es_id:
+            return Q(pk__gt=pk)
+        return Q(**{f'{campo}__gte': valor}) & ~Q(**{campo: valor, 'pk__lte': pk})
+
+    direccion = partes[0] if partes else None
+    limite = fila(partes) if direccion in (SIGUIENTE, ANTERIOR) else None
+    numero = partes[3] if direccion and len(partes) > 3 and isinstance(partes[3], int) else 1
+    if (direccion in (SIGUIENTE, ANTERIOR) and limite is None) or (direccion == ULTIMA and not total):
+        # Cursor no válido: primera página
+        direccion = None
+
+    def pagina(filas, numero, hay_siguiente, hay_anterior):
+        numero = max(numero, 1) if hay_anterior else 1
+        return PaginaListado(
+            filas, por_pagina, numero, conteo,
+            cursor_siguiente=_codificar(SIGUIENTE, *posicion(filas[-1]), numero + 1)
+            if filas and hay_siguiente else None,
+            cursor_anterior=_codificar(ANTERIOR, *posicion(filas[0]), numero - 1)
+            if filas and hay_anterior else None,
+            cursor_ultima=_codificar(ULTIMA) if hay_siguiente and total else None,
+        )
+
+    if direccion == ULTIMA:
+        # Las filas más antiguas, en orden inverso: las que sobran de las
+        # páginas completas
+        cantidad = total % por_pagina or por_pagina
+        filas = list(queryset.order_by(*orden_inverso)[:cantidad + 1])
+        hay_anterior = len(filas) > cantidad
+        return pagina(filas[:cantidad][::-1], -(-total // por_pagina), False, hay_anterior)
+
+    if direccion == ANTERIOR:
+        filas = list(queryset.filter(posteriores(*limite)).order_by(*orden_inverso)[:por_pagina + 1])
+        hay_anterior = len(filas) > por_pagina
+        return pagina(filas[:por_pagina][::-1], numero, True, hay_anterior)
+
+    if direccion == SIGUIENTE:
+        queryset = queryset.filter(anteriores(*limite))
+    filas = list(queryset.order_by(*orden)[:por_pagina + 1])
+    return pagina(filas[:por_pagina], numero, len(filas) > por_pagina, direccion == SIGUIENTE)
+
+
+def _paginar_desplazamiento(queryset, por_pagina, partes, contar):
+    try:
+        inicio = max(int(partes[1]), 0) if partes else 0
+    except (TypeError, ValueError):
+        inicio = 0
+    conteo = contar_filas(queryset) if contar else None
+    total = conteo.total if conteo is not None else None
+    if total is not None and inicio >= total:
+        inicio = max(total - 1, 0) // por_pagina * por_pagina
+    inicio -= inicio % por_pagina
+
+    filas = list(queryset[inicio:inicio + por_pagina + 1])
+    hay_siguiente = len(filas) > por_pagina
+    ultima = None
+    if hay_siguiente and total is not None:
+        ultima = _codificar(DESPLAZAMIENTO, (total - 1) // por_pagina * por_pagina)
+    return PaginaListado(
+        filas[:por_pagina], por_pagina, inicio // por_pagina + 1, conteo,
+        cursor_siguiente=_codificar(DESPLAZAMIENTO, inicio + por_pagina) if hay_siguiente else None,
+        cursor_anterior=_codificar(DESPLAZAMIENTO, inicio - por_pagina) if inicio else None,
+        cursor_ultima=ultima,
+    )
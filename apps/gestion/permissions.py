@@ -17,6 +17,7 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.core.exceptions import PermissionDenied
+from django.db.models import Q
 import logging
 
 logger = logging.getLogger('seguridad')
@@ -522,13 +523,18 @@ def puede_ver_causa(usuario, causa):
     
     # Externo solo ve sus propias causas
     if rol == 'EXTERNO':
-        # Verificar si está relacionado con la causa
-        from .models import CausaPersona, Persona
-        try:
-            persona = Persona.objects.get(email=usuario.email)
-            return CausaPersona.objects.filter(causa=causa, persona=persona).exists()
-        except Persona.DoesNotExist:
+        # Verificar si está relacionado con la causa: por RUT normalizado
+        # (índice único); por email solo si el perfil no tiene RUT
+        from .models import CausaPersona
+        perfil = getattr(usuario, 'perfil', None)
+        rut = perfil.rut_normalizado if perfil is not None else None
+        if rut:
+            relacion = Q(persona__run_normalizado=rut)
+        elif usuario.email:
+            relacion = Q(persona__email=usuario.email)
+        else:
             return False
+        return CausaPersona.objects.filter(relacion, causa=causa).exists()
     
     return False
 
@@ -752,8 +758,8 @@ def permisos_context_processor(request):
 def _registrar_acceso_denegado(request, permiso, vista):
     """Registra un intento de acceso denegado en la auditoría."""
     try:
-        from .models import LogAuditoria
-        LogAuditoria.objects.create(
+        from .auditoria import registrar
+        registrar(
             usuario=request.user,
             accion='OTRO',
             modelo='OTRO',
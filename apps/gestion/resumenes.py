@@ -0,0 +1,171 @@
+"""
+Tablas de resumen (rollup) de causas
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño
+
+CausaResumen guarda cuántas causas hay por cada combinación de
+(estado, materia, tribunal, responsable). Los signals la ajustan en cada
+alta, edición y eliminación, de modo que dashboard, reportes y panel de
+administración no necesitan recorrer la tabla de causas con GROUP BY.
+"""
+
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from .models import Causa, CausaResumen
+
+
+# Dimensiones del resumen (en el mismo orden que dimensiones_causa)
+DIMENSIONES = ('estado_id', 'materia_id', 'tribunal_id', 'responsable_id')
+
+
+def dimensiones_causa(causa):
+    """Retorna la tupla de dimensiones de una causa."""
+    return tuple(getattr(causa, campo) for campo in DIMENSIONES)
+
+
+def dimensiones_cargadas(causa):
+    """
+    Dimensiones con que la causa se cargó de la BD (ver CambiosMixin).
+    None si no se cargó o si alguna dimensión quedó diferida.
+    """
+    valores = causa.valores_cargados
+    if valores is None:
+        return None
+    try:
+        return tuple(valores[campo.removesuffix('_id')] for campo in DIMENSIONES)
+    except KeyError:
+        return None
+
+
+def dimensiones_en_bd(pk):
+    """Dimensiones guardadas de una causa (None si no existe)."""
+    return Causa.objects.filter(pk=pk).values_list(*DIMENSIONES).first()
+
+
+def ajustar_resumen(dimensiones, delta):
+    """
+    Suma `delta` al conteo de una combinación de dimensiones, creando la
+    fila si no existe.
+
+    Las filas que quedan en cero no se eliminan (las consultas filtran
+    total > 0): borrarlas podría perder el incremento de otra transacción
+    que las actualizó entre medio. recalcular_resumenes las depura.
+    """
+    filtro = dict(zip(DIMENSIONES, dimensiones))
+    filas = CausaResumen.objects.filter(**filtro)
+
+    if filas.update(total=F('total') + delta) or delta <= 0:
+        return
+
+    try:
+        with transaction.atomic():
+            CausaResumen.objects.create(total=delta, **filtro)
+    except IntegrityError:
+        # Otro proceso creó la fila entre el UPDATE y el INSERT
+        if not filas.update(total=F('total') + delta):
+            raise
+
+
+def registrar_cambio_causa(anteriores, nuevas):
+    """
+    Ajusta el resumen al cambiar las dimensiones de una causa.
+
+    Args:
+        anteriores: Dimensiones antes del cambio (None si es nueva)
+        nuevas: Dimensiones después del cambio (None si se eliminó)
+    """
+    if anteriores == nuevas:
+        return
+    if anteriores is not None:
+        ajustar_resumen(anteriores, -1)
+    if nuevas is not None:
+        ajustar_resumen(nuevas, 1)
+
+
+def registrar_cambios_causas(cambios):
+    """
+    Ajusta el resumen para varios cambios a la vez (operaciones masivas),
+    con una actualización por combinación afectada en vez de por causa.
+
+    Args:
+        cambios: Iterable de (anteriores, nuevas) como en registrar_cambio_causa
+    """
+    ajustes = Counter()
+    for anteriores, nuevas in cambios:
+        if anteriores == nuevas:
+            continue
+        if anteriores is not None:
+            ajustes[anteriores] -= 1
+        if nuevas is not None:
+            ajustes[nuevas] += 1
+    for dimensiones, delta in ajustes.items():
+        if delta:
+            ajustar_resumen(dimensiones, delta)
+
+
+def trasladar_responsable_eliminado(usuario):
+    """
+    Mueve los conteos de un usuario que se elimina a 'sin responsable'.
+    Sus causas quedan con responsable NULL (on_delete=SET_NULL) sin que
+    se disparen los signals de Causa.
+    """
+    for fila in CausaResumen.objects.filter(responsable=usuario):
+        ajustar_resumen(
+            (fila.estado_id, fila.materia_id, fila.tribunal_id, None),
+            fila.total
+        )
+        fila.delete()
+
+
+@transaction.atomic
+def recalcular_resumenes():
+    """
+    Reconstruye la tabla de resumen desde cero.
+
+    Returns:
+        int: Número de combinaciones generadas
+    """
+    filas = Causa.objects.order_by().values(*DIMENSIONES).annotate(total=Count('id'))
+    CausaResumen.objects.all().delete()
+    resumenes = CausaResumen.objects.bulk_create(
+        [CausaResumen(**fila) for fila in filas],
+        batch_size=500
+    )
+    return len(resumenes)
+
+
+# =============================================================================
+# CONSULTAS
+# =============================================================================
+
+def filtrar_resumen(estado=None, materia=None, tribunal=None, responsable=None):
+    """Retorna las filas de resumen que cumplen los filtros indicados."""
+    resumen = CausaResumen.objects.all()
+    if estado:
+        resumen = resumen.filter(estado_id=estado)
+    if materia:
+        resumen = resumen.filter(materia_id=materia)
+    if tribunal:
+        resumen = resumen.filter(tribunal_id=tribunal)
+    if responsable:
+        resumen = resumen.filter(responsable_id=responsable)
+    return resumen
+
+
+def contar_causas(**filtros):
+    """Total de causas que cumplen los filtros (ver filtrar_resumen)."""
+    return filtrar_resumen(**filtros).aggregate(total=Sum('total'))['total'] or 0
+
+
+def contar_causas_por(*campos, **filtros):
+    """
+    Conteo de causas agrupado por campos del resumen.
+
+    Ejemplo:
+        contar_causas_por('estado__nombre', 'estado__color', materia=3)
+    """
+    return filtrar_resumen(**filtros).values(*campos).annotate(
+        total=Sum('total')
+    ).filter(total__gt=0).order_by('-total')
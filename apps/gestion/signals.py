@@ -1,4 +1,5 @@
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.dispatch import receiver
 from django.contrib.auth.models import User
@@ -8,9 +9,34 @@ from .cache_utils import (
     invalidar_cache_materias,
     invalidar_cache_estados,
     invalidar_cache_tipos_documento,
+    invalidar_cache_responsables,
+    invalidar_cache_dashboard,
+    invalidar_cache_reportes,
+    invalidar_cache_calendario,
+    invalidar_cache_personas,
+    invalidar_cache_causas,
+    invalidar_cache_documentos,
+    invalidar_cache_audiencias,
+    invalidar_cache_consentimientos,
+    invalidar_cache_usuarios,
+)
+from apps.cuentas.models import Perfil
+
+from . import busqueda, conteos, extraccion, similitud
+from .auditoria import registrar, registrar_varios
+from .contexto import get_current_request
+
+from .resumenes import (
+    dimensiones_causa,
+    dimensiones_cargadas,
+    dimensiones_en_bd,
+    registrar_cambio_causa,
+    registrar_cambios_causas,
+    trasladar_responsable_eliminado,
 )
 
 from .models import Causa, Persona, Documento, Audiencia, Consentimiento, LogAuditoria, Tribunal, Materia, EstadoCausa, TipoDocumento
+from .models import creacion_masiva, actualizacion_masiva
 
 
 # =============================================================================
@@ -72,17 +98,9 @@ def objeto_a_dict(obj, campos_excluidos=None):
 
 
 # =============================================================================
-# VARIABLE THREAD-LOCAL PARA REQUEST
+# REQUEST ACTUAL (ver contexto.py)
 # =============================================================================
 
-import threading
-_thread_locals = threading.local()
-
-
-def get_current_request():
-    return getattr(_thread_locals, 'request', None)
-
-
 def get_current_user():
     request = get_current_request()
     if request and hasattr(request, 'user') and request.user.is_authenticated:
@@ -90,20 +108,6 @@ def get_current_user():
     return None
 
 
-class AuditoriaMiddleware:
-    """Middleware para capturar el request actual."""
-    
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        _thread_locals.request = request
-        response = self.get_response(request)
-        if hasattr(_thread_locals, 'request'):
-            del _thread_locals.request
-        return response
-
-
 # =============================================================================
 # FUNCIÓN PARA REGISTRAR LOG
 # =============================================================================
@@ -119,7 +123,7 @@ def registrar_log(accion, modelo, objeto=None, objeto_id=None, objeto_repr=None,
         objeto_id = objeto.pk
         objeto_repr = str(objeto)[:200]
     
-    LogAuditoria.objects.create(
+    registrar(
         usuario=usuario,
         accion=accion,
         modelo=modelo,
@@ -133,11 +137,66 @@ def registrar_log(accion, modelo, objeto=None, objeto_id=None, objeto_repr=None,
     )
 
 
-# =============================================================================
-# ALMACÉN TEMPORAL PARA DATOS ANTERIORES
-# =============================================================================
+def registrar_edicion(modelo, instance, descripcion):
+    """
+    Registra la edición de un objeto guardando solo los campos que cambiaron
+    (ver CambiosMixin). Si el guardado no cambió nada, no registra.
+    """
+    cambios = instance.obtener_cambios()
+    if cambios is None:
+        # No se cargó de la BD: no se conocen los valores anteriores
+        datos_anteriores, datos_nuevos = None, objeto_a_dict(instance)
+    else:
+        datos_anteriores, datos_nuevos = cambios
+        if not datos_nuevos:
+            return
+
+    registrar_log(
+        accion='EDITAR',
+        modelo=modelo,
+        objeto=instance,
+        datos_anteriores=datos_anteriores,
+        datos_nuevos=datos_nuevos,
+        descripcion=descripcion
+    )
 
-_pre_save_data = {}
+
+def registrar_masivo(accion, modelo, instancias, describir):
+    """
+    Registra con un solo INSERT un log por objeto de una operación masiva
+    (ver AuditadoQuerySet). Las ediciones guardan solo los campos que
+    cambiaron, como registrar_edicion.
+
+    Args:
+        accion: CREAR, SUBIR_DOC o EDITAR
+        modelo: Modelo afectado (CAUSA, AUDIENCIA, ...)
+        instancias: Objetos creados o modificados
+        describir: Función que retorna la descripción de un objeto
+    """
+    request = get_current_request()
+    usuario = get_current_user()
+    ip_address = get_client_ip(request)
+    user_agent = get_user_agent(request)
+
+    entradas = []
+    for instancia in instancias:
+        if accion == 'EDITAR':
+            datos_anteriores, datos_nuevos = instancia.obtener_cambios()
+        else:
+            datos_anteriores, datos_nuevos = None, instancia.valores_cargados
+        entradas.append(dict(
+            usuario=usuario,
+            accion=accion,
+            modelo=modelo,
+            objeto_id=instancia.pk,
+            objeto_repr=str(instancia)[:200],
+            datos_anteriores=datos_anteriores,
+            datos_nuevos=datos_nuevos,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            descripcion=describir(instancia)
+        ))
+    registrar_varios(entradas)
 
 
 # =============================================================================
@@ -146,17 +205,16 @@ _pre_save_data = {}
 
 @receiver(pre_save, sender=Causa)
 def causa_pre_save(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            original = Causa.objects.get(pk=instance.pk)
-            _pre_save_data[f'causa_{instance.pk}'] = objeto_a_dict(original)
-        except Causa.DoesNotExist:
-            pass
+    # Solo si no se conocen las dimensiones con que se cargó (p. ej. una
+    # instancia armada a mano con pk): leerlas para ajustar el resumen
+    if instance.pk and dimensiones_cargadas(instance) is None:
+        instance._dimensiones_anteriores = dimensiones_en_bd(instance.pk)
 
 
 @receiver(post_save, sender=Causa)
 def causa_post_save(sender, instance, created, **kwargs):
     if created:
+        registrar_cambio_causa(None, dimensiones_causa(instance))
         registrar_log(
             accion='CREAR',
             modelo='CAUSA',
@@ -165,20 +223,17 @@ def causa_post_save(sender, instance, created, **kwargs):
             descripcion=f'Causa creada: {instance.caratula}'
         )
     else:
-        key = f'causa_{instance.pk}'
-        datos_anteriores = _pre_save_data.pop(key, None)
-        registrar_log(
-            accion='EDITAR',
-            modelo='CAUSA',
-            objeto=instance,
-            datos_anteriores=datos_anteriores,
-            datos_nuevos=objeto_a_dict(instance),
-            descripcion=f'Causa editada: {instance.caratula}'
-        )
+        dimensiones_anteriores = dimensiones_cargadas(instance)
+        if dimensiones_anteriores is None:
+            dimensiones_anteriores = instance.__dict__.pop('_dimensiones_anteriores', None)
+        if dimensiones_anteriores is not None:
+            registrar_cambio_causa(dimensiones_anteriores, dimensiones_causa(instance))
+        registrar_edicion('CAUSA', instance, f'Causa editada: {instance.caratula}')
 
 
 @receiver(post_delete, sender=Causa)
 def causa_post_delete(sender, instance, **kwargs):
+    registrar_cambio_causa(dimensiones_causa(instance), None)
     registrar_log(
         accion='ELIMINAR',
         modelo='CAUSA',
@@ -189,20 +244,30 @@ def causa_post_delete(sender, instance, **kwargs):
     )
 
 
+@receiver(creacion_masiva, sender=Causa)
+def causa_creacion_masiva(sender, instancias, **kwargs):
+    registrar_cambios_causas((None, dimensiones_causa(causa)) for causa in instancias)
+    registrar_masivo('CREAR', 'CAUSA', instancias, lambda causa: f'Causa creada: {causa.caratula}')
+
+
+@receiver(actualizacion_masiva, sender=Causa)
+def causa_actualizacion_masiva(sender, instancias, **kwargs):
+    registrar_cambios_causas(
+        (dimensiones_cargadas(causa), dimensiones_causa(causa)) for causa in instancias
+    )
+    registrar_masivo('EDITAR', 'CAUSA', instancias, lambda causa: f'Causa editada: {causa.caratula}')
+
+
+@receiver(pre_delete, sender=User)
+def usuario_pre_delete(sender, instance, **kwargs):
+    """Sus causas quedarán sin responsable: trasladar sus conteos."""
+    trasladar_responsable_eliminado(instance)
+
+
 # =============================================================================
 # SIGNALS PARA PERSONA
 # =============================================================================
 
-@receiver(pre_save, sender=Persona)
-def persona_pre_save(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            original = Persona.objects.get(pk=instance.pk)
-            _pre_save_data[f'persona_{instance.pk}'] = objeto_a_dict(original)
-        except Persona.DoesNotExist:
-            pass
-
-
 @receiver(post_save, sender=Persona)
 def persona_post_save(sender, instance, created, **kwargs):
     if created:
@@ -214,15 +279,8 @@ def persona_post_save(sender, instance, created, **kwargs):
             descripcion=f'Persona creada: {instance.nombre_completo()}'
         )
     else:
-        key = f'persona_{instance.pk}'
-        datos_anteriores = _pre_save_data.pop(key, None)
-        registrar_log(
-            accion='EDITAR',
-            modelo='PERSONA',
-            objeto=instance,
-            datos_anteriores=datos_anteriores,
-            datos_nuevos=objeto_a_dict(instance),
-            descripcion=f'Persona editada: {instance.nombre_completo()}'
+        registrar_edicion(
+            'PERSONA', instance, f'Persona editada: {instance.nombre_completo()}'
         )
 
 
@@ -253,13 +311,7 @@ def documento_post_save(sender, instance, created, **kwargs):
             descripcion=f'Documento subido: {instance.titulo}'
         )
     else:
-        registrar_log(
-            accion='EDITAR',
-            modelo='DOCUMENTO',
-            objeto=instance,
-            datos_nuevos=objeto_a_dict(instance),
-            descripcion=f'Documento editado: {instance.titulo}'
-        )
+        registrar_edicion('DOCUMENTO', instance, f'Documento editado: {instance.titulo}')
 
 
 @receiver(post_delete, sender=Documento)
@@ -273,6 +325,42 @@ def documento_post_delete(sender, instance, **kwargs):
     )
 
 
+@receiver(post_save, sender=Documento)
+def encolar_extraccion_signal(sender, instance, created, **kwargs):
+    """Encola la extracción de texto si el documento es nuevo o cambió su archivo."""
+    cambios = None if created else instance.obtener_cambios()
+    if cambios is None or 'archivo' in cambios[1]:
+        extraccion.encolar([instance])
+
+
+@receiver(creacion_masiva, sender=Documento)
+def encolar_extraccion_creacion_signal(sender, instancias, **kwargs):
+    """Encola la extracción de los documentos creados en bloque."""
+    extraccion.encolar(instancias)
+
+
+@receiver(actualizacion_masiva, sender=Documento)
+def encolar_extraccion_actualizacion_signal(sender, instancias, **kwargs):
+    """Encola la extracción de los documentos con el archivo reemplazado."""
+    extraccion.encolar([
+        documento for documento in instancias if 'archivo' in documento.obtener_cambios()[1]
+    ])
+
+
+@receiver(creacion_masiva, sender=Documento)
+def documento_creacion_masiva(sender, instancias, **kwargs):
+    registrar_masivo(
+        'SUBIR_DOC', 'DOCUMENTO', instancias, lambda doc: f'Documento subido: {doc.titulo}'
+    )
+
+
+@receiver(actualizacion_masiva, sender=Documento)
+def documento_actualizacion_masiva(sender, instancias, **kwargs):
+    registrar_masivo(
+        'EDITAR', 'DOCUMENTO', instancias, lambda doc: f'Documento editado: {doc.titulo}'
+    )
+
+
 # =============================================================================
 # SIGNALS PARA AUDIENCIA
 # =============================================================================
@@ -288,13 +376,20 @@ def audiencia_post_save(sender, instance, created, **kwargs):
             descripcion=f'Audiencia creada: {instance}'
         )
     else:
-        registrar_log(
-            accion='EDITAR',
-            modelo='AUDIENCIA',
-            objeto=instance,
-            datos_nuevos=objeto_a_dict(instance),
-            descripcion=f'Audiencia editada: {instance}'
-        )
+        registrar_edicion('AUDIENCIA', instance, f'Audiencia editada: {instance}')
+
+
+@receiver(creacion_masiva, sender=Audiencia)
+def audiencia_creacion_masiva(sender, instancias, **kwargs):
+    # La descripción incluye la causa: cargarlas en una sola consulta
+    prefetch_related_objects(instancias, 'causa')
+    registrar_masivo('CREAR', 'AUDIENCIA', instancias, lambda aud: f'Audiencia creada: {aud}')
+
+
+@receiver(actualizacion_masiva, sender=Audiencia)
+def audiencia_actualizacion_masiva(sender, instancias, **kwargs):
+    prefetch_related_objects(instancias, 'causa')
+    registrar_masivo('EDITAR', 'AUDIENCIA', instancias, lambda aud: f'Audiencia editada: {aud}')
 
 
 # =============================================================================
@@ -319,7 +414,7 @@ def consentimiento_post_save(sender, instance, created, **kwargs):
 
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
-    LogAuditoria.objects.create(
+    registrar(
         usuario=user,
         accion='LOGIN',
         modelo='USUARIO',
@@ -334,7 +429,7 @@ def log_user_login(sender, request, user, **kwargs):
 @receiver(user_logged_out)
 def log_user_logout(sender, request, user, **kwargs):
     if user:
-        LogAuditoria.objects.create(
+        registrar(
             usuario=user,
             accion='LOGOUT',
             modelo='USUARIO',
@@ -363,6 +458,7 @@ def invalidar_cache_tribunal_signal(sender, instance, **kwargs):
 def invalidar_cache_materia_signal(sender, instance, **kwargs):
     """Invalida caché cuando se modifica una materia."""
     invalidar_cache_materias()
+    invalidar_cache_reportes()
 
 
 @receiver(post_save, sender=EstadoCausa)
@@ -370,10 +466,198 @@ def invalidar_cache_materia_signal(sender, instance, **kwargs):
 def invalidar_cache_estado_signal(sender, instance, **kwargs):
     """Invalida caché cuando se modifica un estado."""
     invalidar_cache_estados()
+    # El autocompletado de causas activas depende de estado.es_final
+    invalidar_cache_causas()
+    invalidar_cache_dashboard()
+    invalidar_cache_reportes()
 
 
 @receiver(post_save, sender=TipoDocumento)
 @receiver(post_delete, sender=TipoDocumento)
 def invalidar_cache_tipo_doc_signal(sender, instance, **kwargs):
     """Invalida caché cuando se modifica un tipo de documento."""
-    invalidar_cache_tipos_documento()
\ No newline at end of file
+    invalidar_cache_tipos_documento()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Perfil)
+@receiver(post_delete, sender=Perfil)
+def invalidar_cache_responsables_signal(sender, instance, update_fields=None, **kwargs):
+    """Invalida caché cuando se modifica un usuario o su perfil."""
+    # El login solo actualiza last_login: no afecta a los responsables
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidar_cache_responsables()
+
+
+@receiver(post_save, sender=Causa)
+@receiver(post_delete, sender=Causa)
+@receiver(post_save, sender=Audiencia)
+@receiver(post_delete, sender=Audiencia)
+@receiver(post_save, sender=Documento)
+@receiver(post_delete, sender=Documento)
+@receiver(post_save, sender=Persona)
+@receiver(post_delete, sender=Persona)
+@receiver(creacion_masiva, sender=Causa)
+@receiver(actualizacion_masiva, sender=Causa)
+@receiver(creacion_masiva, sender=Audiencia)
+@receiver(actualizacion_masiva, sender=Audiencia)
+@receiver(creacion_masiva, sender=Documento)
+@receiver(actualizacion_masiva, sender=Documento)
+def invalidar_cache_dashboard_signal(sender, **kwargs):
+    """Marca como obsoletos los snapshots del dashboard."""
+    invalidar_cache_dashboard()
+
+
+@receiver(post_save, sender=Causa)
+@receiver(post_delete, sender=Causa)
+@receiver(creacion_masiva, sender=Causa)
+@receiver(actualizacion_masiva, sender=Causa)
+def invalidar_cache_reportes_signal(sender, **kwargs):
+    """Marca como obsoletos los agregados del reporte."""
+    invalidar_cache_reportes()
+
+
+@receiver(post_save, sender=Causa)
+@receiver(post_delete, sender=Causa)
+@receiver(post_save, sender=Audiencia)
+@receiver(post_delete, sender=Audiencia)
+@receiver(creacion_masiva, sender=Causa)
+@receiver(actualizacion_masiva, sender=Causa)
+@receiver(creacion_masiva, sender=Audiencia)
+@receiver(actualizacion_masiva, sender=Audiencia)
+def invalidar_cache_calendario_signal(sender, **kwargs):
+    """Marca como obsoletos los meses del calendario (muestran la carátula)."""
+    invalidar_cache_calendario()
+
+
+@receiver(post_save, sender=Persona)
+@receiver(post_delete, sender=Persona)
+def invalidar_cache_personas_signal(sender, **kwargs):
+    """Marca como obsoletos los resultados de autocompletado y búsqueda de personas."""
+    invalidar_cache_personas()
+
+
+@receiver(post_save, sender=Causa)
+@receiver(post_delete, sender=Causa)
+@receiver(creacion_masiva, sender=Causa)
+@receiver(actualizacion_masiva, sender=Causa)
+def invalidar_cache_causas_signal(sender, **kwargs):
+    """Marca como obsoletos los resultados de autocompletado y búsqueda de causas."""
+    invalidar_cache_causas()
+
+
+@receiver(post_save, sender=Documento)
+@receiver(post_delete, sender=Documento)
+@receiver(creacion_masiva, sender=Documento)
+@receiver(actualizacion_masiva, sender=Documento)
+def invalidar_cache_documentos_signal(sender, **kwargs):
+    """Marca como obsoletos los resultados de búsqueda y conteos de documentos."""
+    invalidar_cache_documentos()
+
+
+@receiver(post_save, sender=Audiencia)
+@receiver(post_delete, sender=Audiencia)
+@receiver(creacion_masiva, sender=Audiencia)
+@receiver(actualizacion_masiva, sender=Audiencia)
+def invalidar_cache_audiencias_signal(sender, **kwargs):
+    """Marca como obsoletos los conteos de audiencias."""
+    invalidar_cache_audiencias()
+
+
+@receiver(post_save, sender=Consentimiento)
+@receiver(post_delete, sender=Consentimiento)
+def invalidar_cache_consentimientos_signal(sender, **kwargs):
+    """Marca como obsoletos los conteos de consentimientos."""
+    invalidar_cache_consentimientos()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Perfil)
+@receiver(post_delete, sender=Perfil)
+def invalidar_cache_usuarios_signal(sender, update_fields=None, **kwargs):
+    """Marca como obsoletos los conteos de usuarios."""
+    # El login solo actualiza last_login: no cambia los filtros del listado
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidar_cache_usuarios()
+
+
+# =============================================================================
+# SIGNALS PARA EL ÍNDICE DE BÚSQUEDA
+# =============================================================================
+
+TIPOS_BUSQUEDA = {Causa: 'causa', Persona: 'persona', Documento: 'documento'}
+
+
+@receiver(post_save, sender=Causa)
+@receiver(post_save, sender=Persona)
+@receiver(post_save, sender=Documento)
+def indexar_busqueda_signal(sender, instance, **kwargs):
+    """Actualiza el objeto en el índice de búsqueda."""
+    tipo = TIPOS_BUSQUEDA[sender]
+    busqueda.indexar(tipo, [instance], extra=extraccion.textos_indexables(tipo, [instance]))
+
+
+@receiver(creacion_masiva, sender=Causa)
+@receiver(actualizacion_masiva, sender=Causa)
+@receiver(creacion_masiva, sender=Documento)
+@receiver(actualizacion_masiva, sender=Documento)
+def indexar_busqueda_masiva_signal(sender, instancias, **kwargs):
+    """Actualiza en el índice los objetos de una operación masiva."""
+    tipo = TIPOS_BUSQUEDA[sender]
+    busqueda.indexar(tipo, instancias, extra=extraccion.textos_indexables(tipo, instancias))
+
+
+@receiver(post_delete, sender=Causa)
+@receiver(post_delete, sender=Persona)
+@receiver(post_delete, sender=Documento)
+def desindexar_busqueda_signal(sender, instance, **kwargs):
+    """Quita el objeto eliminado del índice de búsqueda."""
+    busqueda.desindexar(TIPOS_BUSQUEDA[sender], instance.pk)
+
+
+@receiver(post_save, sender=Persona)
+def indexar_trigramas_signal(sender, instance, created, **kwargs):
+    """Actualiza los trigramas del nombre si la persona es nueva o lo cambió."""
+    cambios = None if created else instance.obtener_cambios()
+    if cambios is not None and not {'nombres', 'apellidos'} & set(cambios[1]):
+        return
+    similitud.indexar_personas([instance])
+
+
+# =============================================================================
+# SIGNALS PARA LOS CONTADORES DE FILAS (ver conteos.py)
+# =============================================================================
+
+@receiver(post_save, sender=Persona)
+@receiver(post_save, sender=Causa)
+@receiver(post_save, sender=Audiencia)
+@receiver(post_save, sender=Documento)
+@receiver(post_save, sender=Consentimiento)
+@receiver(post_save, sender=User)
+def sumar_contador_signal(sender, created, **kwargs):
+    """Suma la fila creada al contador de su tabla."""
+    if created:
+        conteos.ajustar_contador(sender, 1)
+
+
+@receiver(creacion_masiva, sender=Causa)
+@receiver(creacion_masiva, sender=Audiencia)
+@receiver(creacion_masiva, sender=Documento)
+def sumar_contador_masivo_signal(sender, instancias, **kwargs):
+    """Suma las filas de una creación masiva al contador de su tabla."""
+    conteos.ajustar_contador(sender, len(instancias))
+
+
+@receiver(post_delete, sender=Persona)
+@receiver(post_delete, sender=Causa)
+@receiver(post_delete, sender=Audiencia)
+@receiver(post_delete, sender=Documento)
+@receiver(post_delete, sender=Consentimiento)
+@receiver(post_delete, sender=User)
+def restar_contador_signal(sender, **kwargs):
+    """Resta la fila eliminada del contador de su tabla."""
+    conteos.ajustar_contador(sender, -1)
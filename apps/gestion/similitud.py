@@ -0,0 +1,191 @@
+"""
+Búsqueda de personas por similitud de nombre
+Cumple con ISO/IEC 25010 - Eficiencia de Desempeño y Usabilidad
+
+icontains no tolera errores de escritura ("Gonzales" no encuentra
+"González") y recorre la tabla completa. Cada nombre se guarda como el
+conjunto de sus trigramas (tres letras seguidas, sin tildes ni
+mayúsculas) en TrigramaPersona, con un índice por trigrama:
+
+- Buscar es leer del índice las personas que comparten trigramas con la
+  consulta y agruparlas: no se recorre la tabla de personas.
+- La similitud es la fracción de trigramas de la consulta presentes en
+  el nombre; a igual similitud gana el nombre más parecido en largo.
+"""
+
+import math
+import re
+import unicodedata
+
+from django.db.models import Case, Count, IntegerField, When
+
+from .models import TrigramaPersona
+
+
+# Fracción mínima de trigramas de la consulta presentes en el nombre
+UMBRAL = 0.5
+
+# Personas que se evalúan como máximo (las con más trigramas en común)
+MAX_CANDIDATOS = 200
+
+
+# =============================================================================
+# TRIGRAMAS
+# =============================================================================
+
+def plegar(texto):
+    """Minúsculas sin tildes, con solo letras, dígitos y espacios."""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', ' ', sin_tildes.lower()).strip()
+
+
+def trigramas(texto):
+    """
+    Trigramas de cada palabra, con dos espacios al inicio y uno al final
+    (como pg_trgm): 'ana' -> {'  a', ' an', 'ana', 'na '}.
+    """
+    resultado = set()
+    for palabra in plegar(texto).split():
+        palabra = f'  {palabra} '
+        resultado.update(palabra[i:i + 3] for i in range(len(palabra) - 2))
+    return resultado
+
+
+def nombre_persona(persona):
+    return f'{persona.nombres} {persona.apellidos}'
+
+
+# =============================================================================
+# MANTENCIÓN DEL ÍNDICE
+# =============================================================================
+
+def indexar_personas(personas, modelo=TrigramaPersona):
+    """
+    Reemplaza los trigramas de las personas indicadas.
+
+    Args:
+        personas: Instancias de Persona (con nombres y apellidos)
+        modelo: Modelo de trigramas (acepta el histórico de una migración)
+    """
+    personas = list(personas)
+    if not personas:
+        return
+    modelo.objects.filter(persona_id__in=[persona.pk for persona in personas]).delete()
+    modelo.objects.bulk_create([
+        modelo(persona_id=persona.pk, trigrama=trigrama)
+        for persona in personas
+        for trigrama in trigramas(nombre_persona(persona))
+    ], batch_size=2000)
+
+
+def reconstruir_trigramas(modelo_persona, modelo=TrigramaPersona, lote=1000):
+    """
+    Regenera los trigramas de todas las personas.
+
+    Returns:
+        int: Personas indexadas
+    """
+    modelo.objects.all().delete()
+    total = 0
+    personas = modelo_persona._default_manager.order_by().only('id', 'nombres', 'apellidos')
+    grupo = []
+    for persona in personas.iterator(chunk_size=lote):
+        grupo.append(persona)
+        if len(grupo) >= lote:
+            indexar_personas(grupo, modelo)
+            total += len(grupo)
+            grupo = []
+    indexar_personas(grupo, modelo)
+    return total + len(grupo)
+
+
+# =============================================================================
+# CONSULTA
+# =============================================================================
+
+def puntuar(consulta, umbral=UMBRAL):
+    """
+    Personas parecidas a la consulta, de la más a la menos similar.
+
+    Returns:
+        list: Tuplas (persona_id, similitud); vacía si la consulta no tiene
+              letras ni dígitos
+    """
+    buscados = trigramas(consulta)
+    if not buscados:
+        return []
+    minimo = max(1, math.ceil(umbral * len(buscados)))
+
+    comunes = dict(
+        TrigramaPersona.objects.filter(trigrama__in=buscados)
+        .values_list('persona_id')
+        .annotate(comunes=Count('id'))
+        .filter(comunes__gte=minimo)
+        .order_by('-comunes')[:MAX_CANDIDATOS]
+    )
+    if not comunes:
+        return []
+    totales = dict(
+        TrigramaPersona.objects.filter(persona_id__in=comunes)
+        .values_list('persona_id')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+
+    puntajes = []
+    for persona_id, n_comunes in comunes.items():
+        similitud = n_comunes / len(buscados)
+        # Desempate: proporción de trigramas compartidos sobre la unión
+        jaccard = n_comunes / (len(buscados) + totales[persona_id] - n_comunes)
+        puntajes.append((similitud, jaccard, persona_id))
+    puntajes.sort(reverse=True)
+    return [(persona_id, round(similitud, 3)) for similitud, _, persona_id in puntajes]
+
+
+def buscar_similares(consulta, queryset, limite=20, umbral=UMBRAL):
+    """
+    Personas con nombre similar a la consulta.
+
+    Args:
+        consulta: Texto ingresado (nombre, apellido o ambos, con errores)
+        queryset: QuerySet de Persona del que se toman los resultados
+        limite: Máximo de personas a retornar
+        umbral: Similitud mínima (0 a 1)
+
+    Returns:
+        list: Personas ordenadas por similitud, con el atributo `similitud`
+    """
+    puntajes = puntuar(consulta, umbral)
+    personas = queryset.in_bulk([persona_id for persona_id, _ in puntajes])
+    resultado = []
+    for persona_id, similitud in puntajes:
+        persona = personas.get(persona_id)
+        if persona is not None:
+            persona.similitud = similitud
+            resultado.append(persona)
+            if len(resultado) >= limite:
+                break
+    return resultado
+
+
+def filtrar_similares(queryset, consulta, umbral=UMBRAL):
+    """
+    Filtra un queryset de Persona por similitud y lo ordena de la más a la
+    menos similar (hasta MAX_CANDIDATOS). Útil para paginarlo.
+
+    Returns:
+        tuple: (QuerySet, acotado); acotado indica que hubo al menos
+               MAX_CANDIDATOS candidatos y pueden faltar personas
+    """
+    puntajes = puntuar(consulta, umbral)
+    if not puntajes:
+        return queryset.none(), False
+    orden = Case(
+        *[When(pk=persona_id, then=posicion) for posicion, (persona_id, _) in enumerate(puntajes)],
+        output_field=IntegerField(),
+    )
+    return (
+        queryset.filter(pk__in=[persona_id for persona_id, _ in puntajes]).order_by(orden),
+        len(puntajes) >= MAX_CANDIDATOS,
+    )
@@ -0,0 +1,68 @@
+"""
+Utilidades comunes de los tests de gestión
+"""
+
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from apps.gestion.cache_utils import limpiar_l1
+from apps.gestion.contexto import ContextoRequest, _contexto
+from apps.gestion.models import Causa, EstadoCausa, Materia, Tribunal
+
+
+# Caché en memoria: los tests no escriben en el directorio de caché del proyecto
+CACHE_TESTS = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests-gestion',
+    },
+    'consultas': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests-gestion-consultas',
+    },
+}
+
+
+def limpiar_caches():
+    """Vacía todos los alias de caché y el L1 del proceso."""
+    for alias in CACHE_TESTS:
+        caches[alias].clear()
+    limpiar_l1()
+
+
+@contextmanager
+def en_request(request=None):
+    """Abre un contexto de request como lo hace ContextoRequestMiddleware."""
+    contexto = ContextoRequest(request)
+    token = _contexto.set(contexto)
+    try:
+        yield contexto
+    finally:
+        _contexto.reset(token)
+
+
+@override_settings(CACHES=CACHE_TESTS)
+class PruebaGestion(TestCase):
+    """TestCase con catálogos cargados y caché vacío en cada test."""
+
+    fixtures = ['estados_causa', 'materias', 'tribunales', 'tipos_documento']
+
+    def setUp(self):
+        limpiar_caches()
+
+    @staticmethod
+    def crear_usuario(username, rol='ADMIN', **campos):
+        usuario = User.objects.create_user(username=username, password='clave-segura-123', **campos)
+        usuario.perfil.rol = rol
+        usuario.perfil.save()
+        return usuario
+
+    @staticmethod
+    def crear_causa(caratula='Pérez con González', responsable=None, **campos):
+        campos.setdefault('estado', EstadoCausa.objects.first())
+        campos.setdefault('materia', Materia.objects.first())
+        campos.setdefault('tribunal', Tribunal.objects.first())
+        return Causa.objects.create(caratula=caratula, responsable=responsable, **campos)
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.gestion.auditoria import calcular_estadisticas_logs, paginar_logs
+from apps.gestion.models import LogAuditoria, LogAuditoriaArchivo
+
+from .base import PruebaGestion
+
+
+class PaginacionAuditoriaTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        self.usuario = self.crear_usuario('admin')
+        LogAuditoria.objects.all().delete()
+        # 12 logs en 4 fechas: 3 por fecha, para que el id desempate
+        LogAuditoria.objects.bulk_create(
+            LogAuditoria(usuario=self.usuario, accion='VER', modelo='CAUSA', objeto_id=i)
+            for i in range(12)
+        )
+        ahora = timezone.now()
+        for indice, log in enumerate(LogAuditoria.objects.order_by('id')):
+            LogAuditoria.objects.filter(pk=log.pk).update(fecha=ahora - timedelta(hours=indice // 3))
+        self.orden = list(LogAuditoria.objects.order_by('-fecha', '-id').values_list('id', flat=True))
+
+    def recorrer(self, por_pagina):
+        paginas = [paginar_logs(por_pagina)]
+        while paginas[-1].has_next():
+            paginas.append(paginar_logs(por_pagina, despues=paginas[-1].cursor_siguiente))
+        return paginas
+
+    def test_avanzar_recorre_todos_los_logs_una_vez(self):
+        paginas = self.recorrer(5)
+
+        self.assertEqual([len(pagina) for pagina in paginas], [5, 5, 2])
+        self.assertEqual([log.pk for pagina in paginas for log in pagina], self.orden)
+        self.assertFalse(paginas[0].has_previous())
+
+    def test_retroceder_devuelve_la_pagina_anterior(self):
+        paginas = self.recorrer(5)
+
+        anterior = paginar_logs(5, antes=paginas[2].cursor_anterior)
+        self.assertEqual([log.pk for log in anterior], [log.pk for log in paginas[1]])
+        primera = paginar_logs(5, antes=anterior.cursor_anterior)
+        self.assertEqual([log.pk for log in primera], self.orden[:5])
+        self.assertFalse(primera.has_previous())
+
+    def test_cursor_no_valido_muestra_la_primera_pagina(self):
+        pagina = paginar_logs(5, despues='no-es-un-cursor')
+
+        self.assertEqual([log.pk for log in pagina], self.orden[:5])
+
+    def archivar_log(self):
+        hace_un_anio = timezone.now() - timedelta(days=365)
+        LogAuditoriaArchivo.objects.create(
+            id=10_000, usuario=self.usuario, accion='VER', modelo='CAUSA',
+            fecha=hace_un_anio, particion=hace_un_anio.strftime('%Y-%m')
+        )
+        return hace_un_anio.date()
+
+    def test_incluye_el_archivo_si_el_filtro_llega_hasta_el(self):
+        archivado = self.archivar_log()
+
+        sin_filtro = [log.pk for log in paginar_logs(20)]
+        reciente = (timezone.localdate() - timedelta(days=30)).isoformat()
+        solo_activos = [log.pk for log in paginar_logs(20, fecha_desde=reciente)]
+        desde = (archivado - timedelta(days=1)).isoformat()
+        con_archivo = [log.pk for log in paginar_logs(20, fecha_desde=desde)]
+
+        self.assertEqual(sin_filtro, self.orden + [10_000])
+        self.assertEqual(solo_activos, self.orden)
+        self.assertEqual(con_archivo, self.orden + [10_000])
+
+    def test_fecha_hasta_anterior_a_la_ventana_consulta_el_archivo(self):
+        archivado = self.archivar_log()
+        hasta = (archivado + timedelta(days=1)).isoformat()
+
+        self.assertEqual([log.pk for log in paginar_logs(20, fecha_hasta=hasta)], [10_000])
+        self.assertEqual(calcular_estadisticas_logs(fecha_hasta=hasta)['total'], 1)
+
+    def test_vista_pagina_por_cursor(self):
+        LogAuditoria.objects.bulk_create(
+            LogAuditoria(usuario=self.usuario, accion='VER', modelo='PERSONA', objeto_id=i)
+            for i in range(20)
+        )
+        self.client.force_login(self.usuario)
+        url = reverse('gestion:auditoria_lista')
+        primera = self.client.get(url).context['page_obj']
+        orden = list(LogAuditoria.objects.order_by('-fecha', '-id').values_list('id', flat=True))
+
+        respuesta = self.client.get(url, {'despues': primera.cursor_siguiente})
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual([log.pk for log in primera], orden[:25])
+        self.assertEqual([log.pk for log in respuesta.context['page_obj']], orden[25:50])
@@ -0,0 +1,52 @@
+from django.test import TransactionTestCase, override_settings
+
+from apps.gestion.buscador import SECCIONES, buscar_en_secciones
+from apps.gestion.cache_utils import (
+    ESTADO_REQUEST,
+    NS_PERSONAS,
+    aplicar_invalidaciones_request,
+    combinar_estado_request,
+    get_generacion,
+    invalidar_namespace,
+)
+from apps.gestion.contexto import ContextoRequest, ejecutar_en_contexto
+from apps.gestion.models import Persona
+
+from .base import CACHE_TESTS, PruebaGestion, en_request, limpiar_caches
+
+
+# Sin transacción abierta: las secciones se buscan en hilos
+@override_settings(CACHES=CACHE_TESTS)
+class BusquedaParalelaTests(TransactionTestCase):
+
+    fixtures = PruebaGestion.fixtures
+
+    def setUp(self):
+        limpiar_caches()
+        self.usuario = PruebaGestion.crear_usuario('admin')
+
+    def test_los_hilos_no_modifican_los_datos_del_request(self):
+        causa = PruebaGestion.crear_causa('Pérez con González')
+        persona = Persona.objects.create(run='12.345.678-5', nombres='Ana', apellidos='González')
+
+        with en_request() as contexto:
+            resultados = buscar_en_secciones(self.usuario, 'gonzalez', {}, SECCIONES)
+            # Las generaciones que leyeron los hilos quedaron en sus propios contextos
+            self.assertIsNone(contexto.obtener(ESTADO_REQUEST))
+
+        self.assertEqual([objeto.pk for objeto in resultados['causas']], [causa.pk])
+        self.assertEqual([objeto.pk for objeto in resultados['personas']], [persona.pk])
+        self.assertEqual(list(resultados['documentos']), [])
+
+    def test_las_invalidaciones_de_un_hilo_se_aplican_con_el_request(self):
+        anterior = get_generacion(NS_PERSONAS)
+
+        with en_request() as contexto:
+            hilo = ContextoRequest(contexto.request)
+            ejecutar_en_contexto(hilo, invalidar_namespace, NS_PERSONAS)
+            combinar_estado_request(hilo)
+
+            self.assertEqual(contexto.obtener(ESTADO_REQUEST)['pendientes'], {NS_PERSONAS})
+            aplicar_invalidaciones_request()
+
+        self.assertNotEqual(get_generacion(NS_PERSONAS), anterior)
@@ -0,0 +1,212 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache, caches
+from django.db import transaction
+
+from apps.gestion import cache_utils
+from apps.gestion.cache_utils import (
+    CACHE_CONSULTAS,
+    CACHE_KEY_BLOQUEO,
+    CACHE_KEY_GENERACION,
+    NS_CAUSAS,
+    NS_PERSONAS,
+    adquirir_bloqueo,
+    aplicar_invalidaciones_request,
+    get_generacion,
+    invalidar_namespace,
+    liberar_bloqueo,
+    obtener_o_calcular,
+)
+
+from .base import PruebaGestion, en_request
+
+
+class ContadorCalculos:
+    """Función de cálculo que registra cuántas veces se ejecutó."""
+
+    def __init__(self, valor='valor'):
+        self.valor = valor
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        return f'{self.valor}-{self.llamadas}'
+
+
+class GeneracionesTests(PruebaGestion):
+
+    def test_invalidar_cambia_la_generacion_al_confirmar(self):
+        anterior = get_generacion(NS_PERSONAS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidar_namespace(NS_PERSONAS)
+            self.assertEqual(get_generacion(NS_PERSONAS), anterior)
+
+        self.assertNotEqual(get_generacion(NS_PERSONAS), anterior)
+
+    def test_rollback_descarta_la_invalidacion(self):
+        anterior = get_generacion(NS_PERSONAS)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    invalidar_namespace(NS_PERSONAS)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_generacion(NS_PERSONAS), anterior)
+
+    def test_invalidar_un_namespace_no_afecta_a_otros(self):
+        causas = get_generacion(NS_CAUSAS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidar_namespace(NS_PERSONAS)
+
+        self.assertEqual(get_generacion(NS_CAUSAS), causas)
+
+    def test_dentro_de_un_request_se_aplica_una_vez_al_terminar(self):
+        anterior = get_generacion(NS_PERSONAS)
+
+        with en_request():
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidar_namespace(NS_PERSONAS)
+                invalidar_namespace(NS_PERSONAS)
+            # Pendiente: otros procesos siguen viendo la generación anterior
+            self.assertEqual(
+                cache.get(CACHE_KEY_GENERACION.format(namespace=NS_PERSONAS)), anterior
+            )
+            aplicar_invalidaciones_request()
+
+        self.assertNotEqual(get_generacion(NS_PERSONAS), anterior)
+
+    def test_el_request_que_modifica_lee_la_generacion_nueva(self):
+        calcular = ContadorCalculos()
+
+        with en_request():
+            self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60), 'valor-1')
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidar_namespace(NS_PERSONAS)
+            self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60), 'valor-2')
+            aplicar_invalidaciones_request()
+
+    def test_invalidar_recalcula_las_entradas_del_namespace(self):
+        personas = ContadorCalculos('personas')
+        causas = ContadorCalculos('causas')
+        obtener_o_calcular('prueba:personas', NS_PERSONAS, personas, 60)
+        obtener_o_calcular('prueba:causas', NS_CAUSAS, causas, 60)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidar_namespace(NS_PERSONAS)
+
+        self.assertEqual(obtener_o_calcular('prueba:personas', NS_PERSONAS, personas, 60), 'personas-2')
+        self.assertEqual(obtener_o_calcular('prueba:causas', NS_CAUSAS, causas, 60), 'causas-1')
+
+
+class CalculoUnicoTests(PruebaGestion):
+
+    def test_reutiliza_el_valor_vigente(self):
+        calcular = ContadorCalculos()
+
+        self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60), 'valor-1')
+        self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60), 'valor-1')
+        self.assertEqual(calcular.llamadas, 1)
+
+    def test_recalcula_al_vencer(self):
+        calcular = ContadorCalculos()
+
+        obtener_o_calcular('prueba', NS_PERSONAS, calcular, 0)
+        self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 0), 'valor-2')
+
+    def test_con_el_calculo_en_curso_entrega_el_valor_anterior(self):
+        calcular = ContadorCalculos()
+        obtener_o_calcular('prueba', NS_PERSONAS, calcular, 0)
+
+        bloqueo = CACHE_KEY_BLOQUEO.format(clave='prueba')
+        token = adquirir_bloqueo(bloqueo, 30)
+        try:
+            self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 0), 'valor-1')
+        finally:
+            liberar_bloqueo(bloqueo, token)
+        self.assertEqual(calcular.llamadas, 1)
+
+    def test_sin_valor_anterior_espera_al_calculo_en_curso(self):
+        calcular = ContadorCalculos()
+        bloqueo = CACHE_KEY_BLOQUEO.format(clave='prueba')
+        token = adquirir_bloqueo(bloqueo, 30)
+
+        def otro_proceso():
+            time.sleep(0.2)
+            cache_utils._guardar(
+                'prueba', NS_PERSONAS, get_generacion(NS_PERSONAS), lambda: 'calculado', 60, False
+            )
+            liberar_bloqueo(bloqueo, token)
+
+        hilo = threading.Thread(target=otro_proceso)
+        hilo.start()
+        try:
+            self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60), 'calculado')
+        finally:
+            hilo.join()
+        self.assertEqual(calcular.llamadas, 0)
+
+    def test_calcula_si_el_bloqueo_no_se_libera_a_tiempo(self):
+        calcular = ContadorCalculos()
+        bloqueo = CACHE_KEY_BLOQUEO.format(clave='prueba')
+        adquirir_bloqueo(bloqueo, 30)
+
+        with mock.patch.object(cache_utils, 'CALCULO_ESPERA_MAXIMA', 0.1):
+            self.assertEqual(obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60), 'valor-1')
+
+    def test_llamadas_simultaneas_calculan_una_vez(self):
+        llamadas = []
+
+        def calcular():
+            llamadas.append(1)
+            time.sleep(0.2)
+            return 'valor'
+
+        resultados = []
+        hilos = [
+            threading.Thread(
+                target=lambda: resultados.append(
+                    obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60)
+                )
+            )
+            for _ in range(5)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(resultados, ['valor'] * 5)
+        self.assertEqual(len(llamadas), 1)
+
+    def test_el_bloqueo_solo_lo_libera_quien_lo_tomo(self):
+        bloqueo = CACHE_KEY_BLOQUEO.format(clave='prueba')
+        token = adquirir_bloqueo(bloqueo, 30)
+
+        self.assertIsNone(adquirir_bloqueo(bloqueo, 30))
+        liberar_bloqueo(bloqueo, 'otro-token')
+        self.assertIsNone(adquirir_bloqueo(bloqueo, 30))
+        liberar_bloqueo(bloqueo, token)
+        self.assertIsNotNone(adquirir_bloqueo(bloqueo, 30))
+
+    def test_los_resultados_por_consulta_se_desalojan_sin_tocar_las_generaciones(self):
+        calcular = ContadorCalculos()
+        obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60, alias=CACHE_CONSULTAS)
+        generacion = cache.get(CACHE_KEY_GENERACION.format(namespace=NS_PERSONAS))
+
+        self.assertIsNone(cache.get('prueba'))
+        self.assertIsNotNone(caches[CACHE_CONSULTAS].get('prueba'))
+
+        caches[CACHE_CONSULTAS].clear()
+
+        self.assertEqual(cache.get(CACHE_KEY_GENERACION.format(namespace=NS_PERSONAS)), generacion)
+        self.assertEqual(
+            obtener_o_calcular('prueba', NS_PERSONAS, calcular, 60, alias=CACHE_CONSULTAS), 'valor-2'
+        )
@@ -0,0 +1,37 @@
+from django.core.exceptions import ValidationError
+
+from apps.gestion.catalogos import TribunalChoiceField, get_tribunales
+from apps.gestion.models import Tribunal
+
+from .base import PruebaGestion
+
+
+class CatalogoChoiceFieldTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        self.campo = TribunalChoiceField(Tribunal.objects.all())
+        self.tribunal = get_tribunales().objetos[0]
+
+    def test_valida_contra_el_snapshot_sin_consultar_la_bd(self):
+        with self.assertNumQueries(0):
+            valor = self.campo.clean(str(self.tribunal.pk))
+
+        self.assertEqual(valor.pk, self.tribunal.pk)
+        self.assertEqual(valor.nombre, self.tribunal.nombre)
+
+    def test_cada_llamada_entrega_una_instancia_propia(self):
+        primero = self.campo.clean(str(self.tribunal.pk))
+        segundo = self.campo.clean(str(self.tribunal.pk))
+
+        self.assertIsNot(primero, segundo)
+        self.assertIsNot(primero, get_tribunales().get(self.tribunal.pk))
+        primero.nombre = 'Modificado en un request'
+        self.assertNotEqual(get_tribunales().get(self.tribunal.pk).nombre, primero.nombre)
+
+    def test_id_fuera_del_snapshot_se_resuelve_en_la_bd(self):
+        inactivo = Tribunal.objects.create(nombre='Tribunal cerrado', ciudad='Temuco', activo=False)
+
+        self.assertEqual(self.campo.clean(str(inactivo.pk)), inactivo)
+        with self.assertRaises(ValidationError):
+            self.campo.clean('999999')
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from apps.gestion import conteos
+from apps.gestion.conteos import contar, recalcular_contadores
+from apps.gestion.models import ContadorTabla, Persona
+
+from .base import PruebaGestion
+
+
+class ConteosTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        recalcular_contadores()
+
+    def crear_persona(self, indice, **campos):
+        return Persona.objects.create(
+            run=f'{10_000_000 + indice}-{indice % 10}', nombres=f'Persona {indice}',
+            apellidos='Prueba', **campos
+        )
+
+    def filas(self):
+        return ContadorTabla.objects.get(pk=Persona._meta.db_table).filas
+
+    def test_queryset_vacio(self):
+        conteo = contar(Persona.objects.none())
+
+        self.assertEqual((conteo.total, conteo.aproximado), (0, False))
+
+    def test_altas_y_bajas_ajustan_el_contador(self):
+        inicial = self.filas()
+        personas = [self.crear_persona(indice) for indice in range(3)]
+        self.assertEqual(self.filas(), inicial + 3)
+
+        personas[0].delete()
+        self.assertEqual(self.filas(), inicial + 2)
+
+    def test_recalcular_corrige_el_contador(self):
+        self.crear_persona(1)
+        ContadorTabla.objects.filter(pk=Persona._meta.db_table).update(filas=999)
+
+        recalcular_contadores()
+
+        self.assertEqual(self.filas(), Persona.objects.count())
+
+    def test_tabla_grande_sin_filtros_usa_el_contador(self):
+        self.crear_persona(1)
+        ContadorTabla.objects.filter(pk=Persona._meta.db_table).update(filas=80_000)
+
+        with mock.patch.object(conteos, 'UMBRAL_APROXIMADO', 50_000):
+            sin_filtros = contar(Persona.objects.all())
+            con_filtros = contar(Persona.objects.filter(nombres='Persona 1'))
+
+        self.assertEqual((sin_filtros.total, sin_filtros.aproximado), (80_000, True))
+        self.assertEqual((con_filtros.total, con_filtros.aproximado), (1, False))
+
+    def test_conteo_en_cache_vence_al_modificar_la_tabla(self):
+        self.crear_persona(1)
+        activas = Persona.objects.filter(activo=True)
+        self.assertEqual(contar(activas).total, 1)
+
+        # Escrituras que no envían signals: el conteo en caché se mantiene
+        Persona.objects.filter(activo=True).update(apellidos='Sin señal')
+        Persona.objects.bulk_create([Persona(run='20.000.000-1', nombres='Otra', apellidos='Prueba')])
+        self.assertEqual(contar(activas).total, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crear_persona(2)
+        self.assertEqual(contar(activas).total, 3)
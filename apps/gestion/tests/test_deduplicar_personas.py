@@ -0,0 +1,60 @@
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+
+from apps.gestion.models import CausaPersona, Consentimiento, LogAuditoria, Persona
+
+from .base import PruebaGestion
+
+
+migracion_run = import_module('apps.gestion.migrations.0019_persona_run_normalizado')
+
+
+class PersonasDuplicadasTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        self.original = Persona.objects.create(run='12.345.678-5', nombres='Juan', apellidos='Pérez')
+        self.duplicada = Persona.objects.create(run='11.111.111-1', nombres='Juan', apellidos='Perez')
+        # Estado previo a la migración 0019: el mismo RUN con otro formato
+        Persona.objects.filter(pk=self.duplicada.pk).update(run='12345678-5', run_normalizado=None)
+
+    def test_la_migracion_falla_con_el_detalle_de_los_duplicados(self):
+        with self.assertRaisesMessage(
+            RuntimeError,
+            f'Persona {self.duplicada.pk} (RUN 12345678-5) repite el RUN de la persona {self.original.pk}'
+        ):
+            migracion_run.normalizar_runs(apps, None)
+
+    def test_sin_unir_solo_informa(self):
+        salida = StringIO()
+        call_command('deduplicar_personas', stdout=salida)
+
+        self.assertIn(f'duplicada: persona {self.duplicada.pk}', salida.getvalue())
+        self.assertTrue(Persona.objects.filter(pk=self.duplicada.pk).exists())
+
+    def test_unir_traspasa_las_relaciones_y_elimina_la_duplicada(self):
+        causa = self.crear_causa()
+        otra_causa = self.crear_causa('Soto con Fisco')
+        CausaPersona.objects.create(causa=causa, persona=self.original, rol_en_causa='DEMANDANTE')
+        CausaPersona.objects.create(causa=causa, persona=self.duplicada, rol_en_causa='DEMANDANTE')
+        CausaPersona.objects.create(causa=otra_causa, persona=self.duplicada, rol_en_causa='DEMANDANTE')
+        Consentimiento.objects.bulk_create([Consentimiento(persona=self.duplicada, tipo='DATOS_PERSONALES')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('deduplicar_personas', unir=True, stdout=StringIO())
+
+        self.assertFalse(Persona.objects.filter(pk=self.duplicada.pk).exists())
+        self.assertEqual(
+            sorted(CausaPersona.objects.filter(persona=self.original).values_list('causa_id', flat=True)),
+            sorted([causa.pk, otra_causa.pk])
+        )
+        self.assertEqual(Consentimiento.objects.get().persona_id, self.original.pk)
+        log = LogAuditoria.objects.get(accion='ELIMINAR', modelo='PERSONA', objeto_id=self.duplicada.pk)
+        self.assertEqual(log.datos_anteriores['run'], '12345678-5')
+
+        migracion_run.normalizar_runs(apps, None)
+        self.original.refresh_from_db()
+        self.assertEqual(self.original.run_normalizado, '123456785')
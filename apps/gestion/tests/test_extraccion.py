@@ -0,0 +1,45 @@
+from unittest import mock
+
+from apps.gestion import extraccion
+from apps.gestion.extractores import ExtractorNoDisponible, FormatoNoSoportado
+from apps.gestion.models import Documento, TextoDocumento, TipoDocumento
+
+from .base import PruebaGestion
+
+
+class ColaExtraccionTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        causa = self.crear_causa()
+        usuario = self.crear_usuario('admin')
+        self.pdf, self.zip = [
+            Documento.objects.create(
+                causa=causa, tipo=TipoDocumento.objects.first(), usuario=usuario,
+                titulo=f'Documento {archivo}', archivo=f'documentos/{archivo}'
+            )
+            for archivo in ('escrito.pdf', 'respaldo.zip')
+        ]
+        extraccion.encolar([self.pdf, self.zip])
+        extraccion.reservar(10)
+
+    def estado(self, documento):
+        return TextoDocumento.objects.get(pk=documento.pk).estado
+
+    def test_sin_biblioteca_queda_pendiente_de_instalarla(self):
+        extraccion.guardar_error(self.pdf.pk, ExtractorNoDisponible('pypdf no está instalado'))
+        extraccion.guardar_error(self.zip.pk, FormatoNoSoportado('Formato .zip no soportado'))
+
+        self.assertEqual(self.estado(self.pdf), 'SIN_EXTRACTOR')
+        self.assertEqual(self.estado(self.zip), 'NO_SOPORTADO')
+
+    def test_se_reencola_solo_si_la_biblioteca_ya_esta_instalada(self):
+        extraccion.guardar_error(self.pdf.pk, ExtractorNoDisponible('pypdf no está instalado'))
+
+        with mock.patch.object(extraccion, 'extensiones_sin_extractor', return_value=['.pdf']):
+            self.assertEqual(extraccion.reencolar_sin_extractor(), 0)
+        with mock.patch.object(extraccion, 'extensiones_sin_extractor', return_value=[]):
+            self.assertEqual(extraccion.reencolar_sin_extractor(), 1)
+
+        texto = TextoDocumento.objects.get(pk=self.pdf.pk)
+        self.assertEqual((texto.estado, texto.intentos), ('PENDIENTE', 0))
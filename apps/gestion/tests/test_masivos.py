@@ -0,0 +1,132 @@
+from django.db.models import F
+
+from apps.gestion.models import (
+    Causa,
+    CausaResumen,
+    EstadoCausa,
+    LogAuditoria,
+    actualizacion_masiva,
+    creacion_masiva,
+)
+from apps.gestion.resumenes import contar_causas
+
+from .base import PruebaGestion
+
+
+class SenalRecibida:
+    """Receptor que guarda los envíos de una señal mientras está conectado."""
+
+    def __init__(self, senal, sender):
+        self.senal = senal
+        self.sender = sender
+        self.envios = []
+
+    def __call__(self, sender, instancias, **kwargs):
+        self.envios.append([
+            (instancia.pk, instancia.obtener_cambios()) for instancia in instancias
+        ])
+
+    def __enter__(self):
+        self.senal.connect(self, sender=self.sender, weak=False)
+        return self
+
+    def __exit__(self, *args):
+        self.senal.disconnect(self, sender=self.sender)
+
+
+class OperacionesMasivasTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        self.estados = list(EstadoCausa.objects.order_by('pk')[:2])
+
+    def nuevas_causas(self, cantidad):
+        plantilla = self.crear_causa()
+        return [
+            Causa(
+                caratula=f'Causa masiva {indice}', estado=self.estados[0],
+                materia_id=plantilla.materia_id, tribunal_id=plantilla.tribunal_id
+            )
+            for indice in range(cantidad)
+        ]
+
+    def test_crear_masivo_registra_un_alta_por_objeto(self):
+        causas = self.nuevas_causas(3)
+        LogAuditoria.objects.all().delete()
+
+        with SenalRecibida(creacion_masiva, Causa) as senal:
+            creadas = Causa.objects.crear_masivo(causas)
+
+        pks = sorted(causa.pk for causa in creadas)
+        self.assertEqual(len(senal.envios), 1)
+        # Al recibir la señal los objetos ya tienen pk y sus valores capturados
+        self.assertEqual(sorted(pk for pk, _ in senal.envios[0]), pks)
+        self.assertTrue(all(cambios == ({}, {}) for _, cambios in senal.envios[0]))
+
+        logs = LogAuditoria.objects.filter(accion='CREAR', modelo='CAUSA')
+        self.assertEqual(sorted(logs.values_list('objeto_id', flat=True)), pks)
+        self.assertEqual(logs.get(objeto_id=pks[0]).datos_nuevos['caratula'], 'Causa masiva 0')
+
+    def test_crear_masivo_actualiza_el_resumen(self):
+        Causa.objects.crear_masivo(self.nuevas_causas(4))
+
+        self.assertEqual(contar_causas(), 5)
+        self.assertEqual(
+            contar_causas(estado=self.estados[0].pk),
+            Causa.objects.filter(estado=self.estados[0]).count()
+        )
+
+    def test_actualizar_auditado_registra_solo_los_cambios(self):
+        creadas = Causa.objects.crear_masivo(self.nuevas_causas(3))
+        sin_cambio = creadas[0]
+        Causa.objects.filter(pk=sin_cambio.pk).update(estado=self.estados[1])
+        LogAuditoria.objects.all().delete()
+
+        with SenalRecibida(actualizacion_masiva, Causa) as senal:
+            modificadas = Causa.objects.filter(
+                pk__in=[causa.pk for causa in creadas]
+            ).actualizar_auditado(estado=self.estados[1])
+
+        self.assertEqual(modificadas, 2)
+        recibidas = dict(senal.envios[0])
+        self.assertEqual(set(recibidas), {creadas[1].pk, creadas[2].pk})
+        # La señal recibe los valores anteriores y los nuevos
+        anteriores, nuevos = recibidas[creadas[1].pk]
+        self.assertEqual(anteriores['estado'], self.estados[0].pk)
+        self.assertEqual(nuevos['estado'], self.estados[1].pk)
+
+        logs = LogAuditoria.objects.filter(accion='EDITAR', modelo='CAUSA')
+        self.assertEqual(
+            sorted(logs.values_list('objeto_id', flat=True)), [creadas[1].pk, creadas[2].pk]
+        )
+        self.assertEqual(logs.first().datos_anteriores, {'estado': self.estados[0].pk})
+        self.assertEqual(Causa.objects.filter(estado=self.estados[1]).count(), 3)
+
+    def test_actualizar_auditado_sin_cambios_no_registra(self):
+        creadas = Causa.objects.crear_masivo(self.nuevas_causas(2))
+        LogAuditoria.objects.all().delete()
+
+        with SenalRecibida(actualizacion_masiva, Causa) as senal:
+            modificadas = Causa.objects.filter(
+                pk__in=[causa.pk for causa in creadas]
+            ).actualizar_auditado(estado=self.estados[0])
+
+        self.assertEqual(modificadas, 0)
+        self.assertEqual(senal.envios, [])
+        self.assertFalse(LogAuditoria.objects.exists())
+
+    def test_actualizar_auditado_traslada_los_conteos_del_resumen(self):
+        creadas = Causa.objects.crear_masivo(self.nuevas_causas(3))
+
+        Causa.objects.filter(pk__in=[causa.pk for causa in creadas]).actualizar_auditado(
+            estado=self.estados[1]
+        )
+
+        self.assertEqual(contar_causas(estado=self.estados[1].pk), 3)
+        self.assertEqual(
+            sum(CausaResumen.objects.values_list('total', flat=True)), Causa.objects.count()
+        )
+
+    def test_actualizar_auditado_no_admite_expresiones(self):
+        with self.assertRaises(ValueError):
+            Causa.objects.actualizar_auditado(caratula=F('rit'))
@@ -0,0 +1,82 @@
+import os
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+
+from apps.gestion import metricas_cache
+from apps.gestion.metricas_cache import (
+    CACHE_KEY_PROCESO,
+    CACHE_KEY_PROCESOS,
+    CACHE_KEY_PROCESOS_BLOQUEO,
+    obtener_metricas,
+    registrar_fallo,
+    registrar_relleno,
+    volcar_metricas,
+)
+
+from .base import PruebaGestion
+
+
+@override_settings(CACHE_METRICAS_MUESTREO=3)
+class MetricasCacheTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        metricas_cache._metricas.clear()
+        metricas_cache._pid = None
+
+    def test_el_tamano_se_mide_por_muestreo(self):
+        registrar_relleno('prueba', 0.01, 'x' * 2000)
+        registrar_relleno('prueba', 0.01, 'x' * 9000)
+        registrar_relleno('prueba', 0.01, 'x' * 9000)
+        registrar_relleno('prueba', 0.01, 'x' * 5000)
+        volcar_metricas()
+
+        metricas = obtener_metricas()[0]['prueba']
+        self.assertEqual(metricas['rellenos'], 4)
+        # Medidos el primero y el cuarto
+        self.assertLess(metricas['bytes_max'], 9000)
+        self.assertGreaterEqual(metricas['bytes'], 5000)
+
+    def test_cada_proceso_vuelca_en_su_propia_clave(self):
+        pid = os.getpid()
+        registrar_fallo('prueba')
+        volcar_metricas()
+
+        # Un worker bifurcado después de importar el módulo
+        with mock.patch.object(metricas_cache.os, 'getpid', return_value=pid + 1):
+            volcar_metricas()
+            metricas, procesos = obtener_metricas()
+            self.assertEqual((metricas['prueba']['fallos'], procesos), (1, 1))
+
+            registrar_fallo('prueba')
+            registrar_fallo('prueba')
+            volcar_metricas()
+
+        metricas, procesos = obtener_metricas()
+        self.assertEqual(procesos, 2)
+        self.assertEqual(metricas['prueba']['fallos'], 3)
+
+    def test_al_registrar_un_proceso_se_descartan_los_vencidos(self):
+        cache = caches[metricas_cache.CACHE_METRICAS]
+        vencido = CACHE_KEY_PROCESO.format(proceso='otro-host:1:0')
+        cache.set(CACHE_KEY_PROCESOS, {vencido}, None)
+
+        registrar_fallo('prueba')
+        volcar_metricas()
+
+        propia = CACHE_KEY_PROCESO.format(proceso=metricas_cache._proceso)
+        self.assertEqual(cache.get(CACHE_KEY_PROCESOS), {propia})
+
+    def test_con_el_conjunto_bloqueado_se_registra_en_el_proximo_volcado(self):
+        cache = caches[metricas_cache.CACHE_METRICAS]
+        cache.set(CACHE_KEY_PROCESOS_BLOQUEO, 'otro-proceso', 30)
+
+        registrar_fallo('prueba')
+        volcar_metricas()
+        self.assertEqual(obtener_metricas()[1], 0)
+
+        cache.delete(CACHE_KEY_PROCESOS_BLOQUEO)
+        volcar_metricas()
+        self.assertEqual(obtener_metricas()[1], 1)
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.gestion.models import Causa
+from apps.gestion.paginacion import DESPLAZAMIENTO, _codificar, paginar
+
+from .base import PruebaGestion
+
+
+class PaginarTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        # 11 causas en 4 fechas: la fecha se repite y el id desempata
+        ahora = timezone.now()
+        for indice in range(11):
+            causa = self.crear_causa(f'Causa {indice}')
+            Causa.objects.filter(pk=causa.pk).update(fecha_creacion=ahora - timedelta(days=indice // 3))
+        self.causas = Causa.objects.all()
+
+    def pks(self, pagina):
+        return [objeto.pk for objeto in pagina]
+
+    def recorrer(self, campo, por_pagina=4):
+        paginas = [paginar(self.causas, por_pagina, campo=campo)]
+        while paginas[-1].has_next():
+            paginas.append(paginar(self.causas, por_pagina, paginas[-1].cursor_siguiente, campo=campo))
+        return paginas
+
+    def test_avanzar_por_id(self):
+        paginas = self.recorrer('id')
+
+        orden = list(self.causas.order_by('-pk').values_list('pk', flat=True))
+        self.assertEqual([pk for pagina in paginas for pk in self.pks(pagina)], orden)
+        self.assertEqual([pagina.number for pagina in paginas], [1, 2, 3])
+        self.assertEqual((paginas[0].total, paginas[0].num_pages), (11, 3))
+        self.assertEqual((paginas[2].start_index(), paginas[2].end_index()), (9, 11))
+
+    def test_avanzar_con_fechas_repetidas(self):
+        paginas = self.recorrer('fecha_creacion')
+
+        orden = list(self.causas.order_by('-fecha_creacion', '-pk').values_list('pk', flat=True))
+        self.assertEqual([pk for pagina in paginas for pk in self.pks(pagina)], orden)
+
+    def test_retroceder_devuelve_la_pagina_anterior(self):
+        paginas = self.recorrer('fecha_creacion')
+
+        anterior = paginar(self.causas, 4, paginas[2].cursor_anterior, campo='fecha_creacion')
+        self.assertEqual(self.pks(anterior), self.pks(paginas[1]))
+        self.assertEqual(anterior.number, 2)
+        primera = paginar(self.causas, 4, anterior.cursor_anterior, campo='fecha_creacion')
+        self.assertEqual(self.pks(primera), self.pks(paginas[0]))
+        self.assertFalse(primera.has_previous())
+
+    def test_ultima_pagina(self):
+        primera = paginar(self.causas, 4, campo='fecha_creacion')
+
+        ultima = paginar(self.causas, 4, primera.cursor_ultima, campo='fecha_creacion')
+
+        self.assertEqual(self.pks(ultima), self.pks(self.recorrer('fecha_creacion')[2]))
+        self.assertEqual(ultima.number, 3)
+        self.assertFalse(ultima.has_next())
+        anterior = paginar(self.causas, 4, ultima.cursor_anterior, campo='fecha_creacion')
+        self.assertEqual(anterior.number, 2)
+
+    def test_cursor_no_valido_muestra_la_primera_pagina(self):
+        primera = paginar(self.causas, 4)
+        desplazamiento = paginar(self.causas.order_by('caratula'), 4, campo=None)
+
+        for cursor in ('no-es-un-cursor', 'W10', desplazamiento.cursor_siguiente):
+            pagina = paginar(self.causas, 4, cursor)
+            self.assertEqual((self.pks(pagina), pagina.number), (self.pks(primera), 1))
+
+    def test_desplazamiento_conserva_el_orden_del_queryset(self):
+        ordenadas = self.causas.order_by('caratula')
+        orden = list(ordenadas.values_list('pk', flat=True))
+
+        primera = paginar(ordenadas, 4, campo=None)
+        segunda = paginar(ordenadas, 4, primera.cursor_siguiente, campo=None)
+        ultima = paginar(ordenadas, 4, primera.cursor_ultima, campo=None)
+
+        self.assertEqual(self.pks(primera) + self.pks(segunda), orden[:8])
+        self.assertEqual((self.pks(ultima), ultima.number), (orden[8:], 3))
+        self.assertEqual(self.pks(paginar(ordenadas, 4, segunda.cursor_anterior, campo=None)), orden[:4])
+
+    def test_desplazamiento_fuera_de_rango_muestra_la_ultima_pagina(self):
+        ordenadas = self.causas.order_by('caratula')
+
+        pagina = paginar(ordenadas, 4, _codificar(DESPLAZAMIENTO, 40), campo=None)
+
+        self.assertEqual(pagina.number, 3)
+        self.assertEqual(self.pks(pagina), list(ordenadas.values_list('pk', flat=True))[8:])
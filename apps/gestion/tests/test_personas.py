@@ -0,0 +1,85 @@
+from django.urls import reverse
+
+from apps.gestion.busqueda import es_rut
+from apps.gestion.models import Persona
+
+from .base import PruebaGestion
+
+
+class BusquedaPersonasListaTests(PruebaGestion):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.crear_usuario('admin'))
+        self.gonzalez = Persona.objects.create(
+            run='12.345.678-5', nombres='María José', apellidos='González Soto',
+            email='mjgonzalez@ejemplo.cl', telefono='+56912345678'
+        )
+        self.li = Persona.objects.create(
+            run='9.876.543-3', nombres='Wei', apellidos='Li', email='wli@correo.cl'
+        )
+
+    def buscar(self, q, **params):
+        respuesta = self.client.get(reverse('gestion:personas_lista'), {'q': q, **params})
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta, [persona.pk for persona in respuesta.context['page_obj']]
+
+    def test_coincidencia_parcial_en_nombre(self):
+        respuesta, encontradas = self.buscar('onzál')
+
+        self.assertEqual(encontradas, [self.gonzalez.pk])
+        self.assertFalse(respuesta.context['similares'])
+
+    def test_fragmento_de_email(self):
+        self.assertEqual(self.buscar('ejemplo.c')[1], [self.gonzalez.pk])
+        self.assertEqual(self.buscar('wli@')[1], [self.li.pk])
+
+    def test_consulta_mas_corta_que_un_trigrama(self):
+        self.assertEqual(self.buscar('Li')[1], [self.li.pk])
+
+    def test_rut_con_y_sin_formato(self):
+        self.assertEqual(self.buscar('12.345.678-5')[1], [self.gonzalez.pk])
+        self.assertEqual(self.buscar('123456785')[1], [self.gonzalez.pk])
+        # Sin dígito verificador válido se busca como texto (índice del RUN normalizado)
+        self.assertEqual(self.buscar('12345678')[1], [self.gonzalez.pk])
+
+    def test_solo_un_rut_completo_y_valido_se_busca_como_rut(self):
+        self.assertTrue(es_rut('12.345.678-5'))
+        self.assertTrue(es_rut('9876543 - 3'))
+        self.assertFalse(es_rut('12.345.678-9'))
+        self.assertFalse(es_rut('12.345'))
+        self.assertFalse(es_rut('+56912345678'))
+
+    def test_numeros_que_no_son_rut_buscan_en_los_demas_campos(self):
+        numerada = Persona.objects.create(
+            run='15.555.555-6', nombres='Pedro', apellidos='Rojas', email='projas1234@correo.cl'
+        )
+
+        self.assertEqual(self.buscar('1234')[1], [numerada.pk])
+
+    def test_sin_tildes_busca_en_el_indice(self):
+        respuesta, encontradas = self.buscar('gonzalez maria')
+
+        self.assertEqual(encontradas, [self.gonzalez.pk])
+        self.assertFalse(respuesta.context['similares'])
+
+    def test_error_de_escritura_usa_nombres_parecidos(self):
+        respuesta, encontradas = self.buscar('Gonsales Soto')
+
+        self.assertEqual(encontradas, [self.gonzalez.pk])
+        self.assertTrue(respuesta.context['similares'])
+        self.assertContains(respuesta, 'se muestran nombres parecidos')
+
+    def test_filtro_por_tipo_se_aplica_antes_de_decidir(self):
+        Persona.objects.filter(pk=self.gonzalez.pk).update(tipo_persona='TESTIGO')
+
+        _, encontradas = self.buscar('González', tipo='ATENDIDO')
+
+        self.assertEqual(encontradas, [])
+
+    def test_busqueda_sin_resultados(self):
+        respuesta, encontradas = self.buscar('zzzzqqq')
+
+        self.assertEqual(encontradas, [])
+        self.assertTrue(respuesta.context['similares'])
+        self.assertEqual(respuesta.context['page_obj'].total, 0)
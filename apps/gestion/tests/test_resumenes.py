@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+
+from apps.gestion.models import CausaResumen
+from apps.gestion.resumenes import ajustar_resumen, contar_causas
+
+from .base import PruebaGestion
+
+
+class CausaResumenTests(PruebaGestion):
+
+    def test_alta_y_baja_de_causas_ajustan_el_resumen(self):
+        responsable = self.crear_usuario('estudiante', rol='ESTUDIANTE')
+        causa = self.crear_causa(responsable=responsable)
+        self.crear_causa()
+        self.crear_causa()
+
+        self.assertEqual(contar_causas(), 3)
+        self.assertEqual(contar_causas(responsable=responsable.pk), 1)
+
+        causa.delete()
+        self.assertEqual(contar_causas(), 2)
+        self.assertEqual(contar_causas(responsable=responsable.pk), 0)
+        # La fila queda en cero y la próxima alta la reutiliza
+        self.assertEqual(CausaResumen.objects.get(responsable=responsable).total, 0)
+        self.crear_causa(responsable=responsable)
+        self.assertEqual(CausaResumen.objects.get(responsable=responsable).total, 1)
+
+    def test_causas_sin_responsable_comparten_una_fila(self):
+        self.crear_causa()
+        self.crear_causa()
+
+        filas = CausaResumen.objects.filter(responsable__isnull=True)
+        self.assertEqual(filas.count(), 1)
+        self.assertEqual(filas.get().total, 2)
+
+    def test_no_admite_filas_duplicadas_sin_responsable(self):
+        causa = self.crear_causa()
+        dimensiones = {
+            'estado_id': causa.estado_id,
+            'materia_id': causa.materia_id,
+            'tribunal_id': causa.tribunal_id,
+            'responsable_id': None,
+        }
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CausaResumen.objects.create(total=1, **dimensiones)
+
+    def test_ajustar_resumen_suma_sobre_la_fila_existente(self):
+        causa = self.crear_causa()
+        ajustar_resumen((causa.estado_id, causa.materia_id, causa.tribunal_id, None), 2)
+
+        self.assertEqual(CausaResumen.objects.filter(responsable__isnull=True).get().total, 3)
+
+    def test_fila_creada_por_otro_proceso_recibe_el_incremento(self):
+        causa = self.crear_causa()
+        filtro = {
+            'estado_id': causa.estado_id,
+            'materia_id': causa.materia_id,
+            'tribunal_id': causa.tribunal_id,
+            'responsable_id': causa.responsable_id,
+        }
+        CausaResumen.objects.filter(**filtro).update(total=5)
+        actualizar = QuerySet.update
+        llamadas = []
+
+        def actualizar_sin_ver_la_fila(queryset, **campos):
+            # El primer UPDATE corre antes de que el otro proceso confirme su INSERT
+            llamadas.append(campos)
+            return 0 if len(llamadas) == 1 else actualizar(queryset, **campos)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=actualizar_sin_ver_la_fila):
+            ajustar_resumen(tuple(filtro.values()), 2)
+
+        self.assertEqual(len(llamadas), 2)
+        self.assertEqual(CausaResumen.objects.get(**filtro).total, 7)
+
+    def test_conflicto_sin_fila_que_actualizar_no_se_pierde_en_silencio(self):
+        causa = self.crear_causa()
+        CausaResumen.objects.all().delete()
+
+        with mock.patch.object(CausaResumen.objects, 'create', side_effect=IntegrityError), \
+                self.assertRaises(IntegrityError):
+            ajustar_resumen((causa.estado_id, causa.materia_id, causa.tribunal_id, None), 1)
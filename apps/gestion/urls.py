@@ -46,6 +46,7 @@ urlpatterns = [
     
     path('auditoria/', views.auditoria_lista, name='auditoria_lista'),
     path('auditoria/<int:pk>/', views.auditoria_detalle, name='auditoria_detalle'),
+    path('auditoria/exportar/', views.auditoria_exportar, name='auditoria_exportar'),
     
     path('calendario/', views.calendario, name='calendario'),
     
@@ -68,4 +69,6 @@ urlpatterns = [
     path('admin-panel/catalogos/<str:tipo>/<int:pk>/toggle/', views.admin_catalogo_toggle, name='admin_catalogo_toggle'),
     
     path('api/verificar-password/', views.verificar_password_fortaleza, name='verificar_password'),
+    path('api/personas/autocompletar/', views.autocompletar_personas_api, name='autocompletar_personas'),
+    path('api/causas/autocompletar/', views.autocompletar_causas_api, name='autocompletar_causas'),
 ]
@@ -4,8 +4,7 @@ from django.contrib import messages
 from django.db.models import Q, Count 
 from django.shortcuts import render, redirect, get_object_or_404
 from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 from django.contrib.auth.password_validation import validate_password
 
@@ -21,11 +20,14 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
-from .models import Persona, Causa, Audiencia, Documento, CausaPersona, LogAuditoria, EstadoCausa, Materia, Tribunal, TipoDocumento, Consentimiento
+from .models import Persona, Causa, Audiencia, Documento, CausaPersona, LogAuditoria, LogAuditoriaArchivo, EstadoCausa, Materia, Tribunal, TipoDocumento, Consentimiento
 from .forms import (
     PersonaForm, CausaForm, AudienciaForm,
     DocumentoForm, CausaPersonaForm, ConsentimientoForm
 )
+from .catalogos import (
+    get_tribunales, get_materias, get_estados, get_tipos_documento, get_responsables
+)
 
 from .permissions import (
     permiso_requerido, 
@@ -36,6 +38,7 @@ from .permissions import (
     obtener_rol_usuario,
     puede_ver_causa,
     puede_editar_causa,
+    permiso_requerido_ajax,
 )
 
 # Alias para compatibilidad
@@ -48,6 +51,7 @@ from calendar import monthrange
 from .validators import validar_archivo
 
 import calendar
+from itertools import chain
 
 from .cache_utils import (
     get_tribunales_activos,
@@ -56,6 +60,21 @@ from .cache_utils import (
     get_responsables_activos,
     get_tipos_documento_activos,
 )
+from .estadisticas import (
+    obtener_dashboard, obtener_resumen_reporte, resumir_conteos_reporte,
+    obtener_calendario_mes
+)
+from .resumenes import contar_causas
+from .signals import registrar_log
+from .busqueda import es_rut, filtrar, filtro_rut, fts_disponible
+from .paginacion import paginar
+from .buscador import buscar_en_secciones, FILTROS as FILTROS_BUSQUEDA, SECCIONES as SECCIONES_BUSQUEDA
+from .similitud import MAX_CANDIDATOS, filtrar_similares
+from .autocompletar import autocompletar_personas, autocompletar_causas, causas_visibles
+from .auditoria import (
+    filtros_request, estadisticas_logs, paginar_logs, obtener_log,
+    exportar_logs, comprimir_gzip,
+)
 
 # =============================================================================
 # DASHBOARD
@@ -63,102 +82,8 @@ from .cache_utils import (
 
 @login_required
 def dashboard(request):
-    from django.db.models import Count
-    from django.utils import timezone
-    from datetime import timedelta
-    
-    hoy = timezone.now().date()
-    
-    # FILTRO POR ROL: Base queryset según rol
-    rol_usuario = obtener_rol_usuario(request.user)
-    es_estudiante = rol_usuario == 'ESTUDIANTE'
-    
-    # Base querysets filtrados para estudiante
-    if es_estudiante:
-        causas_qs = Causa.objects.filter(responsable=request.user)
-        audiencias_qs = Audiencia.objects.filter(causa__responsable=request.user)
-        documentos_qs = Documento.objects.filter(causa__responsable=request.user)
-    else:
-        causas_qs = Causa.objects.all()
-        audiencias_qs = Audiencia.objects.all()
-        documentos_qs = Documento.objects.all()
-    
-    # Estadísticas generales
-    total_causas = causas_qs.count()
-    total_personas = Persona.objects.count()  # Personas no se filtran
-    total_audiencias = audiencias_qs.count()
-    total_documentos = documentos_qs.count()
-    
-    # Causas por estado (con objetos completos para el template)
-    causas_por_estado_raw = causas_qs.values(
-        'estado__nombre', 'estado__color'
-    ).annotate(count=Count('id')).order_by('-count')
-    
-    # Convertir a lista y calcular porcentajes
-    causas_por_estado = []
-    for item in causas_por_estado_raw:
-        # Obtener el objeto estado para el template
-        estado_obj = EstadoCausa.objects.filter(nombre=item['estado__nombre']).first()
-        if estado_obj:
-            porcentaje = round((item['count'] / total_causas * 100) if total_causas > 0 else 0, 1)
-            causas_por_estado.append({
-                'estado': estado_obj,
-                'count': item['count'],
-                'porcentaje': porcentaje
-            })
-    
-    # Próximas audiencias
-    proximas_audiencias = audiencias_qs.select_related(
-        'causa', 'causa__tribunal'
-    ).filter(
-        fecha_hora__gte=timezone.now(),
-        estado__in=['PROGRAMADA', 'CONFIRMADA']
-    ).order_by('fecha_hora')[:5]
-    
-    # Causas recientes
-    causas_recientes = causas_qs.select_related(
-        'tribunal', 'materia', 'estado', 'responsable'
-    ).order_by('-fecha_creacion')[:5]
-    
-    # Personas recientes (no filtradas - todos ven todas)
-    personas_recientes = Persona.objects.order_by('-id')[:5]
-    
-    # Actividad reciente
-    if es_estudiante:
-        # Estudiante solo ve actividad de sus causas
-        actividad_reciente = LogAuditoria.objects.select_related(
-            'usuario'
-        ).filter(usuario=request.user).order_by('-fecha')[:10]
-    else:
-        actividad_reciente = LogAuditoria.objects.select_related(
-            'usuario'
-        ).order_by('-fecha')[:10]
-    
-    # Audiencias del mes
-    audiencias_mes = audiencias_qs.filter(
-        fecha_hora__year=hoy.year,
-        fecha_hora__month=hoy.month
-    ).count()
-    
-    # Documentos del mes
-    documentos_mes = documentos_qs.filter(
-        fecha_subida__year=hoy.year,
-        fecha_subida__month=hoy.month
-    ).count()
-    
-    context = {
-        'total_causas': total_causas,
-        'total_personas': total_personas,
-        'total_audiencias': total_audiencias,
-        'total_documentos': total_documentos,
-        'causas_por_estado': causas_por_estado,
-        'proximas_audiencias': proximas_audiencias,
-        'causas_recientes': causas_recientes,
-        'personas_recientes': personas_recientes,
-        'actividad_reciente': actividad_reciente,
-        'audiencias_mes': audiencias_mes,
-        'documentos_mes': documentos_mes,
-    }
+    # Snapshot en caché por rol (por usuario si es estudiante)
+    context = obtener_dashboard(request.user)
     return render(request, 'gestion/dashboard.html', context)
 
 
@@ -174,33 +99,52 @@ def personas_lista(request):
     q = request.GET.get('q', '').strip()
     tipo = request.GET.get('tipo', '')
     
-    if q:
-        personas = personas.filter(
-            Q(nombres__icontains=q) |
-            Q(apellidos__icontains=q) |
-            Q(run__icontains=q) |
-            Q(email__icontains=q)
-        )
-    
     if tipo:
         personas = personas.filter(tipo_persona=tipo)
     
-    # Paginación
-    paginator = Paginator(personas, 15)  # 15 por página
-    page = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.page(page)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    por_relevancia = similares = similares_acotado = False
+    if q:
+        if es_rut(q):
+            # Búsqueda exacta o por prefijo en el índice del RUN normalizado
+            personas = personas.filter(
+                filtro_rut(q) |
+                filtro_rut(q, 'representante_run_normalizado')
+            )
+        else:
+            coincidencias = personas.filter(
+                Q(nombres__icontains=q) |
+                Q(apellidos__icontains=q) |
+                Q(run__icontains=q) |
+                Q(email__icontains=q)
+            )
+            if not coincidencias.exists() and fts_disponible():
+                # Palabras por prefijo sin tildes ("gonzalez" encuentra
+                # "González"), ordenadas por relevancia
+                coincidencias = filtrar(personas, 'persona', q)
+                por_relevancia = True
+            if coincidencias.exists():
+                personas = coincidencias
+            else:
+                # Sin coincidencias: nombres parecidos (errores de
+                # escritura), de la más a la menos similar
+                personas, similares_acotado = filtrar_similares(personas, q)
+                por_relevancia = similares = True
+    
+    # Paginación por cursor (por id); los resultados ordenados por
+    # relevancia o similitud se paginan por desplazamiento
+    page_obj = paginar(
+        personas, 15, request.GET.get('cursor', ''),
+        campo=None if por_relevancia else 'id'
+    )
     
     context = {
         'personas': page_obj,
         'page_obj': page_obj,
         'q': q,
         'tipo': tipo,
+        'similares': similares,
+        'similares_acotado': similares_acotado,
+        'max_similares': MAX_CANDIDATOS,
     }
     return render(request, 'gestion/personas_lista.html', context)
 
@@ -299,22 +243,14 @@ def causas_lista(request):
     if materia:
         causas = causas.filter(materia_id=materia)
     
-    # Paginación
-    paginator = Paginator(causas, 15)
-    page = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.page(page)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    # Paginación por cursor sobre el índice de fecha de creación
+    page_obj = paginar(causas, 15, request.GET.get('cursor', ''), campo='fecha_creacion')
     
     context = {
         'causas': page_obj,
         'page_obj': page_obj,
-        'estados': EstadoCausa.objects.filter(activo=True),
-        'materias': Materia.objects.filter(activo=True),
+        'estados': get_estados(),
+        'materias': get_materias(),
         'q': q,
         'estado_filtro': estado,
         'materia_filtro': materia,
@@ -342,10 +278,10 @@ def causa_crear(request):
     # Usar caché para catálogos
     context = {
         'form': form,
-        'tribunales': Tribunal.objects.filter(activo=True).order_by('nombre'),
-        'materias': Materia.objects.filter(activo=True).order_by('nombre'),
-        'estados': EstadoCausa.objects.filter(activo=True).order_by('orden'),
-        'responsables': User.objects.filter(is_active=True).order_by('first_name', 'username'),
+        'tribunales': get_tribunales(),
+        'materias': get_materias(),
+        'estados': get_estados(),
+        'responsables': get_responsables(),
         'es_estudiante': rol_usuario == 'ESTUDIANTE',
         'usuario_actual': request.user,
     }
@@ -374,10 +310,10 @@ def causa_editar(request, pk):
     context = {
         'form': form,
         'causa': causa,
-        'tribunales': Tribunal.objects.filter(activo=True).order_by('nombre'),
-        'materias': Materia.objects.filter(activo=True).order_by('nombre'),
-        'estados': EstadoCausa.objects.filter(activo=True).order_by('orden'),
-        'responsables': User.objects.filter(is_active=True).order_by('first_name', 'username'),
+        'tribunales': get_tribunales(),
+        'materias': get_materias(),
+        'estados': get_estados(),
+        'responsables': get_responsables(),
     }
     return render(request, 'gestion/causa_form.html', context)
 
@@ -441,13 +377,6 @@ def causa_detalle(request, pk):
 def causa_persona_crear(request):
     causa_preseleccionada = request.GET.get('causa', '')
     
-    # FILTRO POR ROL: Estudiante solo ve sus causas
-    rol_usuario = obtener_rol_usuario(request.user)
-    if rol_usuario == 'ESTUDIANTE':
-        causas_disponibles = Causa.objects.filter(responsable=request.user).exclude(estado__es_final=True).order_by('-fecha_creacion')
-    else:
-        causas_disponibles = Causa.objects.exclude(estado__es_final=True).order_by('-fecha_creacion')
-    
     if request.method == 'POST':
         form = CausaPersonaForm(request.POST)
         if form.is_valid():
@@ -461,10 +390,14 @@ def causa_persona_crear(request):
     else:
         form = CausaPersonaForm()
     
+    # Los selectores cargan las opciones con autocompletado: solo se
+    # envía la opción elegida (FILTRO POR ROL en causas_visibles)
     context = {
         'form': form,
-        'causas': causas_disponibles,
-        'personas': Persona.objects.all().order_by('apellidos', 'nombres'),
+        'causa_seleccionada': _seleccionado(
+            causas_visibles(request.user), form['causa'].value() or causa_preseleccionada
+        ),
+        'persona_seleccionada': _seleccionado(Persona.objects.all(), form['persona'].value()),
         'causa_preseleccionada': causa_preseleccionada,
     }
     return render(request, 'gestion/causa_persona_form.html', context)
@@ -486,7 +419,6 @@ def causa_persona_editar(request, pk):
     
     context = {
         'causa_persona': causa_persona,
-        'personas': Persona.objects.filter(activo=True).order_by('apellidos', 'nombres'),
     }
     return render(request, 'gestion/causa_persona_editar.html', context)
 
@@ -527,16 +459,8 @@ def audiencias_lista(request):
     if fecha_hasta:
         audiencias = audiencias.filter(fecha_hora__date__lte=fecha_hasta)
     
-    # Paginación
-    paginator = Paginator(audiencias, 15)
-    page = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.page(page)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    # Paginación por cursor sobre el índice de fecha y hora
+    page_obj = paginar(audiencias, 15, request.GET.get('cursor', ''), campo='fecha_hora')
     
     context = {
         'audiencias': page_obj,
@@ -575,16 +499,13 @@ def audiencia_crear(request):
         form = AudienciaForm()
     
     # FILTRO POR ROL: Estudiante solo ve sus causas
-    rol_usuario = obtener_rol_usuario(request.user)
-    if rol_usuario == 'ESTUDIANTE':
-        causas_disponibles = Causa.objects.filter(responsable=request.user).exclude(estado__es_final=True).order_by('-fecha_creacion')
-    else:
-        causas_disponibles = Causa.objects.exclude(estado__es_final=True).order_by('-fecha_creacion')
-    
     context = {
         'form': form,
-        'causas': causas_disponibles,
+        'causa_seleccionada': _seleccionado(
+            causas_visibles(request.user), form['causa'].value() or causa_preseleccionada
+        ),
         'causa_preseleccionada': causa_preseleccionada,
+        'solo_causas_activas': True,
     }
     return render(request, 'gestion/audiencia_form.html', context)
 
@@ -609,15 +530,10 @@ def audiencia_editar(request, pk):
         form = AudienciaForm(instance=audiencia)
     
     # FILTRO POR ROL: Estudiante solo ve sus causas
-    if rol_usuario == 'ESTUDIANTE':
-        causas_disponibles = Causa.objects.filter(responsable=request.user).order_by('-fecha_creacion')
-    else:
-        causas_disponibles = Causa.objects.all().order_by('-fecha_creacion')
-    
     context = {
         'form': form,
         'audiencia': audiencia,
-        'causas': causas_disponibles,
+        'causa_seleccionada': _seleccionado(causas_visibles(request.user), form['causa'].value()),
     }
     return render(request, 'gestion/audiencia_form.html', context)
 
@@ -647,21 +563,13 @@ def documentos_lista(request):
     if tipo:
         documentos = documentos.filter(tipo_id=tipo)
     
-    # Paginación
-    paginator = Paginator(documentos, 15)
-    page = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.page(page)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    # Paginación por cursor sobre el índice de fecha de subida
+    page_obj = paginar(documentos, 15, request.GET.get('cursor', ''), campo='fecha_subida')
     
     context = {
         'documentos': page_obj,
         'page_obj': page_obj,
-        'tipos': TipoDocumento.objects.filter(activo=True),
+        'tipos': get_tipos_documento(),
         'q': q,
         'tipo_filtro': tipo,
     }
@@ -713,15 +621,9 @@ def documento_crear(request):
                 messages.error(request, error)
             
             # FILTRO POR ROL: Estudiante solo ve sus causas
-            rol_usuario = obtener_rol_usuario(request.user)
-            if rol_usuario == 'ESTUDIANTE':
-                causas_disponibles = Causa.objects.filter(responsable=request.user).order_by('-fecha_creacion')
-            else:
-                causas_disponibles = Causa.objects.all().order_by('-fecha_creacion')
-            
             return render(request, 'gestion/documento_form.html', {
-                'causas': causas_disponibles,
-                'tipos_documento': TipoDocumento.objects.filter(activo=True),
+                'causa_seleccionada': _seleccionado(causas_visibles(request.user), causa_id),
+                'tipos_documento': get_tipos_documento(),
                 'causa_preseleccionada': causa_id,
             })
         
@@ -750,15 +652,9 @@ def documento_crear(request):
         return redirect('gestion:documentos_lista')
     
     # FILTRO POR ROL: Estudiante solo ve sus causas
-    rol_usuario = obtener_rol_usuario(request.user)
-    if rol_usuario == 'ESTUDIANTE':
-        causas_disponibles = Causa.objects.filter(responsable=request.user).order_by('-fecha_creacion')
-    else:
-        causas_disponibles = Causa.objects.all().order_by('-fecha_creacion')
-    
     context = {
-        'causas': causas_disponibles,
-        'tipos_documento': TipoDocumento.objects.filter(activo=True),
+        'causa_seleccionada': _seleccionado(causas_visibles(request.user), causa_id),
+        'tipos_documento': get_tipos_documento(),
         'causa_preseleccionada': causa_id,
     }
     return render(request, 'gestion/documento_form.html', context)
@@ -777,10 +673,7 @@ def buscar(request):
     en_causas = request.GET.get('en_causas')
     en_personas = request.GET.get('en_personas')
     en_documentos = request.GET.get('en_documentos')
-    estado_filtro = request.GET.get('estado', '')
-    materia_filtro = request.GET.get('materia', '')
-    fecha_desde = request.GET.get('fecha_desde', '')
-    fecha_hasta = request.GET.get('fecha_hasta', '')
+    filtros = {filtro: request.GET.get(filtro, '') for filtro in FILTROS_BUSQUEDA}
     
     # Si no hay ningún checkbox marcado y hay query, buscar en todos
     if query and not en_causas and not en_personas and not en_documentos:
@@ -788,82 +681,56 @@ def buscar(request):
         en_personas = True
         en_documentos = True
     
-    causas_encontradas = []
-    personas_encontradas = []
-    documentos_encontrados = []
+    secciones = [
+        seccion for seccion, marcada in zip(SECCIONES_BUSQUEDA, (en_causas, en_personas, en_documentos))
+        if marcada
+    ]
     
-    # FILTRO POR ROL: Estudiante solo ve sus datos
-    rol_usuario = obtener_rol_usuario(request.user)
-    es_estudiante = rol_usuario == 'ESTUDIANTE'
+    # Paginar una sección: solo se ejecuta esa búsqueda
+    seccion_activa = request.GET.get('seccion', '')
+    paginas = {}
+    if seccion_activa in secciones:
+        secciones = [seccion_activa]
+        try:
+            paginas[seccion_activa] = int(request.GET.get('pagina', 1))
+        except ValueError:
+            paginas[seccion_activa] = 1
+    else:
+        seccion_activa = ''
     
+    # Las secciones se buscan en paralelo, cada una restringida por rol
+    resultados = {}
     if query:
-        # Búsqueda en causas
-        if en_causas:
-            causas = Causa.objects.select_related('tribunal', 'materia', 'estado', 'responsable')
-            
-            # Filtro estudiante
-            if es_estudiante:
-                causas = causas.filter(responsable=request.user)
-            
-            causas = causas.filter(
-                Q(rit__icontains=query) |
-                Q(ruc__icontains=query) |
-                Q(caratula__icontains=query)
-            )
-            
-            if estado_filtro:
-                causas = causas.filter(estado_id=estado_filtro)
-            if materia_filtro:
-                causas = causas.filter(materia_id=materia_filtro)
-            if fecha_desde:
-                causas = causas.filter(fecha_creacion__gte=fecha_desde)
-            if fecha_hasta:
-                causas = causas.filter(fecha_creacion__lte=fecha_hasta)
-            
-            causas_encontradas = list(causas[:50])
-        
-        # Búsqueda en personas
-        if en_personas:
-            personas = Persona.objects.filter(
-                Q(run__icontains=query) |
-                Q(nombres__icontains=query) |
-                Q(apellidos__icontains=query) |
-                Q(email__icontains=query)
-            )
-            personas_encontradas = list(personas[:50])
-        
-        # Búsqueda en documentos
-        if en_documentos:
-            documentos = Documento.objects.select_related('causa', 'causa__responsable', 'tipo')
-            
-            # Filtro estudiante
-            if es_estudiante:
-                documentos = documentos.filter(causa__responsable=request.user)
-            
-            documentos = documentos.filter(
-                Q(titulo__icontains=query) |
-                Q(descripcion__icontains=query) |
-                Q(numero_documento__icontains=query)
-            )
-            documentos_encontrados = list(documentos[:50])
+        resultados = buscar_en_secciones(request.user, query, filtros, secciones, paginas)
+    
+    causas_encontradas = resultados.get('causas', [])
+    personas_encontradas = resultados.get('personas', [])
+    documentos_encontrados = resultados.get('documentos', [])
+    total_resultados = sum(resultado.total for resultado in resultados.values())
     
-    total_resultados = len(causas_encontradas) + len(personas_encontradas) + len(documentos_encontrados)
+    # Parámetros de la búsqueda, sin la paginación, para los enlaces por sección
+    query_busqueda = request.GET.copy()
+    for clave in ('seccion', 'pagina'):
+        query_busqueda.pop(clave, None)
     
     context = {
         'query': query,
         'en_causas': en_causas,
         'en_personas': en_personas,
         'en_documentos': en_documentos,
-        'estado_filtro': estado_filtro,
-        'materia_filtro': materia_filtro,
-        'fecha_desde': fecha_desde,
-        'fecha_hasta': fecha_hasta,
+        'estado_filtro': filtros['estado'],
+        'materia_filtro': filtros['materia'],
+        'fecha_desde': filtros['fecha_desde'],
+        'fecha_hasta': filtros['fecha_hasta'],
+        'seccion_activa': seccion_activa,
+        'query_busqueda': query_busqueda.urlencode(),
         'causas_encontradas': causas_encontradas,
         'personas_encontradas': personas_encontradas,
         'documentos_encontrados': documentos_encontrados,
         'total_resultados': total_resultados,
-        'estados': EstadoCausa.objects.filter(activo=True).order_by('orden'),
-        'materias': Materia.objects.filter(activo=True).order_by('nombre'),
+        'total_exacto': all(resultado.total_exacto for resultado in resultados.values()),
+        'estados': get_estados(),
+        'materias': get_materias(),
     }
     return render(request, 'gestion/buscar.html', context)
 
@@ -877,76 +744,143 @@ def auditoria_lista(request):
                 messages.error(request, 'No tienes permisos para ver la auditoría.')
                 return redirect('gestion:dashboard')
     
-    logs = LogAuditoria.objects.select_related('usuario').order_by('-fecha')
-    
-    # Filtros
-    usuario = request.GET.get('usuario', '')
-    accion = request.GET.get('accion', '')
-    modelo = request.GET.get('modelo', '')
-    fecha_desde = request.GET.get('fecha_desde', '')
-    fecha_hasta = request.GET.get('fecha_hasta', '')
-    
-    if usuario:
-        logs = logs.filter(usuario_id=usuario)
-    
-    if accion:
-        logs = logs.filter(accion=accion)
-    
-    if modelo:
-        logs = logs.filter(modelo=modelo)
-    
-    if fecha_desde:
-        logs = logs.filter(fecha__date__gte=fecha_desde)
-    
-    if fecha_hasta:
-        logs = logs.filter(fecha__date__lte=fecha_hasta)
+    # Filtros (el archivo solo se omite si el rango queda dentro de la ventana activa)
+    filtros = filtros_request(request.GET)
     
-    # Estadísticas
-    total = logs.count()
-    creaciones = logs.filter(accion='CREAR').count()
-    ediciones = logs.filter(accion='EDITAR').count()
-    eliminaciones = logs.filter(accion='ELIMINAR').count()
+    # Estadísticas (una consulta, en caché por combinación de filtros)
+    estadisticas = estadisticas_logs(**filtros)
     
-    # Paginación
-    paginator = Paginator(logs, 25)  # 25 por página para auditoría
-    page = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.page(page)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    # Paginación por cursor (fecha, id): no recorre las páginas anteriores
+    page_obj = paginar_logs(
+        25,
+        despues=request.GET.get('despues', ''),
+        antes=request.GET.get('antes', ''),
+        **filtros
+    )
+    query_filtros = request.GET.copy()
+    for clave in ('despues', 'antes', 'page'):
+        query_filtros.pop(clave, None)
     
     from django.contrib.auth.models import User
     
     context = {
         'logs': page_obj,
         'page_obj': page_obj,
+        'query_filtros': query_filtros.urlencode(),
         'usuarios': User.objects.filter(is_active=True).order_by('username'),
-        'total': total,
-        'creaciones': creaciones,
-        'ediciones': ediciones,
-        'eliminaciones': eliminaciones,
-        'usuario_filtro': usuario,
-        'accion_filtro': accion,
-        'modelo_filtro': modelo,
-        'fecha_desde': fecha_desde,
-        'fecha_hasta': fecha_hasta,
+        'total_registros': estadisticas['total'],
+        'total_crear': estadisticas['creaciones'],
+        'total_editar': estadisticas['ediciones'],
+        'total_eliminar': estadisticas['eliminaciones'],
+        'filtros': filtros,
     }
     return render(request, 'gestion/auditoria_lista.html', context)
 
 
+@permiso_requerido('puede_exportar_auditoria')
+def auditoria_exportar(request):
+    """
+    Exporta en streaming los logs con los filtros de auditoria_lista.
+    
+    Parámetros GET: los filtros del listado, formato=csv|jsonl y gzip=1
+    para comprimir al vuelo.
+    """
+    formato = request.GET.get('formato', 'csv')
+    if formato not in ('csv', 'jsonl'):
+        formato = 'csv'
+    filtros = filtros_request(request.GET)
+    
+    aplicados = ', '.join(f'{campo}={valor}' for campo, valor in filtros.items() if valor)
+    registrar_log(
+        accion='OTRO',
+        modelo='OTRO',
+        descripcion=f'Exportación de auditoría ({formato}). Filtros: {aplicados or "ninguno"}'
+    )
+    
+    contenido = exportar_logs(formato, **filtros)
+    nombre = f'auditoria_{timezone.localdate():%Y%m%d}.{formato}'
+    tipo = 'text/csv; charset=utf-8' if formato == 'csv' else 'application/x-ndjson; charset=utf-8'
+    if request.GET.get('gzip') == '1':
+        contenido = comprimir_gzip(contenido)
+        nombre += '.gz'
+        tipo = 'application/gzip'
+    
+    response = StreamingHttpResponse(contenido, content_type=tipo)
+    response['Content-Disposition'] = f'attachment; filename="{nombre}"'
+    return response
+
+
 @permiso_requerido('puede_ver_auditoria')
 @login_required
 def auditoria_detalle(request, pk):
-    log = get_object_or_404(LogAuditoria, pk=pk)
+    log = obtener_log(pk)
+    if log is None:
+        raise Http404('Registro de auditoría no encontrado')
     
     context = {
         'log': log,
+        'cambios': _cambios_log(log),
     }
     return render(request, 'gestion/auditoria_detalle.html', context)
 
+
+# Modelos cuyos cambios quedan en la auditoría
+MODELOS_AUDITADOS = {
+    'CAUSA': Causa,
+    'PERSONA': Persona,
+    'DOCUMENTO': Documento,
+    'AUDIENCIA': Audiencia,
+    'CONSENTIMIENTO': Consentimiento,
+}
+
+
+def _cambios_log(log):
+    """
+    Campos que cambiaron en un log de edición, con sus valores antes y
+    después. Las FK (guardadas como id) se muestran con su descripción.
+    """
+    anteriores = log.datos_anteriores or {}
+    nuevos = log.datos_nuevos or {}
+    if log.accion != 'EDITAR' or not anteriores:
+        return []
+    
+    modelo = MODELOS_AUDITADOS.get(log.modelo)
+    campos = {}
+    if modelo is not None:
+        campos = {f.name: f for f in modelo._meta.concrete_fields}
+    
+    # Resolver ids de FK con una consulta por modelo relacionado
+    ids_por_modelo = {}
+    for nombre in nuevos:
+        campo = campos.get(nombre)
+        if campo is not None and campo.is_relation:
+            for valor in (anteriores.get(nombre), nuevos.get(nombre)):
+                if isinstance(valor, int):
+                    ids_por_modelo.setdefault(campo.related_model, set()).add(valor)
+    objetos = {
+        relacionado: relacionado._default_manager.in_bulk(ids)
+        for relacionado, ids in ids_por_modelo.items()
+    }
+    
+    def mostrar(campo, valor):
+        if campo is not None and campo.is_relation and isinstance(valor, int):
+            objeto = objetos[campo.related_model].get(valor)
+            return str(objeto) if objeto is not None else f'#{valor}'
+        return valor
+    
+    cambios = []
+    for nombre, despues in nuevos.items():
+        antes = anteriores.get(nombre)
+        if antes == despues:
+            continue
+        campo = campos.get(nombre)
+        cambios.append({
+            'campo': campo.verbose_name if campo is not None else nombre,
+            'antes': mostrar(campo, antes),
+            'despues': mostrar(campo, despues),
+        })
+    return cambios
+
 @login_required
 def causa_linea_tiempo(request, pk):
     causa = get_object_or_404(Causa, pk=pk)
@@ -992,12 +926,16 @@ def causa_linea_tiempo(request, pk):
             'objeto': aud
         })
     
-    # Eventos: Logs de auditoría relacionados con la causa
-    logs = LogAuditoria.objects.filter(
+    # Eventos: Logs de auditoría relacionados con la causa (activos y archivados)
+    filtro_logs = dict(
         modelo='CAUSA',
         objeto_id=causa.pk,
         accion__in=['EDITAR', 'CAMBIO_ESTADO', 'ASIGNAR']
     )
+    logs = chain(
+        LogAuditoria.objects.filter(**filtro_logs),
+        LogAuditoriaArchivo.objects.filter(**filtro_logs),
+    )
     for log in logs:
         eventos.append({
             'fecha': to_datetime(log.fecha),
@@ -1030,8 +968,6 @@ def causa_linea_tiempo(request, pk):
 
 @login_required
 def calendario(request):
-    import calendar
-    from calendar import monthrange
     from django.utils import timezone
     
     # Obtener mes a mostrar
@@ -1056,32 +992,6 @@ def calendario(request):
     else:
         mes_siguiente = date(fecha_actual.year, fecha_actual.month + 1, 1)
     
-    # Audiencias del mes
-    audiencias_mes = Audiencia.objects.select_related(
-        'causa', 'causa__tribunal'
-    ).filter(
-        fecha_hora__year=fecha_actual.year,
-        fecha_hora__month=fecha_actual.month
-    ).order_by('fecha_hora')
-    
-    # Organizar audiencias por día
-    audiencias_por_dia = {}
-    for aud in audiencias_mes:
-        dia = aud.fecha_hora.day
-        if dia not in audiencias_por_dia:
-            audiencias_por_dia[dia] = []
-        audiencias_por_dia[dia].append({
-            'id': aud.id,
-            'hora': aud.fecha_hora.strftime('%H:%M'),
-            'tipo': aud.get_tipo_evento_display(),
-            'causa': str(aud.causa.caratula)[:30],
-            'estado': aud.estado,
-        })
-    
-    # Crear calendario
-    cal = calendar.Calendar(firstweekday=0)
-    semanas = cal.monthdatescalendar(fecha_actual.year, fecha_actual.month)
-    
     # Próximas audiencias
     proximas = Audiencia.objects.select_related(
         'causa'
@@ -1090,24 +1000,16 @@ def calendario(request):
         estado__in=['PROGRAMADA', 'CONFIRMADA']
     ).order_by('fecha_hora')[:10]
     
-    # Estadísticas del mes
-    total_mes = audiencias_mes.count()
-    programadas_mes = audiencias_mes.filter(estado='PROGRAMADA').count()
-    confirmadas_mes = audiencias_mes.filter(estado='CONFIRMADA').count()
-    realizadas_mes = audiencias_mes.filter(estado='REALIZADA').count()
+    # Audiencias y estadísticas del mes (desde caché)
+    datos_mes = obtener_calendario_mes(fecha_actual)
     
     context = {
         'fecha_actual': fecha_actual,
         'mes_anterior': mes_anterior,
         'mes_siguiente': mes_siguiente,
-        'semanas': semanas,
-        'audiencias_por_dia': audiencias_por_dia,
         'proximas': proximas,
-        'total_mes': total_mes,
-        'programadas_mes': programadas_mes,
-        'confirmadas_mes': confirmadas_mes,
-        'realizadas_mes': realizadas_mes,
         'hoy': date.today(),
+        **datos_mes,
     }
     return render(request, 'gestion/calendario.html', context)
 
@@ -1145,44 +1047,32 @@ def reportes(request):
     if fecha_hasta:
         causas = causas.filter(fecha_creacion__lte=fecha_hasta)
     
-    # Estadísticas
-    total = causas.count()
-    
-    # Causas por estado (para gráfico)
-    causas_por_estado_qs = causas.values(
-        'estado__nombre', 'estado__color'
-    ).annotate(total=Count('id')).order_by('-total')
-    
-    # Convertir a lista y calcular porcentajes
-    causas_por_estado = []
-    for item in causas_por_estado_qs:
-        porcentaje = round((item['total'] / total * 100) if total > 0 else 0, 1)
-        causas_por_estado.append({
-            'estado__nombre': item['estado__nombre'],
-            'estado__color': item['estado__color'],
-            'total': item['total'],
-            'porcentaje': porcentaje
-        })
-    
-    # Causas por materia (para gráfico)
-    causas_por_materia_qs = causas.values(
-        'materia__nombre'
-    ).annotate(total=Count('id')).order_by('-total')[:5]
-    
-    # Convertir a lista y calcular porcentajes
-    causas_por_materia = []
-    for item in causas_por_materia_qs:
-        porcentaje = round((item['total'] / total * 100) if total > 0 else 0, 1)
-        causas_por_materia.append({
-            'materia__nombre': item['materia__nombre'],
-            'total': item['total'],
-            'porcentaje': porcentaje
-        })
+    # Estadísticas: desde la tabla de resumen cuando los filtros son
+    # dimensiones del resumen; el rango de fechas obliga a leer las causas
+    if fecha_desde or fecha_hasta:
+        conteos = causas.order_by()
+        resumen = resumir_conteos_reporte(
+            conteos.values(
+                'estado__nombre', 'estado__color', 'estado__es_final'
+            ).annotate(total=Count('id')).order_by('-total'),
+            conteos.values(
+                'materia__nombre'
+            ).annotate(total=Count('id')).order_by('-total')[:5],
+        )
+    else:
+        resumen = obtener_resumen_reporte(
+            estado=estado,
+            materia=materia,
+            tribunal=tribunal,
+            responsable=responsable,
+        )
     
-    # Causas en tramitación vs finalizadas
-    en_tramitacion = causas.filter(estado__es_final=False).count()
-    finalizadas = causas.filter(estado__es_final=True).count()
-    tasa_exito = round((finalizadas / total * 100) if total > 0 else 0, 1)
+    total = resumen['total']
+    finalizadas = resumen['finalizadas']
+    en_tramitacion = resumen['en_tramitacion']
+    tasa_exito = resumen['tasa_exito']
+    causas_por_estado = resumen['causas_por_estado']
+    causas_por_materia = resumen['causas_por_materia']
     
     # Datos para la tabla (limitado a 100)
     causas_tabla = causas.order_by('-fecha_creacion')[:100]
@@ -1191,16 +1081,30 @@ def reportes(request):
     
     context = {
         'causas': causas_tabla,
+        'estadisticas': {
+            'total': total,
+            'en_tramitacion': en_tramitacion,
+            'finalizadas': finalizadas,
+            'tasa_exito': tasa_exito,
+        },
+        'filtros': {
+            'estado': estado,
+            'materia': materia,
+            'tribunal': tribunal,
+            'responsable': responsable,
+            'fecha_desde': fecha_desde,
+            'fecha_hasta': fecha_hasta,
+        },
         'total': total,
         'en_tramitacion': en_tramitacion,
         'finalizadas': finalizadas,
         'tasa_exito': tasa_exito,
         'causas_por_estado': causas_por_estado,
         'causas_por_materia': causas_por_materia,
-        'estados': EstadoCausa.objects.filter(activo=True),
-        'materias': Materia.objects.filter(activo=True),
-        'tribunales': Tribunal.objects.filter(activo=True),
-        'responsables': User.objects.filter(is_active=True),
+        'estados': get_estados(),
+        'materias': get_materias(),
+        'tribunales': get_tribunales(),
+        'responsables': get_responsables(),
         'estado_filtro': estado,
         'materia_filtro': materia,
         'tribunal_filtro': tribunal,
@@ -1516,7 +1420,7 @@ def perfil_cambiar_password(request):
 def admin_panel(request):
     context = {
         'total_usuarios': User.objects.count(),
-        'total_causas': Causa.objects.count(),
+        'total_causas': contar_causas(),
         'total_personas': Persona.objects.count(),
         'total_logs': LogAuditoria.objects.count(),
         'total_estados': EstadoCausa.objects.count(),
@@ -1556,16 +1460,8 @@ def admin_usuarios(request):
             Q(email__icontains=q)
         )
     
-    # Paginación
-    paginator = Paginator(usuarios, 15)
-    page = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.page(page)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    # Paginación por cursor por fecha de registro
+    page_obj = paginar(usuarios, 15, request.GET.get('cursor', ''), campo='date_joined')
     
     context = {
         'usuarios': page_obj,
@@ -1854,6 +1750,48 @@ def verificar_password_fortaleza(request):
             'errores': e.messages
         })
 
+
+# =============================================================================
+# AUTOCOMPLETADO
+# =============================================================================
+
+def _seleccionado(queryset, pk):
+    """
+    Objeto elegido en un selector con autocompletado, para mostrarlo como
+    única opción inicial. None si no hay valor o no está en el queryset.
+    """
+    try:
+        return queryset.filter(pk=int(pk)).first() if pk else None
+    except (TypeError, ValueError):
+        return None
+
+
+@permiso_requerido_ajax('puede_ver_personas')
+def autocompletar_personas_api(request):
+    """
+    API de autocompletado de personas.
+    Parámetros GET: q, pagina, activas=1 (solo personas activas).
+    """
+    return JsonResponse(autocompletar_personas(
+        request.GET.get('q', ''),
+        request.GET.get('pagina', 1),
+        solo_activas=request.GET.get('activas') == '1',
+    ))
+
+
+@permiso_requerido_ajax('puede_ver_causas')
+def autocompletar_causas_api(request):
+    """
+    API de autocompletado de causas visibles para el usuario.
+    Parámetros GET: q, pagina, activas=1 (excluye causas en estado final).
+    """
+    return JsonResponse(autocompletar_causas(
+        request.user,
+        request.GET.get('q', ''),
+        request.GET.get('pagina', 1),
+        solo_activas=request.GET.get('activas') == '1',
+    ))
+
 # =============================================================================
 # CONSENTIMIENTOS
 # =============================================================================
@@ -1880,17 +1818,12 @@ def consentimientos_lista(request):
         elif estado == 'pendiente':
             consentimientos = consentimientos.filter(otorgado=False, fecha_revocacion__isnull=True)
     
-    # Paginación
-    paginator = Paginator(consentimientos, 20)
-    page = request.GET.get('page', 1)
-    try:
-        consentimientos = paginator.page(page)
-    except (PageNotAnInteger, EmptyPage):
-        consentimientos = paginator.page(1)
+    # Paginación por cursor por fecha de registro
+    page_obj = paginar(consentimientos, 20, request.GET.get('cursor', ''), campo='fecha_registro')
     
     context = {
-        'consentimientos': consentimientos,
-        'personas': Persona.objects.all().order_by('apellidos', 'nombres'),
+        'consentimientos': page_obj,
+        'page_obj': page_obj,
         'tipos': Consentimiento.TIPO_CHOICES,
         'persona_filtro': persona_id,
         'tipo_filtro': tipo,
@@ -1946,7 +1879,9 @@ def consentimiento_crear(request):
             return redirect('gestion:consentimientos_lista')
     
     context = {
-        'personas': Persona.objects.all().order_by('apellidos', 'nombres'),
+        'persona_seleccionada': _seleccionado(
+            Persona.objects.all(), request.POST.get('persona') or persona_id
+        ),
         'tipos': Consentimiento.TIPO_CHOICES,
         'persona_preseleccionada': persona_id,
     }
@@ -1981,7 +1916,7 @@ def consentimiento_editar(request, pk):
     context = {
         'form': form,
         'consentimiento': consentimiento,
-        'personas': Persona.objects.all().order_by('apellidos', 'nombres'),
+        'persona_seleccionada': _seleccionado(Persona.objects.all(), form['persona'].value()),
         'tipos': Consentimiento.TIPO_CHOICES,
     }
     return render(request, 'gestion/consentimiento_form.html', context)
@@ -27,7 +27,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'apps.gestion.signals.AuditoriaMiddleware',
+    'apps.gestion.contexto.ContextoRequestMiddleware',
     'apps.gestion.middleware.XSSProtectionMiddleware',
     'apps.gestion.middleware.SecurityHeadersMiddleware',
     'apps.gestion.session_middleware.SessionTimeoutMiddleware',
@@ -251,17 +251,59 @@ LOGGING = {
 # CACHÉ - Optimización de Rendimiento
 # =============================================================================
 
+# Caché compartido entre workers (L2). Basado en archivos para no depender
+# de servicios externos; cada worker mantiene además un L1 en memoria con
+# los catálogos ya deserializados (ver apps/gestion/cache_utils.py).
+#
+# Al superar MAX_ENTRIES el backend de archivos elimina al azar un tercio
+# de las entradas. Por eso los resultados por consulta (búsqueda, conteos,
+# autocompletado, estadísticas de auditoría) y las métricas, que crecen con
+# cada combinación de filtros, van en su propio alias: al desalojarlos no
+# se pierden las generaciones ni los bloqueos, que quedan en 'default'.
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'clinica-juridica-cache',
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
         'TIMEOUT': 86400,  # 24 horas
         'OPTIONS': {
             'MAX_ENTRIES': 1000
         }
-    }
+    },
+    'consultas': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'consultas',
+        'TIMEOUT': 600,  # 10 minutos
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000
+        }
+    },
 }
 
 # Tiempo de caché para catálogos (en segundos)
 CACHE_CATALOGOS_TIMEOUT = 86400  # 24 horas
-CACHE_DASHBOARD_TIMEOUT = 300     # 5 minutos
\ No newline at end of file
+CACHE_DASHBOARD_TIMEOUT = 300     # 5 minutos
+# Tiempo adicional que se conserva un valor vencido para servirlo mientras
+# otro proceso lo recalcula
+CACHE_OBSOLETO_TIMEOUT = 3600     # 1 hora
+# Cada cuánto vuelca cada proceso sus métricas de caché al caché compartido
+CACHE_METRICAS_INTERVALO = 60     # 1 minuto
+# Se mide el tamaño de una de cada N entradas calculadas por namespace
+CACHE_METRICAS_MUESTREO = 10
+# Estadísticas de auditoría por combinación de filtros
+CACHE_AUDITORIA_TIMEOUT = 60      # 1 minuto
+# Páginas de autocompletado de personas y causas
+CACHE_AUTOCOMPLETAR_TIMEOUT = 300  # 5 minutos
+# Ids de resultados de la búsqueda global por texto, filtros y alcance
+CACHE_BUSQUEDA_TIMEOUT = 300      # 5 minutos
+# Conteos exactos de los listados por combinación de filtros
+CACHE_CONTEOS_TIMEOUT = 600       # 10 minutos
+
+# =============================================================================
+# AUDITORÍA - ISO/IEC 27001 Trazabilidad
+# =============================================================================
+
+# Meses (incluido el actual) que se mantienen en LogAuditoria. Los anteriores
+# se mueven a LogAuditoriaArchivo con `manage.py archivar_auditoria`
+AUDITORIA_MESES_ACTIVOS = 12
+# Carpeta de los respaldos JSONL comprimidos (archivar_auditoria --exportar)
+AUDITORIA_ARCHIVO_DIR = BASE_DIR / 'archivo_auditoria'
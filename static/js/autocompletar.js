@@ -0,0 +1,100 @@
+/**
+ * Autocompletado de selectores de personas y causas
+ * ISO/IEC 25010 - Eficiencia de Desempeño y Usabilidad
+ *
+ * Un <select data-autocompletar="URL"> llega solo con la opción elegida.
+ * Se agrega un campo de búsqueda sobre él; al escribir se piden a la API
+ * páginas pequeñas de resultados ({resultados: [{id, texto}], hay_mas}) y
+ * se reemplazan las opciones del select, que es el que se envía.
+ */
+
+// =============================================================================
+// CONFIGURACIÓN
+// =============================================================================
+
+const AUTOCOMPLETAR_ESPERA_MS = 250;
+
+// =============================================================================
+// SELECTOR CON AUTOCOMPLETADO
+// =============================================================================
+
+function iniciarAutocompletado(select) {
+    const buscador = document.createElement('input');
+    buscador.type = 'search';
+    buscador.className = 'form-input autocompletar-buscador';
+    buscador.placeholder = 'Escribe para buscar (nombre, RUT o RIT)...';
+    buscador.autocomplete = 'off';
+    buscador.style.marginBottom = '0.5rem';
+    select.parentNode.insertBefore(buscador, select);
+
+    let temporizador = null;
+    let controlador = null;
+    let cargado = false;
+
+    function reemplazarOpciones(datos) {
+        const elegida = select.selectedOptions[0];
+        const placeholder = select.querySelector('option[value=""]');
+        select.innerHTML = '';
+        if (placeholder) select.appendChild(placeholder);
+
+        let incluyeElegida = false;
+        datos.resultados.forEach(function(item) {
+            const opcion = new Option(item.texto, item.id);
+            if (elegida && String(item.id) === elegida.value) {
+                opcion.selected = true;
+                incluyeElegida = true;
+            }
+            select.appendChild(opcion);
+        });
+
+        // Conservar la opción elegida aunque no esté en esta página
+        if (elegida && elegida.value && !incluyeElegida) {
+            select.insertBefore(elegida, select.options[1] || null);
+            elegida.selected = true;
+        }
+        if (datos.hay_mas) {
+            const aviso = new Option('Hay más resultados: escribe más para acotar', '');
+            aviso.disabled = true;
+            select.appendChild(aviso);
+        }
+    }
+
+    function buscar() {
+        if (controlador) controlador.abort();
+        controlador = new AbortController();
+
+        const url = new URL(select.dataset.autocompletar, window.location.origin);
+        url.searchParams.set('q', buscador.value.trim());
+
+        fetch(url, {
+            headers: { 'X-Requested-With': 'XMLHttpRequest' },
+            signal: controlador.signal,
+        })
+            .then(function(respuesta) {
+                if (!respuesta.ok) throw new Error(respuesta.status);
+                return respuesta.json();
+            })
+            .then(reemplazarOpciones)
+            .catch(function(error) {
+                if (error.name !== 'AbortError') console.error('Autocompletado:', error);
+            });
+    }
+
+    buscador.addEventListener('input', function() {
+        clearTimeout(temporizador);
+        temporizador = setTimeout(buscar, AUTOCOMPLETAR_ESPERA_MS);
+    });
+
+    // La primera página (sin texto) se pide al enfocar, no al abrir el formulario
+    function cargarInicial() {
+        if (cargado) return;
+        cargado = true;
+        buscar();
+    }
+    buscador.addEventListener('focus', cargarInicial);
+    select.addEventListener('focus', cargarInicial);
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('select[data-autocompletar]').forEach(iniciarAutocompletado);
+});